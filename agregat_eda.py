@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from data_kost import NAMA_BERSIH, cari_file, kolom_file
+
+# ==============================================================================
+# AGREGAT EDA: SATU PASS STREAMING, GRAFIK DARI RINGKASAN (BUKAN BARIS MENTAH)
+# ==============================================================================
+# Mode --agregat di eda_check.py. Data bersih dibaca per chunk dan hanya
+# diringkas menjadi:
+# - sketsa kuantil harga: histogram bin logaritmik (gaya DDSketch), galat
+#   relatif kuantil <= AKURASI_SKETSA; ukurannya tetap (~2.300 bin) berapa pun
+#   jumlah baris
+# - sketsa yang sama per fasilitas x status (0/1) untuk boxplot
+# - kovarian berjalan (n, rata-rata, M2; digabung per chunk dengan rumus Chan)
+#   untuk heatmap korelasi, plus min/maks persis
+# Semua ringkasan bisa digabung (gabung()), jadi bisa di-cache & diperbarui:
+# - Parquet: agregat disimpan per row group dengan kunci hash byte kolomnya;
+#   row group yang tidak berubah tidak dibaca/dihitung ulang
+# - CSV: jika file hanya bertambah di belakang (prefix-nya sama), hanya baris
+#   baru yang dibaca
+# Cache ada di <folder>/.agregat_eda.pkl. Grafik digambar laporan_grafik.py
+# dari ringkasan ini, jadi biaya render tidak bergantung jumlah baris.
+
+AKURASI_SKETSA = 0.005
+HARGA_MAKS = 1e10
+NAMA_CACHE = '.agregat_eda.pkl'
+CHUNKSIZE = 1_000_000
+
+GAMMA = (1 + AKURASI_SKETSA) / (1 - AKURASI_SKETSA)
+N_BIN = int(np.ceil(np.log(HARGA_MAKS) / np.log(GAMMA))) + 1
+# Nilai wakil tiap bin: x di bin i berarti GAMMA^(i-1) < x <= GAMMA^i
+NILAI_BIN = 2 * GAMMA ** np.arange(N_BIN) / (GAMMA + 1)
+
+
+def indeks_bin(x):
+    x = np.clip(np.asarray(x, dtype=np.float64), 1.0, HARGA_MAKS)
+    return np.minimum(np.ceil(np.log(x) / np.log(GAMMA)).astype(np.int64), N_BIN - 1)
+
+
+def hitung_bin(x):
+    return np.bincount(indeks_bin(x), minlength=N_BIN)
+
+
+def kuantil_sketsa(jumlah, q):
+    """Kuantil dari histogram sketsa (galat relatif <= AKURASI_SKETSA)"""
+    kumulatif = np.cumsum(jumlah)
+    if kumulatif[-1] == 0:
+        return np.full(np.shape(q), np.nan)
+    posisi = np.asarray(q, dtype=np.float64) * (kumulatif[-1] - 1)
+    return NILAI_BIN[np.searchsorted(kumulatif, posisi, side='right')]
+
+
+class AgregatEDA:
+    def __init__(self, kolom_fasilitas):
+        self.kolom_fasilitas = list(kolom_fasilitas)
+        self.kolom_numerik = ['Harga_Angka'] + self.kolom_fasilitas
+        k = len(self.kolom_numerik)
+        self.n = 0
+        self.minimum, self.maksimum = np.inf, -np.inf
+        self.sketsa_harga = np.zeros(N_BIN, dtype=np.int64)
+        # [fasilitas, status 0/1, bin]
+        self.sketsa_fasilitas = np.zeros((len(self.kolom_fasilitas), 2, N_BIN), dtype=np.int64)
+        self.rata = np.zeros(k)
+        self.m2 = np.zeros((k, k))
+
+    def tambah(self, df):
+        """Masukkan satu chunk data bersih"""
+        if len(df) == 0:
+            return self
+        lain = AgregatEDA(self.kolom_fasilitas)
+        X = df[self.kolom_numerik].to_numpy(np.float64)
+        harga, idx = X[:, 0], indeks_bin(X[:, 0])
+
+        lain.n = len(X)
+        lain.minimum, lain.maksimum = harga.min(), harga.max()
+        lain.sketsa_harga = np.bincount(idx, minlength=N_BIN)
+        for j in range(len(self.kolom_fasilitas)):
+            ada = X[:, j + 1] > 0
+            lain.sketsa_fasilitas[j, 0] = np.bincount(idx[~ada], minlength=N_BIN)
+            lain.sketsa_fasilitas[j, 1] = np.bincount(idx[ada], minlength=N_BIN)
+        lain.rata = X.mean(axis=0)
+        selisih = X - lain.rata
+        lain.m2 = selisih.T @ selisih
+        return self.gabung(lain)
+
+    def gabung(self, lain):
+        """Gabungkan agregat lain ke agregat ini (in-place)"""
+        if lain.kolom_numerik != self.kolom_numerik:
+            raise ValueError(f"Kolom agregat berbeda: {lain.kolom_numerik} vs {self.kolom_numerik}")
+        if lain.n == 0:
+            return self
+        n = self.n + lain.n
+        delta = lain.rata - self.rata
+        self.m2 = self.m2 + lain.m2 + np.outer(delta, delta) * self.n * lain.n / n
+        self.rata = self.rata + delta * lain.n / n
+        self.n = n
+        self.minimum, self.maksimum = min(self.minimum, lain.minimum), max(self.maksimum, lain.maksimum)
+        self.sketsa_harga = self.sketsa_harga + lain.sketsa_harga
+        self.sketsa_fasilitas = self.sketsa_fasilitas + lain.sketsa_fasilitas
+        return self
+
+    def kuantil(self, q):
+        return kuantil_sketsa(self.sketsa_harga, q)
+
+    def korelasi(self):
+        kovarian = self.m2 / max(self.n - 1, 1)
+        std = np.sqrt(np.diag(kovarian))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            korelasi = kovarian / np.outer(std, std)
+        return pd.DataFrame(korelasi, index=self.kolom_numerik, columns=self.kolom_numerik)
+
+    def std_harga(self):
+        return float(np.sqrt(self.m2[0, 0] / max(self.n - 1, 1)))
+
+    def ringkasan(self):
+        """Padanan df['Harga_Angka'].describe(); kuartil dari sketsa"""
+        q1, q2, q3 = self.kuantil([0.25, 0.5, 0.75])
+        return pd.Series({'count': self.n, 'mean': self.rata[0], 'std': self.std_harga(), 'min': self.minimum,
+                          '25%': q1, '50%': q2, '75%': q3, 'max': self.maksimum}, name='Harga_Angka')
+
+    # ---- data kecil untuk fungsi render di laporan_grafik.py ----
+
+    def data_distribusi(self):
+        ada = self.sketsa_harga > 0
+        return {'nilai': NILAI_BIN[ada], 'jumlah': self.sketsa_harga[ada], 'std': self.std_harga(),
+                'minimum': self.minimum, 'maksimum': self.maksimum}
+
+    def data_fasilitas(self):
+        """Statistik boxplot (format matplotlib bxp) per fasilitas & status, whisker 1.5 IQR"""
+        statistik = {}
+        for j, kolom in enumerate(self.kolom_fasilitas):
+            per_status = []
+            for status in (0, 1):
+                jumlah = self.sketsa_fasilitas[j, status]
+                if jumlah.sum() == 0:
+                    continue
+                q1, med, q3 = kuantil_sketsa(jumlah, [0.25, 0.5, 0.75])
+                iqr = q3 - q1
+                nilai = NILAI_BIN[jumlah > 0]
+                dalam = nilai[(nilai >= q1 - 1.5 * iqr) & (nilai <= q3 + 1.5 * iqr)]
+                per_status.append({'label': str(status), 'med': med, 'q1': q1, 'q3': q3,
+                                   'whislo': dalam.min(), 'whishi': dalam.max(), 'fliers': []})
+            statistik[kolom] = per_status
+        return statistik
+
+
+# ==============================================================================
+# PASS STREAMING + CACHE PER SEGMEN FILE
+# ==============================================================================
+
+def kolom_eda(path):
+    return ['Harga_Angka'] + [k for k in kolom_file(path) if k.startswith('Fasilitas_') and k != 'Fasilitas_Clean']
+
+
+def sidik_row_group(f, row_group, kolom):
+    """Hash byte terkompresi kolom-kolom yang dipakai di satu row group Parquet"""
+    h = hashlib.sha256(json.dumps([kolom, AKURASI_SKETSA]).encode())
+    for j in range(row_group.num_columns):
+        c = row_group.column(j)
+        if c.path_in_schema in kolom:
+            f.seek(c.dictionary_page_offset if c.has_dictionary_page else c.data_page_offset)
+            h.update(f.read(c.total_compressed_size))
+    return h.hexdigest()
+
+
+def hash_prefix(path, ukuran):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        sisa = ukuran
+        while sisa > 0:
+            blok = f.read(min(1 << 20, sisa))
+            if not blok:
+                break
+            h.update(blok)
+            sisa -= len(blok)
+    return h.hexdigest()
+
+
+def agregat_parquet(path, kolom, chunksize, cache):
+    """Agregat per row group; row group yang hash-nya ada di cache tidak dibaca ulang"""
+    pf = pq.ParquetFile(path)
+    lama = cache.get('row_group', {})
+    baru, total, dihitung = {}, AgregatEDA(kolom[1:]), 0
+    with open(path, 'rb') as f:
+        for i in range(pf.metadata.num_row_groups):
+            kunci = sidik_row_group(f, pf.metadata.row_group(i), kolom)
+            agregat = lama.get(kunci)
+            if agregat is None:
+                agregat = AgregatEDA(kolom[1:])
+                for batch in pf.iter_batches(batch_size=chunksize, row_groups=[i], columns=kolom):
+                    agregat.tambah(batch.to_pandas())
+                dihitung += agregat.n
+            baru[kunci] = agregat
+            total.gabung(agregat)
+    return total, {'row_group': baru}, dihitung
+
+
+def agregat_csv(path, kolom, chunksize, cache):
+    """Agregat seluruh CSV; jika file hanya bertambah di belakang, hanya baris baru yang dibaca"""
+    ukuran = os.path.getsize(path)
+    lama = cache.get('csv')
+    total, mulai = AgregatEDA(kolom[1:]), 0
+    if lama and lama['kolom'] == kolom and lama['offset'] is not None and lama['offset'] <= ukuran \
+            and hash_prefix(path, lama['offset']) == lama['hash']:
+        total, mulai = lama['agregat'], lama['offset']
+
+    dihitung = 0
+    if mulai < ukuran:
+        semua_kolom = list(pd.read_csv(path, nrows=0).columns)
+        with open(path, 'rb') as f:
+            f.seek(mulai)
+            opsi = {} if mulai == 0 else {'header': None, 'names': semua_kolom}
+            for chunk in pd.read_csv(f, usecols=kolom, chunksize=chunksize, **opsi):
+                total.tambah(chunk)
+                dihitung += len(chunk)
+
+    # Offset hanya bisa dilanjutkan jika file berakhir di batas baris
+    with open(path, 'rb') as f:
+        f.seek(max(ukuran - 1, 0))
+        utuh = f.read(1) == b'\n'
+    simpan = {'kolom': kolom, 'offset': ukuran if utuh else None,
+              'hash': hash_prefix(path, ukuran) if utuh else None, 'agregat': total}
+    return total, {'csv': simpan}, dihitung
+
+
+def agregat_file(path=None, folder_cache='.', chunksize=CHUNKSIZE, pakai_cache=True):
+    """Agregat EDA untuk file data bersih (CSV/Parquet), memakai & memperbarui cache.
+    Mengembalikan (agregat, jumlah baris yang benar-benar dibaca pada run ini)."""
+    path = path or cari_file(NAMA_BERSIH)
+    if path is None:
+        raise FileNotFoundError(f"File '{NAMA_BERSIH}.parquet/.csv' tidak ditemukan")
+    kolom = kolom_eda(path)
+    path_cache = os.path.join(folder_cache, NAMA_CACHE)
+    semua = joblib.load(path_cache) if pakai_cache and os.path.exists(path_cache) else {}
+    kunci = os.path.abspath(path)
+    cache = semua.get(kunci, {})
+
+    # File persis sama (ukuran + mtime): tidak perlu membaca apa pun
+    stat = os.stat(path)
+    tanda = [stat.st_size, stat.st_mtime_ns, kolom, AKURASI_SKETSA]
+    if cache.get('tanda') == tanda:
+        return cache['agregat'], 0
+
+    fungsi = agregat_parquet if path.endswith('.parquet') else agregat_csv
+    agregat, segmen, dihitung = fungsi(path, kolom, chunksize, cache)
+    semua[kunci] = {'tanda': tanda, 'agregat': agregat, **segmen}
+    if pakai_cache:
+        os.makedirs(folder_cache, exist_ok=True)
+        joblib.dump(semua, path_cache)
+    return agregat, dihitung
+
+
+def benchmark_agregat(path=None, kelipatan=(1, 10, 100)):
+    """Waktu & memori: describe/corr di DataFrame penuh vs satu pass agregat, data digandakan k kali"""
+    import tempfile
+    from data_kost import baca, simpan_parquet
+    from instrumen import baca_hwm_kb, reset_hwm
+
+    path = path or cari_file(NAMA_BERSIH)
+    kolom = kolom_eda(path)
+    df = baca(path, kolom)
+    print(f"{'Kelipatan':<10}{'Baris':>12}{'Penuh (s)':>11}{'RSS (MB)':>10}{'Agregat (s)':>13}{'RSS (MB)':>10}"
+          f"{'Cache (s)':>11}{'Selisih p50':>13}")
+    with tempfile.TemporaryDirectory() as folder:
+        for k in kelipatan:
+            path_k = os.path.join(folder, f"bersih_{k}.parquet")
+            simpan_parquet(pd.concat([df] * k, ignore_index=True), path_k)
+
+            reset_hwm()
+            mulai = time.perf_counter()
+            penuh = baca(path_k, kolom)
+            penuh['Harga_Angka'].describe()
+            penuh.corr()
+            p50_asli = penuh['Harga_Angka'].median()
+            waktu_penuh, rss_penuh = time.perf_counter() - mulai, (baca_hwm_kb() or 0) / 1024
+            del penuh
+
+            reset_hwm()
+            mulai = time.perf_counter()
+            agregat, _ = agregat_file(path_k, folder, chunksize=100_000)
+            agregat.ringkasan()
+            agregat.korelasi()
+            waktu_agregat, rss_agregat = time.perf_counter() - mulai, (baca_hwm_kb() or 0) / 1024
+
+            mulai = time.perf_counter()
+            agregat_file(path_k, folder)
+            waktu_cache = time.perf_counter() - mulai
+
+            selisih = abs(agregat.kuantil(0.5) / p50_asli - 1)
+            print(f"{k:<10}{agregat.n:>12,}{waktu_penuh:>11.3f}{rss_penuh:>10.1f}{waktu_agregat:>13.3f}"
+                  f"{rss_agregat:>10.1f}{waktu_cache:>11.4f}{selisih:>12.3%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agregat EDA streaming (sketsa kuantil, kovarian berjalan)")
+    parser.add_argument('--input', default=None, help="File data bersih (default: dicari seperti script lain)")
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE)
+    parser.add_argument('--benchmark', action='store_true', help="Bandingkan dengan DataFrame penuh di data 1x/10x/100x")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_agregat(args.input)
+    else:
+        agregat, dihitung = agregat_file(args.input, chunksize=args.chunksize)
+        print(f"{agregat.n:,} baris teragregasi ({dihitung:,} baris dibaca pada run ini)")
+        print(agregat.ringkasan().apply(lambda x: format(x, 'f')))
@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
-import joblib
+from tabel_harga import cari_harga, cari_rentang
+from registry_model import PemuatModel
+from fitur_kost import JENIS_KOST, kolom_fasilitas
 
 # ==============================================================================
 # 1. KONFIGURASI HALAMAN
@@ -24,19 +25,34 @@ st.markdown("""
 # ==============================================================================
 # 2. LOAD MODEL & FITUR
 # ==============================================================================
-# Kita ganti cache_resource jadi cache_data dan tambahkan ttl=0 supaya dia reload kalau filenya berubah
-@st.cache_resource(ttl=0) 
-def load_assets():
-    try:
-        model_loaded = joblib.load('model_kost_terbaik.pkl')
-        
-        fitur_loaded = joblib.load('list_fitur.pkl')
-        
-        return model_loaded, fitur_loaded
-    except Exception as e:
-        return None, None
+# Satu pemuat per proses. Setiap rerun hanya os.stat manifest registry; jika training menerbitkan
+# versi baru, model dimuat ulang di thread latar dan request tetap dilayani versi lama sampai siap.
+@st.cache_resource
+def pemuat_model():
+    return PemuatModel()
 
-model, fitur_model = load_assets()
+aset = pemuat_model().ambil()
+if aset is None:
+    model, fitur_model, tabel_harga = None, None, None
+else:
+    model, fitur_model, tabel_harga = aset['artefak'], aset['artefak'].fitur, aset['tabel']
+
+# Label & urutan checkbox untuk 6 fasilitas kunci; fasilitas lain memakai label dari vocabulary
+LABEL_FASILITAS = {
+    'Fasilitas_AC': "AC",
+    'Fasilitas_K_Mandi_Dalam': "Kamar Mandi Dalam",
+    'Fasilitas_WiFi': "WiFi",
+    'Fasilitas_Kasur': "Kasur / Isian",
+    'Fasilitas_Kloset_Duduk': "Kloset Duduk",
+    'Fasilitas_Akses_24_Jam': "Akses 24 Jam",
+}
+
+def label_fasilitas(kolom):
+    return LABEL_FASILITAS.get(kolom) or aset['label'].get(kolom) or kolom.replace('Fasilitas_', '').replace('_', ' ')
+
+def urutan_fasilitas(fitur):
+    kolom = kolom_fasilitas(fitur)
+    return [k for k in LABEL_FASILITAS if k in kolom] + [k for k in kolom if k not in LABEL_FASILITAS]
 
 # ==============================================================================
 # 3. TAMPILAN UTAMA
@@ -54,49 +70,64 @@ else:
             st.subheader("📍 Lokasi & Jenis")
             
             # 1. Logika Pengambilan Lokasi
-            # Mengambil semua fitur yang mengandung kata 'Daerah_Clean_'
-            opsi_lokasi = [f.replace('Daerah_Clean_', '') for f in fitur_model if 'Daerah_Clean_' in f]
-            lokasi = st.selectbox("Pilih Kecamatan", sorted(opsi_lokasi))
+            # Kecamatan yang dikenal encoder (sudah tanpa kecamatan yang kena filter saat training)
+            lokasi = st.selectbox("Pilih Kecamatan", sorted(model.encoder.lokasi))
             
-            jenis = st.radio("Jenis Kost", ["Putra", "Putri", "Campur"], horizontal=True)
+            jenis = st.radio("Jenis Kost", JENIS_KOST, horizontal=True)
 
         with col2:
             st.subheader("🛋️ Fasilitas")
-            ac = st.checkbox("AC")
-            km_dalam = st.checkbox("Kamar Mandi Dalam")
-            wifi = st.checkbox("WiFi")
-            kasur = st.checkbox("Kasur / Isian")
-            kloset = st.checkbox("Kloset Duduk")
-            akses_24 = st.checkbox("Akses 24 Jam")
+            # Checkbox dibuat dari kolom Fasilitas_* di list fitur, jadi ikut vocabulary penuh jika dipakai
+            centang = {kolom: st.checkbox(label_fasilitas(kolom)) for kolom in urutan_fasilitas(fitur_model)}
 
         submitted = st.form_submit_button("💰 Hitung Harga")
 
     # --- LOGIKA PREDIKSI ---
     if submitted:
-        input_data = pd.DataFrame(0, index=[0], columns=fitur_model)
-        
-        input_data['Fasilitas_AC'] = 1 if ac else 0
-        input_data['Fasilitas_WiFi'] = 1 if wifi else 0
-        input_data['Fasilitas_K_Mandi_Dalam'] = 1 if km_dalam else 0
-        input_data['Fasilitas_Kloset_Duduk'] = 1 if kloset else 0
-        input_data['Fasilitas_Kasur'] = 1 if kasur else 0
-        input_data['Fasilitas_Akses_24_Jam'] = 1 if akses_24 else 0
-        
-        nama_kolom_lokasi = f"Daerah_Clean_{lokasi}"
-        if nama_kolom_lokasi in input_data.columns:
-            input_data[nama_kolom_lokasi] = 1
-            
-        nama_kolom_jenis = f"Jenis Kost_{jenis}"
-        if nama_kolom_jenis in input_data.columns:
-            input_data[nama_kolom_jenis] = 1
-
         try:
-            prediksi_harga = model.predict(input_data)[0]
+            fasilitas_aktif = [kolom for kolom, aktif in centang.items() if aktif]
+            listing = {'kecamatan': lokasi, 'jenis': jenis, 'fasilitas': fasilitas_aktif}
+            # Rentang hanya ditampilkan jika sudah dikalibrasi (cakupannya di data uji tercatat di artefak);
+            # sebaran per pohon mentah jauh lebih sempit dari variasi harga sebenarnya
+            pakai_rentang = model.interval_terkalibrasi
+            rentang = None
+            if tabel_harga is not None and tabel_harga['fitur'] == list(fitur_model):
+                # Jalur cepat: ambil dari tabel harga kalau skema fiturnya sama dengan model
+                prediksi_harga = cari_harga(tabel_harga, lokasi, jenis, set(fasilitas_aktif))
+                if pakai_rentang:
+                    rentang = cari_rentang(tabel_harga, lokasi, jenis, set(fasilitas_aktif))
+            elif pakai_rentang:
+                # Forest: prediksi + P10/P50/P90 per pohon dari satu traversal vektor
+                rentang = model.prediksi_interval(listing)
+                prediksi_harga = rentang['prediksi']
+            else:
+                # Encoder artefak: langsung ke array NumPy, tanpa DataFrame per request
+                prediksi_harga = model.prediksi(listing)
+            if pakai_rentang and rentang is None:
+                # Tabel harga lama tanpa kolom rentang
+                rentang = model.prediksi_interval(listing)
+
+            teks_rentang = ""
+            if rentang is not None:
+                teks_rentang = f"<p>Rentang wajar (P10–P90): Rp {int(rentang['p10']):,} – Rp {int(rentang['p90']):,}</p>"
             st.markdown(f"""
                 <div class="result-box">
                     <h3>Estimasi Harga Sewa per Bulan:</h3>
                     <p class="big-font">Rp {int(prediksi_harga):,}</p>
+                    {teks_rentang}
                 </div>
             """, unsafe_allow_html=True)
+            if rentang is not None:
+                st.caption(f"Rentang dari sebaran prediksi per pohon; di data uji, {model.cakupan_interval}% "
+                           f"harga asli berada di dalam rentang ini.")
+
+            # Listing asli yang mirip: kecamatan & jenis sama, fasilitas paling mirip, harga terdekat
+            if aset['serupa'] is not None:
+                serupa = aset['serupa'].serupa(lokasi, jenis, fasilitas_aktif, prediksi_harga)
+                if serupa:
+                    st.subheader("🔎 Kost Serupa")
+                    st.dataframe([{'Nama Kost': s['Nama Kost'], 'Harga': f"Rp {s['Harga_Angka']:,}",
+                                   'Beda Fasilitas': s['Beda_Fasilitas']} for s in serupa],
+                                 hide_index=True, use_container_width=True)
         except Exception as e:
             st.error(f"Error: {e}")
\ No newline at end of file
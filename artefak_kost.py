@@ -0,0 +1,150 @@
+import os
+import time
+import joblib
+import numpy as np
+from fitur_kost import EncoderKost
+from forest_flat import DIR_FOREST, KUANTIL_INTERVAL, ForestFlat, forest_dari_model, muat_forest, sidik_model
+
+# ==============================================================================
+# ARTEFAK MODEL: ENCODER + MODEL DALAM SATU FILE BERVERSI
+# ==============================================================================
+# train_model.py menyimpan ModelKost (EncoderKost hasil fit + model juara) ke
+# model_kost_terbaik.pkl. Tidak ada lagi list_fitur.pkl terpisah yang bisa
+# tidak cocok dengan modelnya. Pemakai:
+#     artefak = muat_artefak()
+#     artefak.prediksi({'kecamatan': 'Lowokwaru', 'jenis': 'Putri', 'fasilitas': ['AC']})
+#     y, dikenal = artefak.prediksi_df(df_bersih)
+# artefak.predict(X) tetap ada untuk X yang sudah di-encode (tabel harga,
+# cek paritas forest flat), jadi perilakunya sama dengan model sklearn polos.
+# Jika modelnya forest, artefak.prediksi_interval(listing) juga memberi
+# rentang P10/P50/P90 dari sebaran prediksi per pohon.
+
+PATH_ARTEFAK = 'model_kost_terbaik.pkl'
+# 1 = model sklearn polos + list_fitur.pkl; 2 = ModelKost
+VERSI_ARTEFAK = 2
+PATH_FITUR_LAMA = 'list_fitur.pkl'
+
+
+def nama_kuantil(kuantil):
+    return [f"p{round(q * 100)}" for q in kuantil]
+
+
+class ModelKost:
+    # Diisi train_model.py (artefak lama tidak punya): pelebaran conformal P10/P90 dalam Rupiah
+    # dan cakupan rentang terkoreksi di data test
+    koreksi_interval = 0.0
+    cakupan_interval = None
+
+    def __init__(self, encoder, model, nama=''):
+        self.versi = VERSI_ARTEFAK
+        self.encoder = encoder
+        self.model = model
+        self.nama = nama
+        self.dibuat = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    @property
+    def fitur(self):
+        return self.encoder.fitur
+
+    def predict(self, X):
+        """X sudah di-encode (urutan kolom = self.fitur)"""
+        return self.model.predict(X)
+
+    def prediksi(self, listing):
+        """Harga untuk satu listing mentah (dict), tanpa DataFrame"""
+        return float(self.model.predict(self.encoder.encode(listing))[0])
+
+    def prediksi_banyak(self, daftar_listing):
+        return self.model.predict(np.vstack([self.encoder.encode(l) for l in daftar_listing]))
+
+    def prediksi_df(self, df):
+        """Prediksi DataFrame bersih; juga mengembalikan mask baris yang kecamatannya dikenal model"""
+        X, dikenal = self.encoder.transform(df)
+        return self.model.predict(X), dikenal
+
+    def __getstate__(self):
+        # Forest flat di memori (cache interval) tidak ikut di-pickle: bisa dibangun ulang dari model
+        state = self.__dict__.copy()
+        state.pop('_forest', None)
+        return state
+
+    @property
+    def punya_interval(self):
+        return isinstance(self.model, ForestFlat) or hasattr(self.model, 'estimators_')
+
+    @property
+    def interval_terkalibrasi(self):
+        """Forest dengan koreksi conformal dari training (cakupan rentangnya di data uji tercatat)"""
+        return self.punya_interval and self.cakupan_interval is not None
+
+    def cek_interval(self):
+        """ValueError jika rentang harga tidak boleh disajikan: bukan forest, atau artefak lama/tanpa
+        kalibrasi (sebaran per pohon mentah hanya mencakup ±36% harga asli)"""
+        if not self.punya_interval:
+            raise ValueError(f"Rentang harga tidak tersedia: model {self.nama or type(self.model).__name__} "
+                             f"bukan forest")
+        if self.cakupan_interval is None:
+            raise ValueError("Rentang harga tidak tersedia: artefak belum dikalibrasi (model lama); "
+                             "jalankan ulang train_model.py")
+
+    def forest(self):
+        """Model sebagai ForestFlat: yang di-mmap jika ada, kalau tidak diratakan sekali di memori"""
+        if isinstance(self.model, ForestFlat):
+            return self.model
+        if '_forest' not in self.__dict__:
+            if not hasattr(self.model, 'estimators_'):
+                raise ValueError(f"Model {self.nama or type(self.model).__name__} bukan forest; "
+                                 f"rentang harga per pohon tidak tersedia")
+            self._forest = forest_dari_model(self.model)
+        return self._forest
+
+    def interval(self, X, kuantil=KUANTIL_INTERVAL):
+        """X sudah di-encode -> (y, Q): prediksi + kuantil per pohon dari satu traversal.
+        Untuk kuantil default, kuantil terluar dilebarkan sebesar koreksi_interval.
+        ValueError jika artefak tidak punya rentang terkalibrasi (lihat cek_interval)."""
+        self.cek_interval()
+        y, Q = self.forest().predict_interval(X, kuantil)
+        if self.koreksi_interval and tuple(kuantil) == KUANTIL_INTERVAL:
+            Q[:, 0] = np.maximum(Q[:, 0] - self.koreksi_interval, 0)
+            Q[:, -1] += self.koreksi_interval
+        return y, Q
+
+    def prediksi_interval(self, listing, kuantil=KUANTIL_INTERVAL):
+        """Satu listing mentah -> {'prediksi': ..., 'p10': ..., 'p50': ..., 'p90': ...}"""
+        y, Q = self.interval(self.encoder.encode(listing), kuantil)
+        return {'prediksi': float(y[0]), **dict(zip(nama_kuantil(kuantil), map(float, Q[0])))}
+
+    def interval_df(self, df, kuantil=KUANTIL_INTERVAL):
+        """Seperti prediksi_df, plus kuantil per pohon: (y, Q, dikenal)"""
+        X, dikenal = self.encoder.transform(df)
+        y, Q = self.interval(X, kuantil)
+        return y, Q, dikenal
+
+
+def simpan_artefak(artefak, path=PATH_ARTEFAK):
+    """Tulis ke file sementara lalu os.replace, supaya pembaca tidak pernah melihat file setengah jadi"""
+    sementara = f"{path}.tmp"
+    joblib.dump(artefak, sementara)
+    os.replace(sementara, path)
+
+
+def muat_artefak(path=PATH_ARTEFAK, folder_flat=DIR_FOREST, pakai_flat=True):
+    """Load artefak; model diganti forest flat (mmap) jika ada dan diekspor dari model yang sama
+    (sidik isi pohon di meta.json cocok). Ekspor usang diabaikan dengan peringatan.
+    Artefak versi 1 (model polos + list_fitur.pkl) masih bisa dibaca."""
+    artefak = joblib.load(path)
+    if not isinstance(artefak, ModelKost):
+        fitur = joblib.load(os.path.join(os.path.dirname(path), PATH_FITUR_LAMA))
+        artefak = ModelKost(EncoderKost(fitur), artefak)
+    elif artefak.versi != VERSI_ARTEFAK:
+        raise ValueError(f"Versi artefak '{path}' = {artefak.versi}, kode ini butuh versi {VERSI_ARTEFAK}. "
+                         f"Jalankan ulang train_model.py.")
+
+    if pakai_flat and os.path.exists(folder_flat) and hasattr(artefak.model, 'estimators_'):
+        forest = muat_forest(folder_flat)
+        if forest.meta.get('sidik_model') == sidik_model(artefak.model):
+            artefak.model = forest
+        else:
+            print(f"[PERINGATAN] '{folder_flat}/' bukan ekspor dari model di '{path}'; memakai model pickle. "
+                  f"Jalankan forest_flat.py untuk mengekspor ulang.")
+    return artefak
@@ -0,0 +1,188 @@
+import io
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import joblib
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+import clean_data
+import train_model
+from sintetis import profil_data, tulis_sintetis
+from forest_flat import ekspor_forest, muat_forest
+from tabel_harga import buat_tabel_harga, cari_harga
+from fitur_kost import kolom_fasilitas
+from instrumen import Instrumen, persentil_ms, ringkas
+
+# ==============================================================================
+# BENCHMARK SKALA: CLEAN, TRAINING, LOAD & PREDIKSI DI 10k - 10M BARIS SINTETIS
+# ==============================================================================
+# Untuk setiap ukuran: data mentah sintetis dibuat (sintetis.py), lalu diukur
+#   clean         : clean_data.run_cleaning mode chunk (baris/detik)
+#   siapkan_data  : load + filter + one-hot seperti train_model.py
+#   fit_<model>   : waktu training LR dan RF (parameter tetap, bukan Optuna)
+#   muat_<model>  : waktu load artefak (pickle, forest flat mmap, tabel harga)
+#   satu_<model>  : latensi prediksi 1 baris seperti app.py (p50/p99 ms)
+#   batch_<model> : throughput prediksi batch (baris/detik)
+# Setiap pengukuran ditulis lewat Instrumen ke hasil_evaluasi/benchmark_skala.jsonl
+# (satu baris JSON per tahap@ukuran, ada wall/CPU/RSS puncak), jadi run bisa
+# dibandingkan dengan: python instrumen.py --path hasil_evaluasi/benchmark_skala.jsonl
+
+PATH_HASIL = os.path.join('hasil_evaluasi', 'benchmark_skala.jsonl')
+UKURAN_DEFAULT = [10_000, 100_000]
+# Parameter terbaik RF dari laporan komparasi, dengan jumlah pohon lebih kecil supaya 1M+ baris masih masuk akal
+PARAMS_RF = {'n_estimators': 100, 'max_depth': 8, 'min_samples_split': 7, 'min_samples_leaf': 1}
+
+
+def label_ukuran(n):
+    for batas, akhiran in [(1_000_000, 'M'), (1_000, 'k')]:
+        if n >= batas and n % batas == 0:
+            return f"{n // batas}{akhiran}"
+    return str(n)
+
+
+def benchmark_ukuran(metrik, n, profil, folder, maks_latih, n_ulang, params_rf, n_batch):
+    label = label_ukuran(n)
+    print(f"\n=== {n:,} baris ({label}) ===")
+    path_mentah = os.path.join(folder, 'data_kost_malang.csv')
+    path_bersih = os.path.join(folder, 'data_kost_malang_clean.csv')
+
+    with metrik.tahap(f"generate@{label}", ukuran=n, baris=n):
+        tulis_sintetis(path_mentah, n, profil=profil)
+
+    # --- Clean (mode chunk: memori konstan berapa pun ukurannya) ---
+    with metrik.tahap(f"clean@{label}", ukuran=n) as m:
+        mulai = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            clean_data.run_cleaning(chunksize=1_000_000, path_input=path_mentah, output_file=path_bersih)
+        m['baris'] = n
+        m['baris_per_detik'] = round(n / (time.perf_counter() - mulai))
+    print(f"clean          : {m['baris_per_detik']:>12,} baris/detik")
+
+    # --- Fitur persis seperti train_model.py (folder data dipaksa ke folder sementara) ---
+    os.environ['KOST_DIR_DATA'] = folder
+    with metrik.tahap(f"siapkan_data@{label}", ukuran=n) as m:
+        with contextlib.redirect_stdout(io.StringIO()):
+            X, y, _, _ = train_model.siapkan_data()
+        m['baris'], m['fitur'] = X.shape
+    del os.environ['KOST_DIR_DATA']
+
+    if len(X) > maks_latih:
+        X = X.sample(maks_latih, random_state=42)
+        y = y.loc[X.index]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    fitur = X.columns.tolist()
+
+    # --- Training ---
+    model = {
+        'linear_regression': LinearRegression(),
+        'random_forest': RandomForestRegressor(**params_rf, random_state=42, n_jobs=-1),
+    }
+    for nama, mdl in model.items():
+        with metrik.tahap(f"fit_{nama}@{label}", ukuran=n, baris=len(X_train)) as m:
+            mulai = time.perf_counter()
+            mdl.fit(X_train, y_train)
+            durasi = time.perf_counter() - mulai
+        print(f"fit {nama:<20}: {durasi:>10.2f} s ({len(X_train):,} baris)")
+
+    # --- Simpan & load artefak seperti yang dipakai app.py ---
+    artefak = {}
+    for nama, mdl in model.items():
+        path = os.path.join(folder, f"{nama}.pkl")
+        joblib.dump(mdl, path)
+        with metrik.tahap(f"muat_{nama}@{label}", ukuran=n) as m:
+            artefak[nama] = joblib.load(path)
+            m['ukuran_mb'] = round(os.path.getsize(path) / 1024 / 1024, 2)
+
+    dir_flat = os.path.join(folder, 'model_flat')
+    ekspor_forest(model['random_forest'], dir_flat)
+    with metrik.tahap(f"muat_forest_flat@{label}", ukuran=n):
+        artefak['forest_flat'] = muat_forest(dir_flat)
+
+    path_tabel = os.path.join(folder, 'tabel_harga.pkl')
+    with metrik.tahap(f"buat_tabel_harga@{label}", ukuran=n):
+        joblib.dump(buat_tabel_harga(model['random_forest'], fitur), path_tabel)
+    with metrik.tahap(f"muat_tabel_harga@{label}", ukuran=n):
+        tabel = joblib.load(path_tabel)
+
+    # --- Prediksi satu baris (input form app.py) ---
+    contoh = X_test.iloc[:n_ulang]
+    satu_df = [contoh.iloc[[i]] for i in range(len(contoh))]
+    satu_np = [baris.to_numpy(np.float32) for baris in satu_df]
+    lokasi = {f: f.replace('Daerah_Clean_', '') for f in fitur if f.startswith('Daerah_Clean_')}
+    jenis = {f: f.replace('Jenis Kost_', '') for f in fitur if f.startswith('Jenis Kost_')}
+    satu_tabel = []
+    for baris in satu_df:
+        aktif = {k for k in fitur if baris.iloc[0][k]}
+        satu_tabel.append((next(lokasi[k] for k in aktif if k in lokasi), next(jenis[k] for k in aktif if k in jenis),
+                           aktif & set(kolom_fasilitas(fitur))))
+
+    cara_satu = {
+        'linear_regression': lambda i: artefak['linear_regression'].predict(satu_df[i]),
+        'random_forest': lambda i: artefak['random_forest'].predict(satu_df[i]),
+        'forest_flat': lambda i: artefak['forest_flat'].predict(satu_np[i]),
+        'tabel_harga': lambda i: cari_harga(tabel, *satu_tabel[i]),
+    }
+    for nama, fungsi in cara_satu.items():
+        with metrik.tahap(f"satu_{nama}@{label}", ukuran=n, baris=len(contoh)) as m:
+            waktu = []
+            for i in range(len(contoh)):
+                mulai = time.perf_counter()
+                fungsi(i)
+                waktu.append(time.perf_counter() - mulai)
+            m.update(persentil_ms(waktu))
+        print(f"satu {nama:<19}: p50 {m['p50_ms']:>8.3f} ms, p99 {m['p99_ms']:>8.3f} ms")
+
+    # --- Prediksi batch ---
+    X_batch = X_test.iloc[:n_batch]
+    cara_batch = {
+        'linear_regression': lambda: artefak['linear_regression'].predict(X_batch),
+        'random_forest': lambda: artefak['random_forest'].predict(X_batch),
+        'forest_flat': lambda: artefak['forest_flat'].predict(X_batch.to_numpy(np.float32)),
+    }
+    for nama, fungsi in cara_batch.items():
+        with metrik.tahap(f"batch_{nama}@{label}", ukuran=n, baris=len(X_batch)) as m:
+            mulai = time.perf_counter()
+            fungsi()
+            m['baris_per_detik'] = round(len(X_batch) / (time.perf_counter() - mulai))
+        print(f"batch {nama:<18}: {m['baris_per_detik']:>12,} baris/detik ({len(X_batch):,} baris)")
+
+
+def jalankan_benchmark(daftar_ukuran=UKURAN_DEFAULT, maks_latih=1_000_000, n_ulang=200, n_batch=100_000,
+                       params_rf=PARAMS_RF, path=PATH_HASIL):
+    print("=== BENCHMARK SKALA (DATA SINTETIS) ===")
+    # Metrik internal clean_data/train_model tidak dicampur ke hasil_evaluasi/metrik.jsonl
+    clean_data.METRIK.path = ''
+    train_model.METRIK.path = ''
+
+    metrik = Instrumen('benchmark_skala', path=path)
+    profil = profil_data()
+    for n in daftar_ukuran:
+        folder = tempfile.mkdtemp(prefix=f"bench_skala_{label_ukuran(n)}_")
+        try:
+            benchmark_ukuran(metrik, n, profil, folder, maks_latih, n_ulang, params_rf, n_batch)
+        finally:
+            shutil.rmtree(folder)
+
+    print(f"\nHasil tersimpan di '{path}' (run {metrik.id_run})")
+    ringkas(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark clean/training/prediksi di data sintetis berbagai ukuran")
+    parser.add_argument('--ukuran', type=int, nargs='+', default=UKURAN_DEFAULT,
+                        help="Jumlah baris mentah per skenario, mis. 100000 1000000 10000000")
+    parser.add_argument('--maks-latih', type=int, default=1_000_000,
+                        help="Batas baris untuk training (sampel acak jika data lebih besar)")
+    parser.add_argument('--n-pohon', type=int, default=PARAMS_RF['n_estimators'], help="n_estimators RF")
+    parser.add_argument('--n-ulang', type=int, default=200, help="Jumlah prediksi satu baris per model")
+    parser.add_argument('--n-batch', type=int, default=100_000, help="Baris per prediksi batch")
+    parser.add_argument('--output', default=PATH_HASIL, help="File JSON lines hasil")
+    args = parser.parse_args()
+
+    jalankan_benchmark(args.ukuran, args.maks_latih, args.n_ulang, args.n_batch,
+                       {**PARAMS_RF, 'n_estimators': args.n_pohon}, args.output)
@@ -1,11 +1,11 @@
-import pandas as pd
+from data_kost import muat_bersih
 
 def cek_sebaran_data():
     print("=== CEK JUMLAH DATA PER KECAMATAN ===")
     
     try:
-        # Load data
-        df = pd.read_csv('data/data_kost_malang_clean.csv')
+        # Load data (cukup kolom kecamatan)
+        df = muat_bersih(['Daerah_Clean'])
         
         # Hitung jumlah kemunculan setiap kecamatan
         sebaran = df['Daerah_Clean'].value_counts()
@@ -25,7 +25,7 @@ def cek_sebaran_data():
             print("\n✅ Semua kecamatan memiliki jumlah data yang cukup.")
             
     except FileNotFoundError:
-        print("❌ File 'data_kost_malang_clean.csv' tidak ditemukan.")
+        print("❌ File 'data_kost_malang_clean' (.parquet/.csv) tidak ditemukan.")
 
 if __name__ == "__main__":
     cek_sebaran_data()
\ No newline at end of file
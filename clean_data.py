@@ -1,54 +1,163 @@
+import os
 import pandas as pd
+import numpy as np
 import re
+import time
+import joblib
+import argparse
+from scipy import sparse
+import pyarrow as pa
+import pyarrow.compute as pc
+from data_kost import NAMA_MENTAH, PenulisParquet, baca, baca_per_chunk, cari_file, path_parquet, simpan_parquet
+from instrumen import Instrumen
+from dedup_kost import AMBANG_JACCARD, cetak_ringkasan, hapus_duplikat
 
-def run_cleaning():
-    print("=== MEMULAI PEMBERSIHAN DATA ===")
+# Waktu, CPU, memori puncak & jumlah baris per tahap -> hasil_evaluasi/metrik.jsonl
+METRIK = Instrumen('clean_data')
 
-    # 1. Load Data Mentah
-    # Pastikan nama file sesuai dengan hasil scrape Anda
-    try:
-        df = pd.read_csv('data_kost_malang.csv')
-        print(f"Data awal dimuat: {len(df)} baris.")
-    except FileNotFoundError:
-        print("Error: File 'data_kost_malang.csv' tidak ditemukan.")
-        return
+# Daftar fasilitas kunci yang mempengaruhi harga
+fitur_kunci = ['AC', 'WiFi', 'K. Mandi Dalam', 'Kloset Duduk', 'Kasur', 'Akses 24 Jam']
+
+# Pemisah antar fasilitas di teks hasil scrape, mis. "WiFi·Kloset Duduk·Kasur"
+PEMISAH_FASILITAS = '·'
+# Fasilitas yang muncul kurang dari ini tidak masuk vocabulary
+MIN_FREK_FASILITAS = 10
+
+def clean_harga(text):
+    # Hapus semua karakter yang BUKAN angka
+    clean_text = re.sub(r'[^0-9]', '', str(text))
+    return int(clean_text) if clean_text else 0
+
+def clean_fasilitas_text(text):
+    text = str(text)
+    # Hapus 'star-glyph' dan angka rating di belakangnya
+    text = re.sub(r'star-glyph.*', '', text)
+    return text.strip()
+
+def clean_daerah(text):
+    text = str(text)
+    return text.replace('Kecamatan ', '').strip()
+
+def nama_kolom_fasilitas(fitur):
+    # Nama kolom baru, misal: "Fasilitas_AC"
+    return f"Fasilitas_{fitur.replace(' ', '_').replace('.', '')}"
+
+def bersihkan_data(df, sertakan_teks=False):
+    """Tahap 1-4 pembersihan untuk DataFrame mentah hasil scrape, mengembalikan kolom final.
+
+    Versi vektor (operasi .str pandas). Hasilnya identik dengan bersihkan_data_per_baris.
+    sertakan_teks=True ikut mengembalikan kolom 'Fasilitas_Clean' (untuk vocabulary penuh).
+    """
+
+    # TAHAP 1: Harga -> buang semua karakter non-angka, kosong jadi 0
+    harga = df['Harga Mentah'].astype(str).str.replace(r'[^0-9]', '', regex=True)
+    harga = pd.to_numeric(harga.where(harga != '', '0')).astype('int64')
+    df = df.assign(Harga_Angka=harga)
+    df = df[df['Harga_Angka'] > 100000]
+
+    # TAHAP 2: Buang 'star-glyph' + rating di belakangnya
+    fasilitas = df['Fasilitas'].astype(str).str.replace(r'star-glyph.*', '', regex=True).str.strip()
+    fasilitas_lower = fasilitas.str.lower()
+
+    # TAHAP 3: Fasilitas kunci -> kolom 0/1
+    kolom_baru = {'Fasilitas_Clean': fasilitas}
+    for fitur in fitur_kunci:
+        kolom_baru[nama_kolom_fasilitas(fitur)] = fasilitas_lower.str.contains(fitur.lower(), regex=False).astype('int64')
+
+    # TAHAP 4: "Kecamatan Lowokwaru" -> "Lowokwaru"
+    kolom_baru['Daerah_Clean'] = df['Daerah'].astype(str).str.replace('Kecamatan ', '', regex=False).str.strip()
+    df = df.assign(**kolom_baru)
+
+    kolom_final = ['Nama Kost', 'Jenis Kost', 'Daerah_Clean', 'Harga_Angka']
+    kolom_final.extend(nama_kolom_fasilitas(f) for f in fitur_kunci)
+    if sertakan_teks:
+        kolom_final.append('Fasilitas_Clean')
+    return df[kolom_final]
+
+# ====================================================================
+# VOCABULARY FASILITAS PENUH (MATRIKS SPARSE MULTI-HOT)
+# ====================================================================
+# Selain 6 fasilitas kunci, teks Fasilitas bisa berisi fasilitas lain. Teks
+# dipecah sekali per token, setiap token jadi kolom "Fasilitas_<token>", dan
+# hasilnya disimpan sebagai matriks CSR (hanya posisi bernilai 1 yang disimpan).
+
+class KumpulanFasilitas:
+    """Mengumpulkan token fasilitas per chunk; kolom baru ditambahkan saat pertama muncul"""
+
+    def __init__(self):
+        self.kolom = {}
+        self.label = {}
+        self.baris, self.indeks = [], []
+        self.n_baris = 0
+
+    def tambah(self, teks_bersih):
+        token = teks_bersih.reset_index(drop=True).str.split(PEMISAH_FASILITAS).explode().str.strip()
+        token = token[token.notna() & (token != '') & (token != 'nan')]
+        nama = 'Fasilitas_' + token.str.replace(' ', '_', regex=False).str.replace('.', '', regex=False)
+
+        for kolom, label in zip(nama.drop_duplicates(), token[~nama.duplicated()]):
+            if kolom not in self.kolom:
+                self.kolom[kolom] = len(self.kolom)
+                self.label[kolom] = label
+
+        self.baris.append(token.index.to_numpy() + self.n_baris)
+        self.indeks.append(nama.map(self.kolom).to_numpy(dtype=np.int64))
+        self.n_baris += len(teks_bersih)
+
+    def matriks(self, min_frek=MIN_FREK_FASILITAS):
+        """CSR multi-hot (n_baris x vocab) + daftar kolom, diurutkan dari yang paling sering"""
+        baris = np.concatenate(self.baris) if self.baris else np.zeros(0, dtype=np.int64)
+        indeks = np.concatenate(self.indeks) if self.indeks else np.zeros(0, dtype=np.int64)
+        m = sparse.csr_matrix((np.ones(len(baris), dtype=np.int8), (baris, indeks)),
+                              shape=(self.n_baris, len(self.kolom)))
+        # Token yang sama dua kali di satu listing tetap dihitung 1
+        m.data = np.minimum(m.data, 1)
+
+        frek = m.getnnz(axis=0)
+        urutan = [i for i in np.argsort(-frek, kind='stable') if frek[i] >= min_frek]
+        nama = list(self.kolom)
+        kolom = [nama[i] for i in urutan]
+        return m[:, urutan].tocsr(), kolom
+
+def path_multihot(output_file):
+    """Lokasi matriks & vocab, diletakkan di samping CSV/Parquet bersih"""
+    dasar = re.sub(r'\.(csv|parquet)$', '', output_file)
+    return f"{dasar}_fasilitas.npz", f"{dasar}_fasilitas_vocab.pkl"
+
+def simpan_multihot(kumpulan, output_file, min_frek=MIN_FREK_FASILITAS):
+    matriks, kolom = kumpulan.matriks(min_frek)
+    path_npz, path_vocab = path_multihot(output_file)
+    sparse.save_npz(path_npz, matriks)
+    joblib.dump({'kolom': kolom, 'label': {k: kumpulan.label[k] for k in kolom}, 'min_frek': min_frek}, path_vocab)
+    print(f"Vocabulary fasilitas: {len(kolom)} kolom (min {min_frek}x), {matriks.nnz} nilai 1 "
+          f"-> '{path_npz}', '{path_vocab}'")
+    return matriks, kolom
+
+def bersihkan_data_per_baris(df):
+    """Versi lama (apply per baris). Disimpan sebagai acuan untuk cek identik & benchmark"""
 
     # ====================================================================
     # TAHAP 1: BERSIHKAN HARGA (Hapus Rp, Titik, spasi)
     # ====================================================================
-    def clean_harga(text):
-        # Hapus semua karakter yang BUKAN angka
-        clean_text = re.sub(r'[^0-9]', '', str(text))
-        return int(clean_text) if clean_text else 0
-
+    df = df.copy()
     df['Harga_Angka'] = df['Harga Mentah'].apply(clean_harga)
-    
+
     # Filter: Hapus data yang harganya 0 atau aneh (di bawah 100rb)
     df = df[df['Harga_Angka'] > 100000]
 
     # ====================================================================
     # TAHAP 2: BERSIHKAN TEXT FASILITAS (Hapus star-glyph)
     # ====================================================================
-    def clean_fasilitas_text(text):
-        text = str(text)
-        # Hapus 'star-glyph' dan angka rating di belakangnya
-        text = re.sub(r'star-glyph.*', '', text)
-        return text.strip()
-
     df['Fasilitas_Clean'] = df['Fasilitas'].apply(clean_fasilitas_text)
 
     # ====================================================================
     # TAHAP 3: FEATURE ENGINEERING (Pecah Fasilitas jadi Kolom 0/1)
     # ====================================================================
     # Ini langkah paling penting buat AI. Kita ubah teks jadi angka.
-    
-    # Daftar fasilitas kunci yang mempengaruhi harga
-    fitur_kunci = ['AC', 'WiFi', 'K. Mandi Dalam', 'Kloset Duduk', 'Kasur', 'Akses 24 Jam']
-
     for fitur in fitur_kunci:
         # Nama kolom baru, misal: "Fasilitas_AC"
-        col_name = f"Fasilitas_{fitur.replace(' ', '_').replace('.', '')}"
-        
+        col_name = nama_kolom_fasilitas(fitur)
+
         # Isi 1 jika ada kata kuncinya, 0 jika tidak ada
         df[col_name] = df['Fasilitas_Clean'].apply(lambda x: 1 if fitur.lower() in x.lower() else 0)
 
@@ -56,32 +165,100 @@ def run_cleaning():
     # TAHAP 4: STANDARDISASI DAERAH
     # ====================================================================
     # Mengubah "Kecamatan Lowokwaru" menjadi "Lowokwaru" saja agar seragam
-    def clean_daerah(text):
-        text = str(text)
-        return text.replace('Kecamatan ', '').strip()
-
     df['Daerah_Clean'] = df['Daerah'].apply(clean_daerah)
 
-    # ====================================================================
-    # TAHAP 5: SIMPAN HASIL
-    # ====================================================================
-    
     # Kita pilih kolom-kolom yang sudah bersih saja untuk disimpan
     kolom_final = [
-        'Nama Kost', 
-        'Jenis Kost', 
-        'Daerah_Clean', 
+        'Nama Kost',
+        'Jenis Kost',
+        'Daerah_Clean',
         'Harga_Angka'
     ]
     # Masukkan semua kolom fasilitas baru secara otomatis
     kolom_fasilitas = [col for col in df.columns if 'Fasilitas_' in col and col != 'Fasilitas_Clean']
     kolom_final.extend(kolom_fasilitas)
 
-    df_clean = df[kolom_final]
-    
-    # Simpan ke CSV baru
-    output_file = 'data_kost_malang_clean.csv'
-    df_clean.to_csv(output_file, index=False)
+    return df[kolom_final]
+
+def path_klaster(output_file):
+    """Laporan klaster duplikat ditulis di samping output, mis. data_kost_malang_clean_klaster_duplikat.csv"""
+    return re.sub(r'\.(csv|parquet)$', '', output_file) + '_klaster_duplikat.csv'
+
+def dedup_data(df_clean, output_file, ambang=AMBANG_JACCARD):
+    """Gabungkan listing duplikat/nama mirip (dedup_kost.py) dan simpan laporan klasternya"""
+    with METRIK.tahap('dedup', baris_awal=len(df_clean)) as m:
+        df_unik, laporan, statistik = hapus_duplikat(df_clean, ambang)
+        laporan.to_csv(path_klaster(output_file), index=False)
+        m.update(baris=len(df_unik), pasangan_kandidat=statistik['pasangan_kandidat'])
+    print()
+    cetak_ringkasan(laporan, statistik)
+    print(f"Laporan klaster tersimpan di '{path_klaster(output_file)}'")
+    return df_unik
+
+@METRIK.bungkus('total')
+def run_cleaning(chunksize=None, path_input=None, output_file='data_kost_malang_clean.csv',
+                 vocab_penuh=False, min_frek=MIN_FREK_FASILITAS, dedup=False, ambang=AMBANG_JACCARD):
+    print("=== MEMULAI PEMBERSIHAN DATA ===")
+    # Default: data mentah dicari di root lalu data/ (Parquet jika ada, kalau tidak CSV)
+    path_input = path_input or cari_file(NAMA_MENTAH) or 'data_kost_malang.csv'
+    if not os.path.exists(path_input):
+        print(f"Error: File '{path_input}' tidak ditemukan.")
+        return
+
+    # Mode streaming: baca-bersihkan-tulis per chunk, memori konstan berapa pun ukuran file
+    if chunksize:
+        reader = baca_per_chunk(path_input, chunksize)
+        penulis = PenulisParquet(path_parquet(output_file))
+        total_awal, total_bersih = 0, 0
+        kumpulan = KumpulanFasilitas() if vocab_penuh else None
+        with METRIK.tahap('bersihkan_per_chunk', chunksize=chunksize) as m:
+            for i, chunk in enumerate(reader):
+                df_clean = bersihkan_data(chunk, sertakan_teks=vocab_penuh)
+                if vocab_penuh:
+                    kumpulan.tambah(df_clean.pop('Fasilitas_Clean'))
+                df_clean.to_csv(output_file, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                penulis.tulis(df_clean)
+                total_awal += len(chunk)
+                total_bersih += len(df_clean)
+            penulis.tutup()
+            m['baris_mentah'], m['baris'] = total_awal, total_bersih
+
+        print(f"Data awal diproses per {chunksize} baris: {total_awal} baris.")
+        if vocab_penuh:
+            simpan_multihot(kumpulan, output_file, min_frek)
+        print("\n===============================================")
+        print(f"SUKSES! Data bersih tersimpan di '{output_file}'")
+        print(f"Total Data Bersih: {total_bersih} baris.")
+        return
+
+    # 1. Load Data Mentah
+    # Pastikan nama file sesuai dengan hasil scrape Anda
+    with METRIK.tahap('baca_mentah') as m:
+        df = baca(path_input)
+        m['baris'] = len(df)
+    print(f"Data awal dimuat: {len(df)} baris.")
+
+    with METRIK.tahap('bersihkan', baris_mentah=len(df)) as m:
+        df_clean = bersihkan_data(df, sertakan_teks=vocab_penuh)
+        m['baris'] = len(df_clean)
+    if vocab_penuh:
+        with METRIK.tahap('vocab_fasilitas', baris=len(df_clean)):
+            kumpulan = KumpulanFasilitas()
+            kumpulan.tambah(df_clean.pop('Fasilitas_Clean'))
+            simpan_multihot(kumpulan, output_file, min_frek)
+    # Dedup sesudah vocab: matriks multi-hot sejajar dengan baris SEBELUM dedup, jadi
+    # --dedup dan --vocab-penuh tidak boleh digabung (dicek di argparse)
+    if dedup:
+        df_clean = dedup_data(df_clean, output_file, ambang)
+
+    # ====================================================================
+    # TAHAP 5: SIMPAN HASIL
+    # ====================================================================
+
+    # Simpan ke CSV baru + Parquet (dtype hemat, dibaca lewat data_kost.py)
+    with METRIK.tahap('simpan_bersih', baris=len(df_clean)):
+        df_clean.to_csv(output_file, index=False)
+        simpan_parquet(df_clean, path_parquet(output_file))
 
     print("\n=== CONTOH HASIL PEMBERSIHAN (5 DATA PERTAMA) ===")
     print(df_clean.head().to_string())
@@ -89,5 +266,219 @@ def run_cleaning():
     print(f"SUKSES! Data bersih tersimpan di '{output_file}'")
     print(f"Total Data Bersih: {len(df_clean)} baris.")
 
+def benchmark_cleaning(path_input=None, kelipatan=(1, 10, 100)):
+    """Bandingkan versi per baris vs vektor (dan cek hasilnya identik) di data yang dilipatgandakan"""
+    print("=== BENCHMARK PEMBERSIHAN DATA ===")
+    path_input = path_input or cari_file(NAMA_MENTAH)
+    if path_input is None:
+        print("File mentah belum ada. Jalankan scrape_malang.py dulu.")
+        return
+    df_asli = baca(path_input)
+    print(f"{'Ukuran':>10}{'Per Baris (s)':>16}{'Vektor (s)':>12}{'Speedup':>10}{'Identik':>10}")
+
+    for k in kelipatan:
+        df = pd.concat([df_asli] * k, ignore_index=True)
+
+        mulai = time.perf_counter()
+        hasil_lama = bersihkan_data_per_baris(df)
+        waktu_lama = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        hasil_baru = bersihkan_data(df)
+        waktu_baru = time.perf_counter() - mulai
+
+        identik = hasil_lama.to_csv(index=False) == hasil_baru.to_csv(index=False)
+        print(f"{len(df):>10,}{waktu_lama:>16.3f}{waktu_baru:>12.3f}{waktu_lama / waktu_baru:>9.1f}x{str(identik):>10}")
+
+# ====================================================================
+# PEMBERSIHAN INKREMENTAL (HASH ISI BARIS MENTAH + TOMBSTONE)
+# ====================================================================
+# Setiap baris mentah diberi kunci (hash isi, urutan kemunculan baris yang
+# identik). Toko (*_toko.parquet) menyimpan semua kunci yang pernah
+# dibersihkan beserta hasilnya. Saat scrape baru datang, hanya kunci yang
+# belum ada di toko yang dibersihkan. Kunci yang hilang dari scrape terbaru
+# ditandai tombstone (aktif=False) dan tidak dihapus, jadi kalau listing itu
+# muncul lagi ia langsung aktif tanpa dibersihkan ulang. CSV/Parquet bersih
+# adalah tampilan baris aktif, urut sesuai scrape terbaru.
+
+KOLOM_MENTAH = ['Nama Kost', 'Jenis Kost', 'Harga Mentah', 'Fasilitas', 'Daerah', 'Lokasi']
+
+def path_toko(output_file):
+    return re.sub(r'\.(csv|parquet)$', '', output_file) + '_toko.parquet'
+
+def kunci_mentah(df):
+    """MultiIndex (hash, ke): hash isi tiap baris mentah + urutan kemunculan baris identik"""
+    # Semua kolom digabung jadi satu teks per baris (di pyarrow, tanpa loop Python) lalu di-hash sekali
+    kolom = [pc.fill_null(pa.Array.from_pandas(df[k].astype(str)).cast(pa.string()), '')
+             for k in KOLOM_MENTAH if k in df.columns]
+    teks = pc.binary_join_element_wise(*kolom, '\x1f')
+    h = pd.util.hash_array(teks.to_numpy(zero_copy_only=False), categorize=False)
+    ke = pd.Series(h).groupby(h).cumcount().to_numpy(dtype=np.int32)
+    return pd.MultiIndex.from_arrays([h, ke], names=['hash', 'ke'])
+
+def tampilan_aktif(toko):
+    """Baris bersih yang masih aktif, urut & ber-dtype sama seperti hasil bersihkan_data"""
+    aktif = toko[toko['aktif'] & toko['lolos']].sort_values('urutan')
+    kolom_final = ['Nama Kost', 'Jenis Kost', 'Daerah_Clean', 'Harga_Angka']
+    kolom_final.extend(nama_kolom_fasilitas(f) for f in fitur_kunci)
+    df = aktif[kolom_final + ['Fasilitas_Clean']].reset_index(drop=True)
+    return df.astype({k: 'int64' for k in kolom_final[3:]})
+
+def perbarui_toko(toko, df_mentah, tanggal):
+    """Gabungkan scrape terbaru ke toko: bersihkan kunci baru saja, tandai yang hilang.
+    Mengembalikan (toko_baru, statistik)."""
+    kunci = kunci_mentah(df_mentah)
+    sudah = kunci.isin(toko.index) if toko is not None else np.zeros(len(kunci), dtype=bool)
+
+    # 1. Bersihkan HANYA baris yang kuncinya belum pernah diproses
+    posisi_baru = np.flatnonzero(~sudah)
+    mentah_baru = df_mentah.iloc[posisi_baru].reset_index(drop=True)
+    bersih = bersihkan_data(mentah_baru, sertakan_teks=True)
+    baris_baru = pd.DataFrame({'lolos': False}, index=kunci[posisi_baru])
+    baris_baru.iloc[bersih.index, 0] = True
+    baris_baru = baris_baru.join(bersih.set_index(kunci[posisi_baru][bersih.index]))
+    baris_baru['pertama_dilihat'] = tanggal
+    baris_baru['aktif'] = False
+    baris_baru['dihapus_pada'] = None
+
+    toko = baris_baru if toko is None else pd.concat([toko, baris_baru])
+
+    # 2. Status aktif + urutan mengikuti scrape terbaru; yang hilang jadi tombstone
+    aktif_sebelum = toko['aktif'].to_numpy(dtype=bool)
+    urutan = pd.Series(np.arange(len(kunci)), index=kunci).reindex(toko.index)
+    toko['urutan'] = urutan.to_numpy()
+    toko['aktif'] = urutan.notna().to_numpy()
+    toko.loc[toko['aktif'], 'terakhir_dilihat'] = tanggal
+    toko.loc[toko['aktif'], 'dihapus_pada'] = None
+    tombstone_baru = aktif_sebelum & ~toko['aktif'].to_numpy()
+    toko.loc[tombstone_baru, 'dihapus_pada'] = tanggal
+
+    statistik = {
+        'mentah': len(kunci),
+        'dibersihkan': len(posisi_baru),
+        'dilewati': int(sudah.sum()),
+        'tombstone_baru': int(tombstone_baru.sum()),
+        'aktif': int((toko['aktif'] & toko['lolos']).sum()),
+        'total_toko': len(toko),
+    }
+    return toko, statistik
+
+def muat_toko(path):
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path).set_index(['hash', 'ke'])
+
+def simpan_toko(toko, path):
+    toko.reset_index().to_parquet(path, index=False)
+
+@METRIK.bungkus('total')
+def run_cleaning_inkremental(path_input=None, output_file='data_kost_malang_clean.csv', tanggal=None,
+                             vocab_penuh=False, min_frek=MIN_FREK_FASILITAS, dedup=False, ambang=AMBANG_JACCARD):
+    print("=== MEMULAI PEMBERSIHAN DATA (INKREMENTAL) ===")
+    path_input = path_input or cari_file(NAMA_MENTAH) or 'data_kost_malang.csv'
+    if not os.path.exists(path_input):
+        print(f"Error: File '{path_input}' tidak ditemukan.")
+        return
+    tanggal = tanggal or time.strftime('%Y-%m-%d')
+
+    mulai = time.perf_counter()
+    with METRIK.tahap('perbarui_toko') as m:
+        toko, statistik = perbarui_toko(muat_toko(path_toko(output_file)), baca(path_input), tanggal)
+        simpan_toko(toko, path_toko(output_file))
+        m.update(baris_mentah=statistik['mentah'], baris=statistik['dibersihkan'], dilewati=statistik['dilewati'])
+
+    with METRIK.tahap('simpan_bersih') as m:
+        df_clean = tampilan_aktif(toko)
+        if vocab_penuh:
+            kumpulan = KumpulanFasilitas()
+            kumpulan.tambah(df_clean['Fasilitas_Clean'])
+            simpan_multihot(kumpulan, output_file, min_frek)
+        df_clean = df_clean.drop(columns='Fasilitas_Clean')
+        if dedup:
+            # Toko tetap menyimpan semua baris; dedup hanya untuk tampilan aktif yang ditulis
+            df_clean = dedup_data(df_clean, output_file, ambang)
+        df_clean.to_csv(output_file, index=False)
+        simpan_parquet(df_clean, path_parquet(output_file))
+        m['baris'] = len(df_clean)
+    durasi = time.perf_counter() - mulai
+
+    print(f"Baris mentah        : {statistik['mentah']}")
+    print(f"Dibersihkan (baru)  : {statistik['dibersihkan']}")
+    print(f"Dilewati (sudah ada): {statistik['dilewati']}")
+    print(f"Tombstone baru      : {statistik['tombstone_baru']}")
+    print("\n===============================================")
+    print(f"SUKSES! {len(df_clean)} baris aktif tersimpan di '{output_file}' "
+          f"(toko: {statistik['total_toko']} kunci di '{path_toko(output_file)}', {durasi:.2f} detik)")
+    return statistik
+
+def benchmark_inkremental(path_input=None, kelipatan=100, porsi_baru=0.01, seed=42):
+    """Simulasi scrape harian: hari ke-2 = hari ke-1 minus porsi_baru listing + porsi_baru listing baru.
+    Bandingkan bersih ulang penuh vs inkremental, dan cek hasilnya identik."""
+    print("=== BENCHMARK PEMBERSIHAN INKREMENTAL ===")
+    path_input = path_input or cari_file(NAMA_MENTAH)
+    if path_input is None:
+        print("File mentah belum ada. Jalankan scrape_malang.py dulu.")
+        return
+    df_asli = baca(path_input)
+    rng = np.random.default_rng(seed)
+
+    # Nama dibuat unik per salinan supaya data 100x tidak berisi baris identik semua
+    hari_1 = pd.concat([df_asli.assign(**{'Nama Kost': df_asli['Nama Kost'] + f" #{i}"})
+                        for i in range(kelipatan)], ignore_index=True)
+    n_ganti = int(len(hari_1) * porsi_baru)
+    hilang = rng.choice(len(hari_1), n_ganti, replace=False)
+    baru = hari_1.sample(n_ganti, random_state=seed).assign(**{'Nama Kost': lambda d: d['Nama Kost'] + " (baru)"})
+    hari_2 = pd.concat([hari_1.drop(index=hilang), baru], ignore_index=True)
+
+    toko, _ = perbarui_toko(None, hari_1, '2000-01-01')
+
+    mulai = time.perf_counter()
+    penuh = bersihkan_data(hari_2)
+    waktu_penuh = time.perf_counter() - mulai
+
+    mulai = time.perf_counter()
+    toko, statistik = perbarui_toko(toko, hari_2, '2000-01-02')
+    inkremental = tampilan_aktif(toko).drop(columns='Fasilitas_Clean')
+    waktu_inkremental = time.perf_counter() - mulai
+
+    identik = penuh.to_csv(index=False) == inkremental.to_csv(index=False)
+    print(f"Hari ke-2: {len(hari_2):,} baris mentah, {statistik['dibersihkan']:,} baru, "
+          f"{statistik['tombstone_baru']:,} tombstone")
+    print(f"Bersih ulang penuh : {waktu_penuh:.3f} s")
+    print(f"Inkremental        : {waktu_inkremental:.3f} s (identik: {identik})")
+
 if __name__ == "__main__":
-    run_cleaning()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pembersihan data kost hasil scraping")
+    parser.add_argument('--input', default=None, help="Data mentah (default: dicari lewat data_kost.cari_file)")
+    parser.add_argument('--output', default='data_kost_malang_clean.csv', help="CSV bersih (Parquet ditulis di sampingnya)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Proses per chunk (streaming, memori konstan) untuk file besar")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Bandingkan kecepatan versi per baris vs vektor di data 1x/10x/100x")
+    parser.add_argument('--vocab-penuh', action='store_true',
+                        help="Simpan juga matriks sparse multi-hot semua fasilitas + vocabulary-nya")
+    parser.add_argument('--min-frek', type=int, default=MIN_FREK_FASILITAS,
+                        help="Frekuensi minimal fasilitas agar masuk vocabulary")
+    parser.add_argument('--inkremental', action='store_true',
+                        help="Hanya bersihkan baris mentah baru/berubah (toko *_toko.parquet), tandai yang hilang")
+    parser.add_argument('--tanggal', default=None, help="Tanggal scrape untuk mode inkremental (default: hari ini)")
+    parser.add_argument('--benchmark-inkremental', action='store_true',
+                        help="Simulasi scrape harian 100x: bersih ulang penuh vs inkremental")
+    parser.add_argument('--dedup', action='store_true',
+                        help="Gabungkan listing duplikat & nama mirip (MinHash/LSH per blok), tulis laporan klasternya")
+    parser.add_argument('--ambang', type=float, default=AMBANG_JACCARD,
+                        help="Ambang Jaccard nama untuk --dedup")
+    args = parser.parse_args()
+    if args.dedup and (args.chunksize or args.vocab_penuh):
+        parser.error("--dedup butuh seluruh data sekaligus dan belum bisa digabung dengan --chunksize/--vocab-penuh")
+
+    if args.benchmark:
+        benchmark_cleaning()
+    elif args.benchmark_inkremental:
+        benchmark_inkremental()
+    elif args.inkremental:
+        run_cleaning_inkremental(args.input, args.output, tanggal=args.tanggal, vocab_penuh=args.vocab_penuh,
+                                 min_frek=args.min_frek, dedup=args.dedup, ambang=args.ambang)
+    else:
+        run_cleaning(chunksize=args.chunksize, path_input=args.input, output_file=args.output,
+                     vocab_penuh=args.vocab_penuh, min_frek=args.min_frek, dedup=args.dedup, ambang=args.ambang)
@@ -0,0 +1,184 @@
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ==============================================================================
+# AKSES DATA BERSAMA: PARQUET KOLOMNAR + DTYPE HEMAT + FALLBACK PATH SERAGAM
+# ==============================================================================
+# Semua script membaca data mentah/bersih lewat modul ini:
+# - file dicari di root dulu, lalu di folder data/ (satu aturan untuk semua;
+#   env KOST_DIR_DATA memaksa satu folder saja)
+# - .parquet dipakai jika ada dan tidak lebih tua dari .csv-nya; jika tidak,
+#   CSV lama tetap terbaca
+# - dtype: Daerah_Clean/Jenis Kost -> category, Fasilitas_* -> int8,
+#   Harga_Angka -> int32
+# - kolom=[...] hanya membaca kolom yang dibutuhkan (column projection)
+
+DIR_DATA = 'data'
+NAMA_MENTAH = 'data_kost_malang'
+NAMA_BERSIH = 'data_kost_malang_clean'
+KOLOM_KATEGORI = ['Jenis Kost', 'Daerah_Clean']
+
+
+def cari_file(nama, folder_cadangan=DIR_DATA):
+    """Path data untuk nama dasar (tanpa ekstensi); None jika tidak ada di root maupun data/.
+    Jika env KOST_DIR_DATA diisi (oleh pipeline.py), hanya folder itu yang dicari."""
+    daftar_folder = [os.environ['KOST_DIR_DATA']] if os.environ.get('KOST_DIR_DATA') else ['.', folder_cadangan]
+    for folder in daftar_folder:
+        path_parquet = os.path.join(folder, f"{nama}.parquet")
+        path_csv = os.path.join(folder, f"{nama}.csv")
+        ada_parquet, ada_csv = os.path.exists(path_parquet), os.path.exists(path_csv)
+        if ada_parquet and (not ada_csv or os.path.getmtime(path_parquet) >= os.path.getmtime(path_csv)):
+            return os.path.normpath(path_parquet)
+        if ada_csv:
+            return os.path.normpath(path_csv)
+    return None
+
+
+def optimalkan_dtype(df):
+    """Ubah kolom ke dtype hemat memori (tanpa mengubah nilainya)"""
+    df = df.copy()
+    for kolom in KOLOM_KATEGORI:
+        if kolom in df.columns:
+            # Kategori selalu diurutkan supaya get_dummies menghasilkan urutan kolom yang sama
+            # seperti kolom object (Parquet hasil streaming menyimpan kategori sesuai urutan muncul)
+            kategori = df[kolom].astype('category')
+            df[kolom] = kategori.cat.reorder_categories(sorted(kategori.cat.categories))
+    if 'Harga_Angka' in df.columns:
+        df['Harga_Angka'] = df['Harga_Angka'].astype(np.int32)
+    for kolom in df.columns:
+        if kolom.startswith('Fasilitas_') and kolom != 'Fasilitas_Clean':
+            df[kolom] = df[kolom].astype(np.int8)
+    return df
+
+
+def baca(path, kolom=None):
+    """Baca CSV/Parquet dengan column projection dan dtype hemat"""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=kolom)
+    else:
+        df = pd.read_csv(path, usecols=kolom)
+    return optimalkan_dtype(df)
+
+
+def kolom_file(path):
+    """Nama kolom file CSV/Parquet tanpa membaca isinya"""
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def baca_per_chunk(path, chunksize):
+    """Iterasi DataFrame per chunk dari CSV atau Parquet (dtype mentah, tanpa optimalkan_dtype)"""
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def muat(nama, kolom=None, path=None):
+    path = path or cari_file(nama)
+    if path is None:
+        raise FileNotFoundError(f"File '{nama}.parquet/.csv' tidak ditemukan di root maupun '{DIR_DATA}/'")
+    return baca(path, kolom)
+
+
+def muat_mentah(kolom=None, path=None):
+    return muat(NAMA_MENTAH, kolom, path)
+
+
+def muat_bersih(kolom=None, path=None):
+    return muat(NAMA_BERSIH, kolom, path)
+
+
+def path_parquet(path_csv):
+    dasar = path_csv[:-4] if path_csv.endswith('.csv') else path_csv
+    return f"{dasar}.parquet"
+
+
+def simpan_parquet(df, path):
+    optimalkan_dtype(df).to_parquet(path, index=False)
+
+
+class PenulisParquet:
+    """Tulis Parquet per chunk (mode streaming clean_data.py) dengan skema dari chunk pertama"""
+
+    def __init__(self, path):
+        self.path = path
+        self.penulis = None
+
+    def tulis(self, df):
+        df = optimalkan_dtype(df)
+        if self.penulis is None:
+            skema = pa.Schema.from_pandas(df, preserve_index=False)
+            # Kategori tiap chunk berbeda; simpan sebagai dictionary string agar skemanya tetap sama
+            for kolom in KOLOM_KATEGORI:
+                if kolom in df.columns:
+                    i = skema.get_field_index(kolom)
+                    skema = skema.set(i, pa.field(kolom, pa.dictionary(pa.int32(), pa.string())))
+            self.penulis = pq.ParquetWriter(self.path, skema)
+        self.penulis.write_table(pa.Table.from_pandas(df, schema=self.penulis.schema, preserve_index=False))
+
+    def tutup(self):
+        if self.penulis is not None:
+            self.penulis.close()
+
+
+def ukuran_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def benchmark_baca(kelipatan=(1, 100)):
+    """Waktu muat & memori: CSV default vs Parquet (semua kolom & proyeksi) di data 1x/100x"""
+    print("=== BENCHMARK BACA DATA: CSV vs PARQUET ===")
+    df_asli = muat_bersih()
+    kolom_proyeksi = ['Daerah_Clean', 'Harga_Angka']
+    folder = tempfile.mkdtemp(prefix='bench_data_')
+
+    print(f"{'Ukuran':>10}  {'Cara baca':<30}{'Waktu (s)':>10}{'Memori (MB)':>13}{'File (MB)':>11}")
+    for k in kelipatan:
+        df = pd.concat([df_asli] * k, ignore_index=True)
+        path_csv = os.path.join(folder, f"bersih_{k}x.csv")
+        path_pq = os.path.join(folder, f"bersih_{k}x.parquet")
+        df.to_csv(path_csv, index=False)
+        simpan_parquet(df, path_pq)
+
+        cara = [
+            ('CSV (dtype default)', lambda: pd.read_csv(path_csv), path_csv),
+            ('CSV + optimalkan_dtype', lambda: baca(path_csv), path_csv),
+            ('Parquet (semua kolom)', lambda: baca(path_pq), path_pq),
+            ('Parquet (2 kolom)', lambda: baca(path_pq, kolom_proyeksi), path_pq),
+        ]
+        for label, fungsi, path in cara:
+            mulai = time.perf_counter()
+            hasil = fungsi()
+            durasi = time.perf_counter() - mulai
+            print(f"{len(df):>10,}  {label:<30}{durasi:>10.3f}{ukuran_mb(hasil):>13.2f}"
+                  f"{os.path.getsize(path) / 1024 / 1024:>11.2f}")
+
+        os.remove(path_csv)
+        os.remove(path_pq)
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Konversi & benchmark penyimpanan data kost")
+    parser.add_argument('--konversi', action='store_true', help="Buat .parquet dari CSV mentah & bersih yang ada")
+    parser.add_argument('--benchmark', action='store_true', help="Bandingkan waktu muat & memori CSV vs Parquet (1x, 100x)")
+    args = parser.parse_args()
+
+    if args.konversi:
+        for nama in [NAMA_MENTAH, NAMA_BERSIH]:
+            path = cari_file(nama)
+            if path is None or path.endswith('.parquet'):
+                continue
+            simpan_parquet(pd.read_csv(path), path_parquet(path))
+            print(f"{path} -> {path_parquet(path)}")
+    if args.benchmark:
+        benchmark_baca()
@@ -0,0 +1,247 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from fitur_kost import kolom_fasilitas
+
+# ==============================================================================
+# DEDUP LISTING: BLOCKING + MINHASH/LSH ATAS NAMA KOST
+# ==============================================================================
+# "Lihat lagi" di scraper dan scrape harian berulang menghasilkan kost yang
+# sama berkali-kali, kadang dengan nama sedikit berbeda. Tanpa dedup,
+# value_counts dan split train/test ikut terdistorsi (baris yang sama bisa
+# ada di train DAN test).
+#
+# Dua baris dianggap listing yang sama jika:
+# 1. satu blok: kecamatan, jenis, harga, dan semua Fasilitas_* identik, DAN
+# 2. nama yang dinormalisasi mirip: Jaccard shingle 3 huruf >= AMBANG_JACCARD
+#    (diestimasi dari signature MinHash).
+# Baris yang persis identik digabung dulu lewat hash. Di dalam blok, hanya
+# pasangan yang jatuh di bucket LSH yang sama (salah satu band signature sama)
+# yang dibandingkan, jadi biayanya ~linear, bukan semua pasangan. Pasangan
+# yang lolos digabung jadi klaster (connected components); per klaster baris
+# pertama yang dipertahankan.
+
+PANJANG_SHINGLE = 3
+N_PERMUTASI = 64
+# 16 band x 4 baris: pasangan dengan Jaccard >= ~0,5 hampir pasti jadi kandidat
+N_BAND = 16
+AMBANG_JACCARD = 0.7
+KOLOM_BLOK = ['Daerah_Clean', 'Jenis Kost', 'Harga_Angka']
+
+
+def normalisasi_nama(nama):
+    """'Kost De-Bilma  Tipe Standard' -> 'de bilma tipe standard'"""
+    nama = nama.astype(str).str.lower().str.replace(r'[^0-9a-z]+', ' ', regex=True)
+    return nama.str.replace(r'^\s*kos(t)?\b', '', regex=True).str.strip()
+
+
+def shingle(nama, k=PANJANG_SHINGLE):
+    """Semua potongan k huruf tiap nama -> (indeks baris, hash potongan), tanpa loop per baris"""
+    nama = nama.reset_index(drop=True)
+    panjang = nama.str.len().to_numpy()
+    # Nama yang lebih pendek dari k jadi satu shingle utuh
+    pendek = np.flatnonzero(panjang < k)
+    baris, potongan = [pendek], [nama.iloc[pendek].to_numpy(dtype=object)]
+    for i in range(int(panjang.max(initial=0)) - k + 1):
+        ada = np.flatnonzero(panjang >= i + k)
+        baris.append(ada)
+        potongan.append(nama.iloc[ada].str.slice(i, i + k).to_numpy(dtype=object))
+    return np.concatenate(baris), pd.util.hash_array(np.concatenate(potongan), categorize=False)
+
+
+def signature_minhash(baris, nilai_hash, n_baris, n_permutasi=N_PERMUTASI, seed=42):
+    """Signature (n_baris, n_permutasi): minimum hash multiply-shift ((a*h + b) mod 2^64) >> 32
+    per baris untuk tiap permutasi"""
+    urutan = np.argsort(baris, kind='stable')
+    baris = baris[urutan]
+    h = nilai_hash[urutan]
+    awal = np.flatnonzero(np.concatenate([[True], baris[1:] != baris[:-1]]))
+
+    rng = np.random.default_rng(seed)
+    # a ganjil; perkalian uint64 NumPy membungkus (mod 2^64), 32 bit atas yang dipakai
+    a = rng.integers(0, 1 << 63, n_permutasi, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, n_permutasi, dtype=np.uint64)
+    sig = np.empty((n_baris, n_permutasi), dtype=np.uint32)
+    for j in range(n_permutasi):
+        sig[:, j] = np.minimum.reduceat((a[j] * h + b[j]) >> np.uint64(32), awal).astype(np.uint32)
+    return sig
+
+
+def pasangan_kandidat(sig, blok, n_band=N_BAND):
+    """Pasangan (i, j), i < j, yang satu blok dan punya minimal satu band signature yang sama"""
+    lebar = sig.shape[1] // n_band
+    kiri, kanan = [], []
+    for band in range(n_band):
+        bagian = pd.DataFrame(sig[:, band * lebar:(band + 1) * lebar]).assign(blok=blok)
+        kunci = pd.util.hash_pandas_object(bagian, index=False).to_numpy()
+        urutan = np.argsort(kunci, kind='stable')
+        kunci = kunci[urutan]
+        batas = np.flatnonzero(np.concatenate([[True], kunci[1:] != kunci[:-1], [True]]))
+        awal, akhir = batas[:-1], batas[1:]
+        # Hanya bucket berisi >= 2 baris yang menghasilkan pasangan
+        for a, b in zip(awal[akhir - awal > 1], akhir[akhir - awal > 1]):
+            anggota = urutan[a:b]
+            i, j = np.triu_indices(len(anggota), k=1)
+            kiri.append(anggota[i])
+            kanan.append(anggota[j])
+    if not kiri:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    kiri, kanan = np.concatenate(kiri), np.concatenate(kanan)
+    pasangan = np.unique(np.minimum(kiri, kanan) * len(sig) + np.maximum(kiri, kanan))
+    return pasangan // len(sig), pasangan % len(sig)
+
+
+def cari_duplikat(df, ambang=AMBANG_JACCARD):
+    """Label klaster per baris (baris dengan label sama = satu listing) + statistik"""
+    kolom_blok = KOLOM_BLOK + [k for k in kolom_fasilitas(df.columns) if k != 'Fasilitas_Clean']
+
+    # 1. Baris identik (termasuk nama) -> satu perwakilan
+    kunci = pd.util.hash_pandas_object(df[['Nama Kost'] + kolom_blok], index=False).to_numpy()
+    _, wakil, ke_wakil = np.unique(kunci, return_index=True, return_inverse=True)
+    unik = df.iloc[wakil]
+
+    # 2. Blok; hanya blok dengan >= 2 nama berbeda yang perlu MinHash
+    kunci_blok = pd.util.hash_pandas_object(unik[kolom_blok], index=False).to_numpy()
+    _, id_blok, n_per_blok = np.unique(kunci_blok, return_inverse=True, return_counts=True)
+    perlu = np.flatnonzero(n_per_blok[id_blok] >= 2)
+
+    label_unik = np.arange(len(unik))
+    n_kandidat = n_mirip = 0
+    if len(perlu):
+        baris, nilai_hash = shingle(normalisasi_nama(unik['Nama Kost'].iloc[perlu]))
+        sig = signature_minhash(baris, nilai_hash, len(perlu))
+        i, j = pasangan_kandidat(sig, id_blok[perlu])
+        # Estimasi Jaccard = porsi permutasi yang minimumnya sama
+        mirip = (sig[i] == sig[j]).mean(axis=1) >= ambang
+        n_kandidat, n_mirip = len(i), int(mirip.sum())
+        graf = sparse.coo_matrix((np.ones(n_mirip), (perlu[i[mirip]], perlu[j[mirip]])),
+                                 shape=(len(unik), len(unik)))
+        _, label_unik = connected_components(graf, directed=False)
+
+    label = label_unik[ke_wakil]
+    n_akhir = len(np.unique(label))
+    statistik = {
+        'baris': len(df),
+        'baris_identik': len(df) - len(unik),
+        'baris_mirip': len(unik) - n_akhir,
+        'baris_akhir': n_akhir,
+        'pasangan_kandidat': n_kandidat,
+        'pasangan_mirip': n_mirip,
+    }
+    return label, statistik
+
+
+def laporan_klaster(df, label):
+    """Satu baris per klaster yang digabung: nama yang dipertahankan, nama lain, jumlah baris"""
+    d = df[['Nama Kost', 'Daerah_Clean', 'Jenis Kost', 'Harga_Angka']].assign(klaster=label)
+    d = d[d.groupby('klaster')['klaster'].transform('size').to_numpy() > 1]
+    laporan = d.groupby('klaster', sort=False).agg(
+        jumlah_baris=('Nama Kost', 'size'),
+        jumlah_nama=('Nama Kost', 'nunique'),
+        nama_dipertahankan=('Nama Kost', 'first'),
+        nama_lain=('Nama Kost', lambda s: ' | '.join(n for n in dict.fromkeys(s) if n != s.iloc[0])),
+        Daerah_Clean=('Daerah_Clean', 'first'),
+        **{'Jenis Kost': ('Jenis Kost', 'first')},
+        Harga_Angka=('Harga_Angka', 'first'),
+    )
+    laporan.insert(2, 'jenis', np.where(laporan['jumlah_nama'] > 1, 'mirip', 'identik'))
+    return laporan.sort_values('jumlah_baris', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def hapus_duplikat(df, ambang=AMBANG_JACCARD):
+    """-> (df tanpa duplikat, laporan klaster, statistik). Urutan baris pertama tiap klaster dipertahankan."""
+    label, statistik = cari_duplikat(df, ambang)
+    pertama = ~pd.Series(label).duplicated().to_numpy()
+    return df[pertama], laporan_klaster(df, label), statistik
+
+
+def cetak_ringkasan(laporan, statistik, n_contoh=10):
+    print(f"Dedup: {statistik['baris']:,} baris -> {statistik['baris_akhir']:,} listing "
+          f"({statistik['baris_identik']:,} identik, {statistik['baris_mirip']:,} nama mirip; "
+          f"{statistik['pasangan_kandidat']:,} pasangan kandidat LSH, {statistik['pasangan_mirip']:,} lolos)")
+    if len(laporan):
+        print(f"Klaster terbesar (dari {len(laporan):,}):")
+        for _, r in laporan.head(n_contoh).iterrows():
+            lain = f" ~ {r['nama_lain']}" if r['nama_lain'] else ''
+            print(f"   {r['jumlah_baris']:>5}x  {r['nama_dipertahankan']}{lain} "
+                  f"({r['Daerah_Clean']}, {r['Jenis Kost']}, Rp {r['Harga_Angka']:,})")
+
+
+# ==============================================================================
+# BENCHMARK: LSH vs PERBANDINGAN SEMUA PASANGAN
+# ==============================================================================
+
+def buat_data_uji(df_asli, kelipatan, seed=42):
+    """Salinan data bersih: tiap salinan beda harga (kost lain), sebagian nama diubah 1 huruf"""
+    rng = np.random.default_rng(seed)
+    unik = df_asli.drop_duplicates().reset_index(drop=True)
+    salinan = []
+    for i in range(kelipatan):
+        d = unik.copy()
+        d['Harga_Angka'] = d['Harga_Angka'] + i * 1000
+        nama = d['Nama Kost'].astype(str).to_numpy(dtype=object)
+        ubah = np.flatnonzero(rng.random(len(nama)) < 0.3)
+        for r in ubah:
+            posisi = rng.integers(1, len(nama[r]))
+            nama[r] = nama[r][:posisi] + 'x' + nama[r][posisi + 1:]
+        salinan += [d, d.assign(**{'Nama Kost': nama})]
+    return pd.concat(salinan, ignore_index=True)
+
+
+def jaccard_semua_pasangan(df, ambang=AMBANG_JACCARD):
+    """Pembanding tanpa LSH: Jaccard eksak setiap pasangan nama di blok yang sama"""
+    kolom_blok = KOLOM_BLOK + [k for k in kolom_fasilitas(df.columns) if k != 'Fasilitas_Clean']
+    nama = normalisasi_nama(df['Nama Kost']).to_numpy()
+    himpunan = [{n[i:i + PANJANG_SHINGLE] for i in range(max(1, len(n) - PANJANG_SHINGLE + 1))} for n in nama]
+    pasangan, dibandingkan = set(), 0
+    for anggota in df.groupby(kolom_blok, observed=True).indices.values():
+        for x in range(len(anggota)):
+            for y in range(x + 1, len(anggota)):
+                i, j = anggota[x], anggota[y]
+                dibandingkan += 1
+                if len(himpunan[i] & himpunan[j]) / len(himpunan[i] | himpunan[j]) >= ambang:
+                    pasangan.add((i, j))
+    return pasangan, dibandingkan
+
+
+def benchmark_dedup(path=None, kelipatan=(1, 10, 100), batas_eksak=20000):
+    from data_kost import muat_bersih
+    print("=== BENCHMARK DEDUP: MINHASH/LSH vs SEMUA PASANGAN ===")
+    df_asli = muat_bersih(path=path)
+    print(f"{'Baris':>10}{'LSH (s)':>10}{'Kandidat':>12}{'Eksak (s)':>11}{'Dibandingkan':>14}{'Recall':>8}")
+    for k in kelipatan:
+        df = buat_data_uji(df_asli, k)
+        mulai = time.perf_counter()
+        label, statistik = cari_duplikat(df)
+        waktu_lsh = time.perf_counter() - mulai
+
+        if len(df) <= batas_eksak:
+            mulai = time.perf_counter()
+            pasangan, dibandingkan = jaccard_semua_pasangan(df)
+            waktu_eksak = f"{time.perf_counter() - mulai:>11.2f}"
+            # Pasangan mirip (Jaccard eksak) yang berakhir di klaster yang sama
+            recall = np.mean([label[i] == label[j] for i, j in pasangan]) if pasangan else 1.0
+            dibandingkan, recall = f"{dibandingkan:>14,}", f"{recall:>8.3f}"
+        else:
+            waktu_eksak, dibandingkan, recall = f"{'-':>11}", f"{'-':>14}", f"{'-':>8}"
+        print(f"{len(df):>10,}{waktu_lsh:>10.2f}{statistik['pasangan_kandidat']:>12,}"
+              f"{waktu_eksak}{dibandingkan}{recall}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deteksi listing duplikat / nama mirip di data bersih")
+    parser.add_argument('--input', default=None, help="Data bersih (default: data_kost_malang_clean)")
+    parser.add_argument('--ambang', type=float, default=AMBANG_JACCARD, help="Jaccard minimal nama dianggap sama")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Waktu & recall LSH vs Jaccard semua pasangan di data 1x/10x/100x")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_dedup(args.input)
+    else:
+        from data_kost import muat_bersih
+        _, laporan, statistik = hapus_duplikat(muat_bersih(path=args.input), args.ambang)
+        cetak_ringkasan(laporan, statistik)
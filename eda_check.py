@@ -1,89 +1,57 @@
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import math
+import os
+import argparse
+from data_kost import NAMA_BERSIH, cari_file, kolom_file, muat_bersih
+from instrumen import Instrumen
+from laporan_grafik import (Grafik, grafik_distribusi_harga, grafik_distribusi_sketsa, grafik_fasilitas,
+                            grafik_fasilitas_sketsa, grafik_korelasi, render_semua)
 
-def jalankan_eda():
+# Waktu, CPU, memori puncak & jumlah baris per tahap -> hasil_evaluasi/metrik.jsonl
+METRIK = Instrumen('eda_check')
+
+@METRIK.bungkus('total')
+def jalankan_eda(folder='.', jobs=None, paksa=False, agregat=False, chunksize=None):
     print("=== MEMULAI EKSPLORASI DATA (EDA) ===")
-    
+    if agregat:
+        return jalankan_eda_agregat(folder, jobs, paksa, chunksize)
+
     # 1. Load Data Bersih
-    try:
-        df = pd.read_csv('data_kost_malang_clean.csv')
-        print(f"Data dimuat: {len(df)} baris.")
-    except FileNotFoundError:
+    # Hanya harga + kolom fasilitas yang dipakai grafik di bawah
+    path_data = cari_file(NAMA_BERSIH)
+    if path_data is None:
         print("File clean belum ada. Jalankan clean_data.py dulu.")
         return
-
-    sns.set_theme(style="whitegrid")
+    with METRIK.tahap('baca_bersih') as m:
+        kolom = [k for k in kolom_file(path_data) if k == 'Harga_Angka' or k.startswith('Fasilitas_')]
+        df = muat_bersih(kolom, path=path_data)
+        m['baris'] = len(df)
+    print(f"Data dimuat: {len(df)} baris.")
 
     # ====================================================================
-    # GRAFIK 1: DISTRIBUSI HARGA (Cek apakah ada harga outlier)
+    # DATA SETIAP GRAFIK (digambar paralel & di-cache oleh laporan_grafik.py)
     # ====================================================================
-    print("1. Membuat grafik distribusi harga...")
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df['Harga_Angka'], kde=True, color='blue')
-    plt.title('Sebaran Harga Kost di Malang')
-    plt.xlabel('Harga (Rupiah)')
-    plt.ylabel('Jumlah Kost')
-    plt.ticklabel_format(style='plain', axis='x')
-    
-    # Simpan ke file gambar
-    plt.savefig('eda_1_distribusi_harga.png')
-    print("   -> Disimpan sebagai 'eda_1_distribusi_harga.png'")
-    plt.close()
+    grafik = []
+
+    # GRAFIK 1: DISTRIBUSI HARGA (Cek apakah ada harga outlier)
+    grafik.append(Grafik(os.path.join(folder, 'eda_1_distribusi_harga.png'), grafik_distribusi_harga,
+                         {'harga': df['Harga_Angka']}))
 
-    # ====================================================================
     # GRAFIK 2: PERBANDINGAN SEMUA FASILITAS (Boxplot Grid)
-    # ====================================================================
-    print("2. Membuat perbandingan harga SEMUA fasilitas...")
-    
-    # 1. Cari otomatis kolom yang mengandung kata 'Fasilitas' atau 'Mandi'
+    # Cari otomatis kolom yang mengandung kata 'Fasilitas' atau 'Mandi'
     daftar_fasilitas = [col for col in df.columns if 'Fasilitas' in col or 'Mandi' in col]
-
     if len(daftar_fasilitas) > 0:
-        # 2. Hitung ukuran grid
-        n_cols = 3
-        n_rows = math.ceil(len(daftar_fasilitas) / n_cols)
-        
-        # Buat Canvas besar
-        fig, axes = plt.subplots(n_rows, n_cols, figsize=(18, 5 * n_rows))
-        axes = axes.flatten()
-
-        # 3. Looping membuat Boxplot
-        for i, col in enumerate(daftar_fasilitas):
-            sns.boxplot(x=df[col], y=df['Harga_Angka'], ax=axes[i], palette='Set2')
-            
-            # Percantik
-            axes[i].set_title(f'Harga vs {col}', fontweight='bold')
-            axes[i].set_xlabel('Status (0=Tidak, 1=Ada)')
-            axes[i].set_ylabel('Harga Sewa')
-            
-        for j in range(i + 1, len(axes)):
-            fig.delaxes(axes[j])
-
-        plt.tight_layout()
-        plt.savefig('eda_2_fasilitas_lengkap.png')
-        print(f"   -> Disimpan sebagai 'eda_2_fasilitas_lengkap.png' ({len(daftar_fasilitas)} Fasilitas)")
-        plt.close()
+        grafik.append(Grafik(os.path.join(folder, 'eda_2_fasilitas_lengkap.png'), grafik_fasilitas,
+                             {'harga': df['Harga_Angka'], 'fasilitas': {col: df[col] for col in daftar_fasilitas}}))
     else:
         print("   [WARNING] Tidak ditemukan kolom fasilitas. Pastikan nama kolom mengandung kata 'Fasilitas'.")
 
-    # ====================================================================
     # GRAFIK 3: CEK KORELASI (Heatmap)
-    # ====================================================================
-    print("3. Membuat Heatmap Korelasi...")
-    plt.figure(figsize=(12, 10))
-    
-    kolom_angka = df.select_dtypes(include=['float64', 'int64'])
-    korelasi = kolom_angka.corr()
-    
-    sns.heatmap(korelasi, annot=True, cmap='coolwarm', fmt=".2f")
-    plt.title('Seberapa Kuat Hubungan Antar Fitur?')
-    plt.tight_layout()
-    
-    plt.savefig('eda_3_korelasi.png')
-    print("   -> Disimpan sebagai 'eda_3_korelasi.png'")
-    plt.close()
+    with METRIK.tahap('hitung_korelasi', baris=len(df)):
+        korelasi = df.select_dtypes(include='number').corr()
+    grafik.append(Grafik(os.path.join(folder, 'eda_3_korelasi.png'), grafik_korelasi, {'korelasi': korelasi}))
+
+    print(f"Render {len(grafik)} grafik (distribusi harga, {len(daftar_fasilitas)} fasilitas, korelasi)...")
+    with METRIK.tahap('render_grafik', baris=len(df)) as m:
+        m.update(render_semua(grafik, jobs=jobs, paksa=paksa))
 
     # ====================================================================
     # STATISTIK DESKRIPTIF
@@ -91,5 +59,48 @@ def jalankan_eda():
     print("\n=== RANGKUMAN STATISTIK ===")
     print(df['Harga_Angka'].describe().apply(lambda x: format(x, 'f')))
 
+
+def jalankan_eda_agregat(folder='.', jobs=None, paksa=False, chunksize=None):
+    """Grafik & statistik yang sama dari agregat streaming (agregat_eda.py), untuk data jutaan baris"""
+    # Import di sini: mode biasa tidak butuh pyarrow.parquet/joblib dari modul agregat
+    from agregat_eda import CHUNKSIZE, agregat_file
+
+    path_data = cari_file(NAMA_BERSIH)
+    if path_data is None:
+        print("File clean belum ada. Jalankan clean_data.py dulu.")
+        return
+    with METRIK.tahap('agregat_streaming') as m:
+        agregat, dihitung = agregat_file(path_data, folder, chunksize=chunksize or CHUNKSIZE)
+        m['baris'], m['baris_dibaca'] = agregat.n, dihitung
+    print(f"Agregat: {agregat.n:,} baris ({dihitung:,} baris baru dibaca, sisanya dari cache).")
+
+    grafik = [
+        Grafik(os.path.join(folder, 'eda_1_distribusi_harga.png'), grafik_distribusi_sketsa,
+               agregat.data_distribusi()),
+        Grafik(os.path.join(folder, 'eda_3_korelasi.png'), grafik_korelasi, {'korelasi': agregat.korelasi()}),
+    ]
+    if agregat.kolom_fasilitas:
+        grafik.insert(1, Grafik(os.path.join(folder, 'eda_2_fasilitas_lengkap.png'), grafik_fasilitas_sketsa,
+                                {'statistik': agregat.data_fasilitas()}))
+    else:
+        print("   [WARNING] Tidak ditemukan kolom fasilitas. Pastikan nama kolom mengandung kata 'Fasilitas'.")
+
+    print(f"Render {len(grafik)} grafik dari agregat...")
+    with METRIK.tahap('render_grafik', baris=agregat.n) as m:
+        m.update(render_semua(grafik, jobs=jobs, paksa=paksa))
+
+    print("\n=== RANGKUMAN STATISTIK (kuartil dari sketsa, galat relatif <= 0.5%) ===")
+    print(agregat.ringkasan().apply(lambda x: format(x, 'f')))
+
 if __name__ == "__main__":
-    jalankan_eda()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="EDA data kost bersih")
+    parser.add_argument('--folder', default='.', help="Folder tujuan gambar EDA (mis. hasil_eda)")
+    parser.add_argument('--jobs', type=int, default=None, help="Jumlah proses render grafik (default: jumlah CPU)")
+    parser.add_argument('--paksa', action='store_true', help="Render ulang semua grafik walau datanya tidak berubah")
+    parser.add_argument('--agregat', action='store_true',
+                        help="Satu pass streaming ke sketsa/kovarian lalu grafik dari agregat (untuk data besar)")
+    parser.add_argument('--chunksize', type=int, default=None, help="Baris per chunk mode --agregat")
+    args = parser.parse_args()
+
+    os.makedirs(args.folder, exist_ok=True)
+    jalankan_eda(args.folder, args.jobs, args.paksa, args.agregat, args.chunksize)
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# ENCODING FITUR: SATU ENCODER UNTUK TRAINING & SEMUA JALUR INFERENSI
+# ==============================================================================
+# EncoderKost di-fit di train_model.py dan disimpan bersama model dalam satu
+# artefak (artefak_kost.py). Training, prediksi batch, server, dan app.py
+# semuanya meng-encode lewat encoder yang sama, jadi urutan kolom & kategori
+# tidak bisa berbeda antara training dan inferensi. Encode satu listing
+# langsung ke array NumPy dengan indeks kolom yang dihitung sekali saat fit.
+
+JENIS_KOST = ["Putra", "Putri", "Campur"]
+
+# Vocabulary fasilitas penuh yang dipakai model (label checkbox app.py, disimpan saat training)
+PATH_VOCAB = 'vocab_fasilitas.pkl'
+
+
+def kolom_fasilitas(fitur):
+    return [f for f in fitur if f.startswith('Fasilitas_')]
+
+
+def opsi_lokasi(fitur):
+    return [f.replace('Daerah_Clean_', '') for f in fitur if f.startswith('Daerah_Clean_')]
+
+
+def nama_kolom_fasilitas(nama):
+    """'K. Mandi Dalam' / 'K_Mandi_Dalam' / 'Fasilitas_K_Mandi_Dalam' -> 'Fasilitas_K_Mandi_Dalam'"""
+    if nama.startswith('Fasilitas_'):
+        return nama
+    return f"Fasilitas_{nama.replace(' ', '_').replace('.', '')}"
+
+
+class EncoderKost:
+    """One-hot yang di-fit saat training: indeks kolom untuk setiap kecamatan, jenis, dan
+    fasilitas dihitung sekali, jadi encode satu listing cukup beberapa lookup dict."""
+
+    def __init__(self, fitur):
+        self.fitur = list(fitur)
+        posisi = {nama: i for i, nama in enumerate(self.fitur)}
+        self.kolom_fasilitas = {nama: posisi[nama] for nama in kolom_fasilitas(self.fitur)}
+        self.kolom_lokasi = {nama[len('Daerah_Clean_'):]: i for nama, i in posisi.items()
+                             if nama.startswith('Daerah_Clean_')}
+        self.kolom_jenis = {nama[len('Jenis Kost_'):]: i for nama, i in posisi.items()
+                            if nama.startswith('Jenis Kost_')}
+
+    @classmethod
+    def fit(cls, df):
+        """Dari DataFrame bersih yang sudah difilter; urutan kolom sama dengan pd.get_dummies lama"""
+        fitur = [k for k in df.columns if k.startswith('Fasilitas_') and k != 'Fasilitas_Clean']
+        for kolom in ['Daerah_Clean', 'Jenis Kost']:
+            if isinstance(df[kolom].dtype, pd.CategoricalDtype):
+                kategori = list(df[kolom].cat.categories)
+            else:
+                kategori = sorted(df[kolom].dropna().unique())
+            fitur += [f"{kolom}_{k}" for k in kategori]
+        return cls(fitur)
+
+    @property
+    def lokasi(self):
+        return list(self.kolom_lokasi)
+
+    def encode(self, listing):
+        """Satu listing mentah {'kecamatan', 'jenis', 'fasilitas': [...]} -> array (1, n_fitur), tanpa pandas.
+        Kecamatan/jenis/fasilitas yang tidak dikenal model menghasilkan ValueError, bukan baris nol diam-diam."""
+        # Bentuk input dicek dulu: listing dari JSON bisa berupa list/string, dan string fasilitas
+        # ("AC") akan teriterasi per huruf
+        if not isinstance(listing, dict):
+            raise ValueError(f"Listing harus berupa object, bukan {type(listing).__name__}")
+        fasilitas = listing.get('fasilitas', [])
+        if not isinstance(fasilitas, (list, tuple, set)) or not all(isinstance(f, str) for f in fasilitas):
+            raise ValueError(f"'fasilitas' harus berupa list nama fasilitas (mis. [\"AC\", \"WiFi\"]), "
+                             f"bukan {fasilitas!r}")
+        kecamatan, jenis = listing.get('kecamatan'), listing.get('jenis')
+        if kecamatan not in self.kolom_lokasi:
+            raise ValueError(f"Kecamatan tidak dikenal model: {kecamatan!r}")
+        # Jenis yang valid tapi kolomnya tidak ada di model dibiarkan 0, sama seperti tabel harga
+        if jenis not in self.kolom_jenis and jenis not in JENIS_KOST:
+            raise ValueError(f"Jenis kost harus salah satu dari {JENIS_KOST}, bukan {jenis!r}")
+
+        X = np.zeros((1, len(self.fitur)), dtype=np.float32)
+        X[0, self.kolom_lokasi[kecamatan]] = 1
+        if jenis in self.kolom_jenis:
+            X[0, self.kolom_jenis[jenis]] = 1
+        tidak_dikenal = []
+        for nama in fasilitas:
+            kolom = self.kolom_fasilitas.get(nama_kolom_fasilitas(nama))
+            if kolom is None:
+                tidak_dikenal.append(nama)
+            else:
+                X[0, kolom] = 1
+        if tidak_dikenal:
+            raise ValueError(f"Fasilitas tidak dikenal: {sorted(tidak_dikenal)}")
+        return X
+
+    def decode(self, x):
+        """Kebalikan encode: satu baris ter-encode -> listing mentah (dipakai mengukur latensi jalur serving)"""
+        x = np.asarray(x).ravel()
+        kecamatan = next((nama for nama, i in self.kolom_lokasi.items() if x[i]), None)
+        jenis = next((nama for nama, i in self.kolom_jenis.items() if x[i]), None)
+        if jenis is None:
+            # Jenis tanpa kolom di model: ter-encode sebagai semua 0
+            jenis = next((j for j in JENIS_KOST if j not in self.kolom_jenis), None)
+        return {'kecamatan': kecamatan, 'jenis': jenis,
+                'fasilitas': [nama for nama, i in self.kolom_fasilitas.items() if x[i]]}
+
+    def transform(self, df, dtype=np.float32):
+        """DataFrame bersih (Daerah_Clean, Jenis Kost, Fasilitas_*) -> (array, mask kecamatan dikenal).
+        Baris dengan kecamatan yang tidak dikenal (mis. kena filter saat training) tetap 0 di kolom
+        lokasi; mask-nya dikembalikan supaya pemanggil bisa menandainya."""
+        X = np.zeros((len(df), len(self.fitur)), dtype=dtype)
+
+        for nama, kolom in self.kolom_fasilitas.items():
+            if nama in df.columns:
+                X[:, kolom] = df[nama].to_numpy(dtype=dtype)
+
+        # Fasilitas di luar 6 kolom kunci (vocabulary penuh) diambil dari teks Fasilitas_Clean jika ada
+        kurang = [nama for nama in self.kolom_fasilitas if nama not in df.columns]
+        if kurang and 'Fasilitas_Clean' in df.columns:
+            # Import di sini: jalur inferensi biasa tidak butuh clean_data (pyarrow, scipy)
+            from clean_data import KumpulanFasilitas
+            kumpulan = KumpulanFasilitas()
+            kumpulan.tambah(df['Fasilitas_Clean'])
+            matriks, kolom = kumpulan.matriks(min_frek=1)
+            for i, nama in enumerate(kolom):
+                if nama in kurang:
+                    X[:, self.kolom_fasilitas[nama]] = matriks[:, i].toarray().ravel()
+
+        baris = np.arange(len(df))
+        dikenal_lokasi = None
+        for kolom_asal, peta in [('Daerah_Clean', self.kolom_lokasi), ('Jenis Kost', self.kolom_jenis)]:
+            indeks_kolom = np.array(list(peta.values()), dtype=np.int64)
+            # Kode kategori -1 berarti nilai tidak dikenal
+            kode = pd.Categorical(df[kolom_asal], categories=list(peta)).codes
+            dikenal = kode >= 0
+            X[baris[dikenal], indeks_kolom[kode[dikenal]]] = 1
+            if dikenal_lokasi is None:
+                dikenal_lokasi = dikenal
+        return X, dikenal_lokasi
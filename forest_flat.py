@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+
+# ==============================================================================
+# FOREST FLAT: RANDOM FOREST DALAM BENTUK ARRAY NUMPY YANG BISA DI-MMAP
+# ==============================================================================
+# Semua pohon di forest digabung jadi beberapa array kontigu (feature,
+# threshold, children, value). Array disimpan sebagai .npy terpisah supaya
+# bisa dibuka dengan mmap_mode='r': load hampir instan, dan beberapa worker
+# Streamlit berbagi satu salinan di page cache, bukan unpickle masing-masing.
+# Karena semua pohon dievaluasi sekaligus, output per pohon (dan kuantilnya
+# untuk rentang harga) didapat dari traversal yang sama dengan predict.
+
+DIR_FOREST = 'model_flat'
+ARRAY_FOREST = ['feature', 'threshold', 'left', 'right', 'value', 'roots']
+# Kuantil default rentang harga (P10/P50/P90) dari sebaran prediksi per pohon
+KUANTIL_INTERVAL = (0.1, 0.5, 0.9)
+
+
+def sidik_model(model):
+    """Hash isi semua pohon model sklearn (±2 ms untuk ratusan pohon). Disimpan di meta.json saat
+    ekspor supaya muat_artefak hanya memakai model_flat/ yang memang diekspor dari model ini."""
+    h = hashlib.sha1()
+    for est in model.estimators_:
+        tree = est.tree_
+        for arr in (tree.feature, tree.threshold, tree.children_left, tree.children_right, tree.value):
+            h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+def ratakan_forest(model):
+    """Ratakan semua pohon RandomForestRegressor ke array global -> (arrays, meta)"""
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    offset = 0
+    for est in model.estimators_:
+        tree = est.tree_
+        anak_kiri = tree.children_left.astype(np.int32)
+        anak_kanan = tree.children_right.astype(np.int32)
+        daun = anak_kiri == -1
+
+        # Indeks anak digeser ke posisi global. Daun menunjuk ke dirinya sendiri,
+        # jadi traversal cukup diulang tanpa perlu cek daun di setiap langkah.
+        idx_global = np.arange(tree.node_count, dtype=np.int32) + offset
+        feature.append(np.where(daun, 0, tree.feature).astype(np.int32))
+        threshold.append(tree.threshold.astype(np.float64))
+        left.append(np.where(daun, idx_global, anak_kiri + offset).astype(np.int32))
+        right.append(np.where(daun, idx_global, anak_kanan + offset).astype(np.int32))
+        value.append(tree.value[:, 0, 0].astype(np.float64))
+        roots.append(offset)
+        offset += tree.node_count
+
+    arrays = {
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold),
+        'left': np.concatenate(left),
+        'right': np.concatenate(right),
+        'value': np.concatenate(value),
+        'roots': np.array(roots, dtype=np.int64),
+    }
+    meta = {
+        'n_fitur': int(model.n_features_in_),
+        'n_pohon': len(model.estimators_),
+        'n_node': int(offset),
+        'kedalaman_maks': int(max(est.tree_.max_depth for est in model.estimators_)),
+        'sidik_model': sidik_model(model),
+    }
+    return arrays, meta
+
+
+def ekspor_forest(model, folder=DIR_FOREST):
+    """Ratakan forest lalu simpan tiap array sebagai .npy + meta.json di folder"""
+    os.makedirs(folder, exist_ok=True)
+    arrays, meta = ratakan_forest(model)
+    for nama, arr in arrays.items():
+        np.save(os.path.join(folder, f"{nama}.npy"), arr)
+    with open(os.path.join(folder, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class ForestFlat:
+    """Evaluator vektor untuk forest hasil ekspor. Antarmukanya meniru model.predict"""
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.n_features_in_ = meta['n_fitur']
+
+    def apply(self, X):
+        """Indeks daun untuk setiap (baris, pohon), shape (n_baris, n_pohon)"""
+        a = self.arrays
+        # sklearn membandingkan fitur float32 dengan threshold float64
+        X = np.asarray(X, dtype=np.float32)
+        baris = np.arange(len(X))[:, None]
+        node = np.broadcast_to(a['roots'], (len(X), len(a['roots']))).copy()
+
+        # Daun menunjuk ke dirinya sendiri, jadi kedalaman maks kali langkah sudah pasti sampai
+        for _ in range(self.meta['kedalaman_maks']):
+            ke_kiri = X[baris, a['feature'][node]] <= a['threshold'][node]
+            node = np.where(ke_kiri, a['left'][node], a['right'][node])
+        return node
+
+    def predict_per_pohon(self, X):
+        return self.arrays['value'][self.apply(X)]
+
+    @staticmethod
+    def _rata_rata(per_pohon):
+        # Dijumlah berurutan per pohon (bukan np.sum pairwise) agar sama persis dengan sklearn
+        hasil = np.zeros(len(per_pohon), dtype=np.float64)
+        for t in range(per_pohon.shape[1]):
+            hasil += per_pohon[:, t]
+        return hasil / per_pohon.shape[1]
+
+    def predict(self, X):
+        return self._rata_rata(self.predict_per_pohon(X))
+
+    def predict_interval(self, X, kuantil=KUANTIL_INTERVAL):
+        """Prediksi + kuantil sebaran output semua pohon dari SATU traversal vektor.
+        Mengembalikan (y, Q): y sama persis dengan predict(X), Q shape (n_baris, len(kuantil))."""
+        per_pohon = self.predict_per_pohon(X)
+        return self._rata_rata(per_pohon), np.quantile(per_pohon, kuantil, axis=1).T
+
+
+def forest_dari_model(model):
+    """ForestFlat di memori langsung dari model sklearn (tanpa ekspor ke disk)"""
+    return ForestFlat(*ratakan_forest(model))
+
+
+def muat_forest(folder=DIR_FOREST, mmap_mode='r'):
+    with open(os.path.join(folder, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    arrays = {nama: np.load(os.path.join(folder, f"{nama}.npy"), mmap_mode=mmap_mode) for nama in ARRAY_FOREST}
+    return ForestFlat(arrays, meta)
+
+
+def cek_paritas(path_data=None):
+    """Bandingkan prediksi forest flat dengan sklearn di seluruh data bersih"""
+    # Import di sini supaya jalur inferensi (app/server) tidak ikut memuat pyarrow; artefak_kost
+    # sendiri mengimpor modul ini
+    import pandas as pd
+    from data_kost import muat_bersih
+    from artefak_kost import muat_artefak
+    artefak = muat_artefak(pakai_flat=False)
+    forest = muat_forest()
+
+    df = muat_bersih(path=path_data)
+    # DataFrame dengan nama kolom, seperti saat model sklearn di-fit
+    X = pd.DataFrame(artefak.encoder.transform(df)[0], columns=artefak.fitur)
+
+    y_sklearn = artefak.predict(X)
+    y_flat = forest.predict(X)
+    selisih = np.abs(y_sklearn - y_flat).max()
+    print(f"Paritas {len(X)} baris: selisih maks = {selisih}")
+    return bool(np.array_equal(y_sklearn, y_flat))
+
+
+if __name__ == "__main__":
+    if '--cek' in sys.argv:
+        sama = cek_paritas()
+        print("✅ Prediksi identik dengan sklearn." if sama else "❌ Prediksi BERBEDA dengan sklearn!")
+        sys.exit(0 if sama else 1)
+
+    from artefak_kost import muat_artefak
+    meta = ekspor_forest(muat_artefak(pakai_flat=False).model)
+    print(f"Forest flat ({meta['n_pohon']} pohon, {meta['n_node']} node) disimpan di '{DIR_FOREST}/'")
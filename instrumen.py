@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import functools
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ==============================================================================
+# INSTRUMENTASI: WAKTU, CPU, MEMORI PUNCAK & JUMLAH BARIS PER TAHAP (JSON LINES)
+# ==============================================================================
+# Setiap script membuat satu Instrumen lalu membungkus tahapnya:
+#
+#     METRIK = Instrumen('clean_data')
+#     with METRIK.tahap('baca') as m:
+#         df = ...
+#         m['baris'] = len(df)
+#
+# Setiap tahap yang selesai (atau gagal) langsung di-append sebagai satu baris
+# JSON ke hasil_evaluasi/metrik.jsonl (di samping laporan teks). Semua baris
+# dari satu eksekusi punya 'run' yang sama, jadi run bisa dibandingkan:
+#     python instrumen.py            -> ringkasan run terakhir vs sebelumnya
+#
+# Memori puncak: di Linux VmHWM di-reset per tahap lewat /proc/self/clear_refs
+# sehingga puncaknya benar-benar milik tahap itu (tahap bersarang tetap
+# benar). Di OS lain dipakai ru_maxrss (puncak proses sejak mulai).
+# cpu_s = CPU proses ini (semua thread) + proses anak yang sudah selesai.
+
+PATH_METRIK = os.path.join('hasil_evaluasi', 'metrik.jsonl')
+
+
+def baca_hwm_kb():
+    """Puncak RSS (kB) sejak reset terakhir; None jika tidak tersedia"""
+    try:
+        with open('/proc/self/status') as f:
+            for baris in f:
+                if baris.startswith('VmHWM:'):
+                    return int(baris.split()[1])
+    except OSError:
+        pass
+    if resource is not None:
+        # ru_maxrss: kB di Linux, byte di macOS
+        maks = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maks // 1024 if sys.platform == 'darwin' else maks
+    return None
+
+
+def reset_hwm():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def waktu_cpu():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def persentil_ms(waktu):
+    """p50/p99 (ms) dari daftar durasi dalam detik"""
+    waktu = sorted(w * 1000 for w in waktu)
+    def persentil(q):
+        # Interpolasi linear seperti np.percentile
+        posisi = (len(waktu) - 1) * q / 100
+        bawah = int(posisi)
+        atas = min(bawah + 1, len(waktu) - 1)
+        return waktu[bawah] + (waktu[atas] - waktu[bawah]) * (posisi - bawah)
+    return {'p50_ms': round(float(persentil(50)), 4), 'p99_ms': round(float(persentil(99)), 4)}
+
+
+class Instrumen:
+    def __init__(self, skrip, path=None, id_run=None):
+        self.skrip = skrip
+        # env KOST_METRIK mengganti lokasi file; KOST_METRIK="" mematikan instrumentasi
+        self.path = os.environ.get('KOST_METRIK', PATH_METRIK) if path is None else path
+        # id_run bisa diteruskan ke proses worker supaya trial mereka masuk run yang sama
+        self.id_run = id_run or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.terbuka = []
+
+    def tulis(self, catatan):
+        if not self.path:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # Satu write() per baris dalam mode append: aman dipakai beberapa proses sekaligus
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(catatan, ensure_ascii=False, default=str) + '\n')
+
+    @contextmanager
+    def tahap(self, nama, **info):
+        """Ukur satu tahap; isi m['baris'] (atau kunci lain) di dalam blok untuk ikut dicatat"""
+        # Puncak sejauh ini milik tahap-tahap luar, simpan sebelum VmHWM di-reset
+        hwm = baca_hwm_kb()
+        for luar in self.terbuka:
+            luar['puncak'] = max(luar['puncak'] or 0, hwm or 0)
+        per_tahap = reset_hwm()
+        status = {'puncak': None}
+        self.terbuka.append(status)
+
+        m = dict(info)
+        hasil = 'ok'
+        mulai_wall, mulai_cpu = time.perf_counter(), waktu_cpu()
+        try:
+            yield m
+        except BaseException as e:
+            hasil = type(e).__name__
+            raise
+        finally:
+            wall = time.perf_counter() - mulai_wall
+            cpu = waktu_cpu() - mulai_cpu
+            self.terbuka.pop()
+            puncak = max(status['puncak'] or 0, baca_hwm_kb() or 0) or None
+            for luar in self.terbuka:
+                luar['puncak'] = max(luar['puncak'] or 0, puncak or 0)
+
+            self.tulis({
+                'run': self.id_run,
+                'waktu': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'skrip': self.skrip,
+                'tahap': nama,
+                'status': hasil,
+                'wall_s': round(wall, 4),
+                'cpu_s': round(cpu, 4),
+                'rss_puncak_mb': round(puncak / 1024, 1) if puncak else None,
+                'puncak_per_tahap': per_tahap,
+                **m,
+            })
+
+    def bungkus(self, nama=None):
+        """Dekorator: seluruh pemanggilan fungsi dicatat sebagai satu tahap"""
+        def dekorator(fungsi):
+            @functools.wraps(fungsi)
+            def pembungkus(*args, **kwargs):
+                with self.tahap(nama or fungsi.__name__):
+                    return fungsi(*args, **kwargs)
+            return pembungkus
+        return dekorator
+
+
+# ==============================================================================
+# RINGKASAN: RUN TERAKHIR VS RUN SEBELUMNYA PER SCRIPT
+# ==============================================================================
+
+def baca_metrik(path=PATH_METRIK):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(baris) for baris in f if baris.strip()]
+
+
+def ringkas(path=PATH_METRIK, skrip=None):
+    catatan = baca_metrik(path)
+    if skrip:
+        catatan = [c for c in catatan if c['skrip'] == skrip]
+
+    # Urutan run per script sesuai kemunculan di file (file hanya di-append)
+    run_per_skrip = {}
+    for c in catatan:
+        daftar = run_per_skrip.setdefault(c['skrip'], [])
+        if c['run'] not in daftar:
+            daftar.append(c['run'])
+
+    for nama_skrip, daftar_run in run_per_skrip.items():
+        terakhir = daftar_run[-1]
+        sebelum = daftar_run[-2] if len(daftar_run) > 1 else None
+        print(f"\n=== {nama_skrip} | run {terakhir}" + (f" vs {sebelum}" if sebelum else "") + " ===")
+
+        def per_tahap(run):
+            hasil = {}
+            for c in catatan:
+                if c['skrip'] == nama_skrip and c['run'] == run:
+                    t = hasil.setdefault(c['tahap'], {'n': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rss': 0.0, 'baris': None})
+                    t['n'] += 1
+                    t['wall_s'] += c['wall_s']
+                    t['cpu_s'] += c['cpu_s']
+                    t['rss'] = max(t['rss'], c.get('rss_puncak_mb') or 0)
+                    if c.get('baris') is not None:
+                        t['baris'] = c['baris']
+            return hasil
+
+        kini = per_tahap(terakhir)
+        lalu = per_tahap(sebelum) if sebelum else {}
+        print(f"{'Tahap':<28}{'n':>4}{'Wall (s)':>10}{'CPU (s)':>10}{'RSS (MB)':>10}{'Baris':>10}{'Wall lalu':>11}{'Selisih':>9}")
+        for tahap, t in kini.items():
+            baris = f"{t['baris']:,}" if t['baris'] is not None else '-'
+            teks = f"{tahap:<28}{t['n']:>4}{t['wall_s']:>10.2f}{t['cpu_s']:>10.2f}{t['rss']:>10.1f}{baris:>10}"
+            if tahap in lalu and lalu[tahap]['wall_s'] > 0:
+                selisih = 100 * (t['wall_s'] / lalu[tahap]['wall_s'] - 1)
+                teks += f"{lalu[tahap]['wall_s']:>11.2f}{selisih:>+8.0f}%"
+            print(teks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ringkas metrik per tahap (run terakhir vs sebelumnya)")
+    parser.add_argument('--path', default=PATH_METRIK)
+    parser.add_argument('--skrip', default=None, help="Hanya script ini (mis. train_model)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Belum ada metrik di '{args.path}'. Jalankan clean_data.py / train_model.py dulu.")
+    else:
+        ringkas(args.path, args.skrip)
@@ -0,0 +1,225 @@
+import os
+import time
+import bisect
+import tempfile
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+from fitur_kost import kolom_fasilitas, nama_kolom_fasilitas
+from instrumen import persentil_ms
+
+# ==============================================================================
+# KOST SERUPA: INDEKS LISTING PEMBANDING (KECAMATAN, JENIS, BITMASK FASILITAS)
+# ==============================================================================
+# Setelah app.py menampilkan estimasi harga, user ingin melihat listing asli
+# yang mirip. Indeks dibangun sekali saat training dari data bersih:
+# - baris diurutkan per (kecamatan, jenis) -> bitmask fasilitas -> harga
+# - tiap (kecamatan, jenis) menyimpan daftar bucket bitmask unik (maks 2^6)
+#   beserta rentang barisnya
+# Query menghitung jarak Hamming ke setiap bucket (int.bit_count), lalu
+# mengambil bucket dari jarak terkecil; di dalam bucket harga sudah urut,
+# jadi listing dengan harga terdekat dicari dengan bisect. Biayanya
+# bergantung pada jumlah bucket & K, bukan jumlah baris.
+
+PATH_SERUPA = 'indeks_serupa.pkl'
+K_SERUPA = 5
+
+
+class IndeksSerupa:
+    def __init__(self, fasilitas, grup, harga, mask, nama_blob, nama_offset):
+        # Bit ke-i di mask = fasilitas[i]
+        self.fasilitas = list(fasilitas)
+        self.bit = {nama: 1 << i for i, nama in enumerate(self.fasilitas)}
+        # {(kecamatan, jenis): (daftar_mask, daftar_awal, daftar_akhir)}, list Python biasa
+        self.grup = grup
+        self.harga = harga
+        self.mask = mask
+        # Nama Kost sebagai satu blob UTF-8 + offset, jauh lebih ringkas dari array object
+        self.nama_blob = nama_blob
+        self.nama_offset = nama_offset
+
+    def __len__(self):
+        return len(self.harga)
+
+    @classmethod
+    def bangun(cls, df):
+        """Dari DataFrame bersih (Nama Kost, Daerah_Clean, Jenis Kost, Harga_Angka, Fasilitas_*)"""
+        fasilitas = [k for k in kolom_fasilitas(df.columns) if k != 'Fasilitas_Clean']
+        if len(fasilitas) > 64:
+            raise ValueError(f"Bitmask maksimal 64 fasilitas, data punya {len(fasilitas)}")
+        df = df.dropna(subset=['Daerah_Clean', 'Jenis Kost', 'Harga_Angka'])
+
+        mask = np.zeros(len(df), dtype=np.uint64)
+        for bit, nama in enumerate(fasilitas):
+            mask |= (df[nama].to_numpy() > 0).astype(np.uint64) << np.uint64(bit)
+        kecamatan = pd.Categorical(df['Daerah_Clean'])
+        jenis = pd.Categorical(df['Jenis Kost'])
+        n_jenis = len(jenis.categories)
+        kode_grup = kecamatan.codes.astype(np.int64) * n_jenis + jenis.codes
+        harga = df['Harga_Angka'].to_numpy()
+
+        urutan = np.lexsort((harga, mask, kode_grup))
+        kode_grup, mask, harga = kode_grup[urutan], mask[urutan], harga[urutan]
+
+        # Batas run (grup, mask) yang sama
+        ubah = np.flatnonzero((kode_grup[1:] != kode_grup[:-1]) | (mask[1:] != mask[:-1])) + 1
+        awal = np.concatenate([[0], ubah])
+        akhir = np.concatenate([ubah, [len(harga)]])
+        grup = {}
+        for a, b in zip(awal.tolist(), akhir.tolist()):
+            kode = int(kode_grup[a])
+            kunci = (str(kecamatan.categories[kode // n_jenis]), str(jenis.categories[kode % n_jenis]))
+            daftar_mask, daftar_awal, daftar_akhir = grup.setdefault(kunci, ([], [], []))
+            daftar_mask.append(int(mask[a]))
+            daftar_awal.append(a)
+            daftar_akhir.append(b)
+
+        nama = [str(n).encode('utf-8') for n in df['Nama Kost'].to_numpy()[urutan]]
+        nama_offset = np.zeros(len(nama) + 1, dtype=np.int64)
+        np.cumsum([len(n) for n in nama], out=nama_offset[1:])
+
+        # Dtype sekecil mungkin supaya artefak tetap ringkas di ratusan ribu baris
+        tipe_mask = np.min_scalar_type((1 << len(fasilitas)) - 1) if fasilitas else np.uint8
+        tipe_harga = np.int32 if len(harga) == 0 or harga.max() < 2 ** 31 else np.int64
+        return cls(fasilitas, grup, harga.astype(tipe_harga), mask.astype(tipe_mask),
+                   b''.join(nama), nama_offset)
+
+    def nama(self, baris):
+        return self.nama_blob[self.nama_offset[baris]:self.nama_offset[baris + 1]].decode('utf-8')
+
+    def mask_fasilitas(self, fasilitas_aktif):
+        """Nama fasilitas ('AC', 'Fasilitas_AC', ...) -> bitmask; fasilitas di luar indeks diabaikan"""
+        mask = 0
+        for nama in fasilitas_aktif:
+            mask |= self.bit.get(nama_kolom_fasilitas(nama), 0)
+        return mask
+
+    def cari(self, kecamatan, jenis, fasilitas_aktif, harga, k=K_SERUPA):
+        """K listing terdekat dengan kecamatan & jenis yang sama: jarak Hamming fasilitas terkecil,
+        lalu harga paling dekat. Mengembalikan list (baris, beda_fasilitas, selisih_harga)."""
+        grup = self.grup.get((kecamatan, jenis))
+        if grup is None:
+            return []
+        target = self.mask_fasilitas(fasilitas_aktif)
+        daftar_mask, daftar_awal, daftar_akhir = grup
+        jarak = sorted(((m ^ target).bit_count(), i) for i, m in enumerate(daftar_mask))
+
+        hasil, j = [], 0
+        # Proses per tingkat jarak; begitu K terpenuhi, tingkat berikutnya pasti lebih jauh
+        while j < len(jarak) and len(hasil) < k:
+            tingkat = jarak[j][0]
+            kandidat = []
+            while j < len(jarak) and jarak[j][0] == tingkat:
+                i = jarak[j][1]
+                a, b = daftar_awal[i], daftar_akhir[i]
+                # Harga urut di dalam bucket: K terdekat pasti ada di K kiri/kanan posisi sisip
+                posisi = bisect.bisect_left(self.harga, harga, a, b)
+                for baris in range(max(a, posisi - k), min(b, posisi + k)):
+                    kandidat.append((abs(int(self.harga[baris]) - harga), baris))
+                j += 1
+            kandidat.sort()
+            hasil += [(baris, tingkat, selisih) for selisih, baris in kandidat]
+        return hasil[:k]
+
+    def serupa(self, kecamatan, jenis, fasilitas_aktif, harga, k=K_SERUPA):
+        """Seperti cari(), tapi dalam bentuk dict siap tampil"""
+        return [{'Nama Kost': self.nama(baris), 'Harga_Angka': int(self.harga[baris]), 'Beda_Fasilitas': beda}
+                for baris, beda, _ in self.cari(kecamatan, jenis, fasilitas_aktif, harga, k)]
+
+
+def bangun_serupa(path=None):
+    """Bangun indeks dari file data bersih; hanya kolom yang dipakai indeks yang dibaca"""
+    # Import di sini: app.py hanya butuh IndeksSerupa.cari, tidak perlu pyarrow
+    from data_kost import NAMA_BERSIH, cari_file, kolom_file, muat_bersih
+    path = path or cari_file(NAMA_BERSIH)
+    if path is None:
+        raise FileNotFoundError(f"File '{NAMA_BERSIH}.parquet/.csv' tidak ditemukan")
+    kolom = [k for k in kolom_file(path) if k != 'Fasilitas_Clean']
+    return IndeksSerupa.bangun(muat_bersih(kolom, path=path))
+
+
+def simpan_serupa(indeks, path=PATH_SERUPA):
+    """Disimpan sebagai dict biasa (seperti tabel harga), jadi bisa dimuat dari script mana pun"""
+    data = {k: v for k, v in indeks.__dict__.items() if k != 'bit'}
+    joblib.dump(data, path)
+
+
+def muat_serupa(path=PATH_SERUPA):
+    return IndeksSerupa(**joblib.load(path))
+
+
+def cari_brute_force(df, kecamatan, jenis, fasilitas_aktif, harga, k=K_SERUPA):
+    """Pembanding untuk benchmark: scan seluruh data, urutkan (jarak Hamming, selisih harga)"""
+    fasilitas = [f for f in kolom_fasilitas(df.columns) if f != 'Fasilitas_Clean']
+    aktif = {nama_kolom_fasilitas(f) for f in fasilitas_aktif}
+    sub = df[(df['Daerah_Clean'] == kecamatan) & (df['Jenis Kost'] == jenis)]
+    beda = sum((sub[f].to_numpy() > 0) != (f in aktif) for f in fasilitas)
+    selisih = np.abs(sub['Harga_Angka'].to_numpy().astype(np.int64) - harga)
+    urutan = np.lexsort((selisih, beda))[:k]
+    return [(int(beda[i]), int(selisih[i])) for i in urutan]
+
+
+def benchmark_serupa(path=None, kelipatan=(1, 100), n_query=2000, k=K_SERUPA):
+    """Waktu bangun, ukuran artefak, dan latensi query indeks vs scan penuh di data 1x/100x"""
+    from data_kost import muat_bersih
+    print("=== BENCHMARK INDEKS KOST SERUPA ===")
+    df_asli = muat_bersih(path=path)
+    fasilitas = [f for f in kolom_fasilitas(df_asli.columns) if f != 'Fasilitas_Clean']
+    rng = np.random.default_rng(42)
+
+    print(f"{'Baris':>10}{'Bangun (s)':>12}{'Artefak MB':>12}{'Indeks p50/p99 (us)':>22}{'Scan p50 (us)':>15}  Sama")
+    for kelipatan_ in kelipatan:
+        df = pd.concat([df_asli] * kelipatan_, ignore_index=True)
+        if kelipatan_ > 1:
+            # Harga digeser sedikit supaya salinan tidak identik
+            df['Harga_Angka'] = (df['Harga_Angka'] * rng.uniform(0.9, 1.1, len(df))).round(-3).astype(np.int32)
+
+        mulai = time.perf_counter()
+        indeks = IndeksSerupa.bangun(df)
+        waktu_bangun = time.perf_counter() - mulai
+        with tempfile.TemporaryDirectory() as folder:
+            path_artefak = os.path.join(folder, PATH_SERUPA)
+            simpan_serupa(indeks, path_artefak)
+            ukuran = os.path.getsize(path_artefak) / 1024 / 1024
+
+        # Query dari listing acak (kombinasi yang benar-benar ada) dengan harga acak di sekitarnya
+        contoh = df.iloc[rng.integers(0, len(df), n_query)]
+        query = [(str(r['Daerah_Clean']), str(r['Jenis Kost']),
+                  [f for f in fasilitas if rng.random() < 0.5], int(r['Harga_Angka'] * rng.uniform(0.8, 1.2)))
+                 for _, r in contoh.iterrows()]
+
+        waktu = []
+        for q in query:
+            mulai = time.perf_counter()
+            indeks.cari(*q, k=k)
+            waktu.append(time.perf_counter() - mulai)
+        lat = persentil_ms(waktu)
+
+        # Scan penuh hanya di sebagian query (lambat di data besar); sekaligus cek hasilnya sama
+        waktu_scan, sama = [], True
+        for q in query[:50]:
+            mulai = time.perf_counter()
+            hasil_scan = cari_brute_force(df, *q, k=k)
+            waktu_scan.append(time.perf_counter() - mulai)
+            hasil_indeks = [(beda, selisih) for _, beda, selisih in indeks.cari(*q, k=k)]
+            sama &= hasil_indeks == hasil_scan
+
+        print(f"{len(df):>10,}{waktu_bangun:>12.3f}{ukuran:>12.2f}"
+              f"{lat['p50_ms'] * 1000:>13.1f} / {lat['p99_ms'] * 1000:<6.1f}"
+              f"{persentil_ms(waktu_scan)['p50_ms'] * 1000:>15,.0f}  {'ya' if sama else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indeks listing kost serupa (dibangun juga oleh train_model.py)")
+    parser.add_argument('--input', default=None, help="Data bersih (default: data_kost_malang_clean)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Waktu bangun, ukuran, & latensi query indeks vs scan penuh (1x, 100x)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_serupa(args.input)
+    else:
+        indeks = bangun_serupa(args.input)
+        simpan_serupa(indeks)
+        print(f"Indeks {len(indeks):,} listing ({len(indeks.grup)} kecamatan x jenis) disimpan di '{PATH_SERUPA}'")
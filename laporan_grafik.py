@@ -0,0 +1,276 @@
+import os
+import json
+import time
+import inspect
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+
+# ==============================================================================
+# RENDER GRAFIK LAPORAN: TERPISAH DARI TRAINING/EDA, PARALEL, DI-CACHE PER GRAFIK
+# ==============================================================================
+# eda_check.py dan train_model.py hanya menyiapkan DATA setiap grafik (array
+# kecil: harga, korelasi, prediksi vs aktual, ...). Menggambar dan menyimpan
+# PNG dikerjakan di sini:
+# - setiap grafik = satu fungsi render di modul ini + datanya
+# - grafik dirender di ProcessPoolExecutor (satu proses per grafik)
+# - sidik grafik = hash(data + kode fungsi render + opsi); jika PNG-nya ada dan
+#   sidiknya sama dengan yang tercatat di <folder>/.cache_grafik.json, grafik
+#   tidak dirender ulang
+# matplotlib/seaborn baru di-import saat benar-benar menggambar (import seaborn
+# saja ~2 detik), jadi run yang semua grafiknya di-cache tetap cepat.
+# Fungsi *_sketsa menggambar dari ringkasan agregat_eda.py (eda_check.py
+# --agregat), bukan dari baris data, jadi biayanya tetap berapa pun ukuran data.
+# Data grafik evaluasi disimpan train_model.py ke PATH_DATA_EVALUASI, jadi
+# rendernya bisa ditunda: train_model.py --tanpa-grafik lalu
+#     python laporan_grafik.py --evaluasi
+
+PATH_DATA_EVALUASI = os.path.join('hasil_evaluasi', 'data_grafik_evaluasi.pkl')
+NAMA_CACHE = '.cache_grafik.json'
+DPI_EVALUASI = 300
+
+
+class Grafik:
+    """Satu tugas render: fungsi(data, path, **opsi) menulis PNG ke path"""
+
+    def __init__(self, path, fungsi, data, **opsi):
+        self.path = path
+        self.fungsi = fungsi
+        self.data = data
+        self.opsi = opsi
+
+    def sidik(self):
+        return joblib.hash((inspect.getsource(self.fungsi), self.data, self.opsi))
+
+
+# ==============================================================================
+# FUNGSI RENDER (level modul supaya bisa dikirim ke proses worker)
+# ==============================================================================
+
+def pustaka_grafik():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+
+def grafik_distribusi_harga(data, path):
+    plt, sns = pustaka_grafik()
+    sns.set_theme(style="whitegrid")
+    plt.figure(figsize=(10, 6))
+    sns.histplot(data['harga'], kde=True, color='blue')
+    plt.title('Sebaran Harga Kost di Malang')
+    plt.xlabel('Harga (Rupiah)')
+    plt.ylabel('Jumlah Kost')
+    plt.ticklabel_format(style='plain', axis='x')
+    plt.savefig(path)
+    plt.close()
+
+
+def grafik_fasilitas(data, path):
+    plt, sns = pustaka_grafik()
+    sns.set_theme(style="whitegrid")
+    harga, fasilitas = data['harga'], data['fasilitas']
+    n_cols = 3
+    n_rows = int(np.ceil(len(fasilitas) / n_cols))
+
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(18, 5 * n_rows))
+    axes = np.atleast_1d(axes).flatten()
+    for i, (col, nilai) in enumerate(fasilitas.items()):
+        sns.boxplot(x=nilai, y=harga, ax=axes[i], palette='Set2')
+        axes[i].set_title(f'Harga vs {col}', fontweight='bold')
+        axes[i].set_xlabel('Status (0=Tidak, 1=Ada)')
+        axes[i].set_ylabel('Harga Sewa')
+    for j in range(len(fasilitas), len(axes)):
+        fig.delaxes(axes[j])
+
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def grafik_korelasi(data, path):
+    plt, sns = pustaka_grafik()
+    sns.set_theme(style="whitegrid")
+    plt.figure(figsize=(12, 10))
+    sns.heatmap(data['korelasi'], annot=True, cmap='coolwarm', fmt=".2f")
+    plt.title('Seberapa Kuat Hubungan Antar Fitur?')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def grafik_distribusi_sketsa(data, path, n_bin=50):
+    """Seperti grafik_distribusi_harga, tapi dari sketsa agregat_eda.py (nilai wakil bin + jumlah)"""
+    plt, sns = pustaka_grafik()
+    sns.set_theme(style="whitegrid")
+    nilai, jumlah = data['nilai'], data['jumlah']
+    n = jumlah.sum()
+    plt.figure(figsize=(10, 6))
+    _, tepi, _ = plt.hist(nilai, bins=np.linspace(data['minimum'], data['maksimum'], n_bin + 1), weights=jumlah,
+                          color='blue', alpha=0.4, edgecolor='white')
+
+    # KDE berbobot atas nilai wakil bin (bandwidth Scott seperti seaborn), diskalakan ke jumlah per bin
+    lebar = data['std'] * n ** (-1 / 5)
+    if lebar > 0:
+        sumbu = np.linspace(tepi[0], tepi[-1], 200)
+        z = (sumbu[:, None] - nilai[None, :]) / lebar
+        densitas = (np.exp(-0.5 * z ** 2) @ jumlah) / (n * lebar * np.sqrt(2 * np.pi))
+        plt.plot(sumbu, densitas * n * (tepi[1] - tepi[0]), color='blue')
+
+    plt.title('Sebaran Harga Kost di Malang')
+    plt.xlabel('Harga (Rupiah)')
+    plt.ylabel('Jumlah Kost')
+    plt.ticklabel_format(style='plain', axis='x')
+    plt.savefig(path)
+    plt.close()
+
+
+def grafik_fasilitas_sketsa(data, path):
+    """Boxplot harga vs fasilitas dari statistik kuartil agregat_eda.py (tanpa titik outlier)"""
+    plt, sns = pustaka_grafik()
+    sns.set_theme(style="whitegrid")
+    statistik = data['statistik']
+    warna = sns.color_palette('Set2', 2)
+    n_cols = 3
+    n_rows = int(np.ceil(len(statistik) / n_cols))
+
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(18, 5 * n_rows))
+    axes = np.atleast_1d(axes).flatten()
+    for i, (col, per_status) in enumerate(statistik.items()):
+        kotak = axes[i].bxp(per_status, showfliers=False, patch_artist=True)
+        for patch, status in zip(kotak['boxes'], per_status):
+            patch.set_facecolor(warna[int(status['label'])])
+        axes[i].set_title(f'Harga vs {col}', fontweight='bold')
+        axes[i].set_xlabel('Status (0=Tidak, 1=Ada)')
+        axes[i].set_ylabel('Harga Sewa')
+    for j in range(len(statistik), len(axes)):
+        fig.delaxes(axes[j])
+
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def grafik_evaluasi(data, path, dpi=DPI_EVALUASI):
+    """Grid 2x2 model juara: aktual vs prediksi, residual, faktor terpenting, confusion matrix"""
+    plt, sns = pustaka_grafik()
+    y_test, y_pred = data['y_test'], data['y_pred']
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    # Grafik A: Actual vs Predicted
+    sns.scatterplot(x=y_test, y=y_pred, ax=axes[0, 0], color='blue', alpha=0.6)
+    min_val = min(y_test.min(), y_pred.min())
+    max_val = max(y_test.max(), y_pred.max())
+    axes[0, 0].plot([min_val, max_val], [min_val, max_val], 'r--')
+    axes[0, 0].set_title(f"Akurasi {data['nama_juara']}")
+    axes[0, 0].set_xlabel('Harga Asli')
+    axes[0, 0].set_ylabel('Prediksi AI')
+
+    # Grafik B: Residual Plot
+    sns.scatterplot(x=y_test, y=y_test - y_pred, ax=axes[0, 1], color='orange', alpha=0.6)
+    axes[0, 1].axhline(0, color='red', linestyle='--')
+    axes[0, 1].set_title('Residuals: Distribusi Error')
+
+    # Grafik C: Feature Importance / Koefisien (10 teratas sudah dipilih train_model.py)
+    faktor = data['faktor']
+    if data['jenis_faktor'] == 'Pentingnya':
+        sns.barplot(x='Pentingnya', y='Fitur', data=faktor, ax=axes[1, 0], palette='viridis')
+        axes[1, 0].set_title('Top 10 Faktor Penentu Harga')
+    else:
+        sns.barplot(x='Koefisien', y='Fitur', data=faktor, ax=axes[1, 0], palette='coolwarm')
+        axes[1, 0].set_title('Top 10 Koefisien')
+
+    # Grafik D: Confusion Matrix
+    labels = data['labels']
+    sns.heatmap(data['confusion_matrix'], annot=True, fmt='d', cmap='Blues', xticklabels=labels,
+                yticklabels=labels, ax=axes[1, 1])
+    axes[1, 1].set_title('Confusion Matrix Juara')
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+def path_grafik_evaluasi(nama_juara, folder='hasil_evaluasi'):
+    return os.path.join(folder, f"Grafik_{nama_juara.replace(' ', '_')}.png")
+
+
+# ==============================================================================
+# CACHE & EKSEKUSI PARALEL
+# ==============================================================================
+
+def _render(grafik):
+    mulai = time.perf_counter()
+    grafik.fungsi(grafik.data, grafik.path, **grafik.opsi)
+    return time.perf_counter() - mulai
+
+
+def baca_cache(folder):
+    path = os.path.join(folder, NAMA_CACHE)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def tulis_cache(folder, cache):
+    with open(os.path.join(folder, NAMA_CACHE), 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+
+def render_semua(daftar, jobs=None, paksa=False):
+    """Render grafik yang datanya berubah (atau PNG-nya hilang) secara paralel.
+    Mengembalikan jumlah grafik yang dirender dan yang dilewati."""
+    cache = {}
+    for g in daftar:
+        folder = os.path.dirname(g.path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        cache.setdefault(folder, baca_cache(folder))
+
+    sidik = {g.path: g.sidik() for g in daftar}
+    perlu = [g for g in daftar if paksa or not os.path.exists(g.path)
+             or cache[os.path.dirname(g.path) or '.'].get(os.path.basename(g.path)) != sidik[g.path]]
+    for g in daftar:
+        if g not in perlu:
+            print(f"   -> '{g.path}' tidak berubah, dilewati")
+
+    # Satu grafik saja: tidak perlu biaya start proses baru
+    pekerja = min(jobs or os.cpu_count() or 1, len(perlu))
+    if pekerja > 1:
+        with ProcessPoolExecutor(max_workers=pekerja) as pool:
+            durasi = list(pool.map(_render, perlu))
+    else:
+        durasi = [_render(g) for g in perlu]
+
+    for g, detik in zip(perlu, durasi):
+        folder = os.path.dirname(g.path) or '.'
+        cache[folder][os.path.basename(g.path)] = sidik[g.path]
+        print(f"   -> Disimpan sebagai '{g.path}' ({detik:.2f} s)")
+    for folder, isi in cache.items():
+        tulis_cache(folder, isi)
+    return {'dirender': len(perlu), 'dilewati': len(daftar) - len(perlu)}
+
+
+def grafik_evaluasi_tersimpan(path_data=PATH_DATA_EVALUASI, dpi=DPI_EVALUASI):
+    """Tugas render grafik evaluasi dari data yang disimpan train_model.py"""
+    data = joblib.load(path_data)
+    return Grafik(path_grafik_evaluasi(data['nama_juara'], os.path.dirname(path_data)), grafik_evaluasi, data, dpi=dpi)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render grafik laporan yang tertunda / berubah")
+    parser.add_argument('--evaluasi', action='store_true', help=f"Render grafik evaluasi dari {PATH_DATA_EVALUASI}")
+    parser.add_argument('--dpi', type=int, default=DPI_EVALUASI)
+    parser.add_argument('--paksa', action='store_true', help="Render ulang walau datanya tidak berubah")
+    args = parser.parse_args()
+
+    if args.evaluasi:
+        if not os.path.exists(PATH_DATA_EVALUASI):
+            print(f"'{PATH_DATA_EVALUASI}' belum ada. Jalankan train_model.py dulu.")
+        else:
+            render_semua([grafik_evaluasi_tersimpan(dpi=args.dpi)], paksa=args.paksa)
+    else:
+        parser.print_help()
@@ -0,0 +1,268 @@
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# ==============================================================================
+# PIPELINE: SCRAPE -> CLEAN -> (EDA || TRAIN -> GRAFIK) DENGAN CACHE BERBASIS HASH
+# ==============================================================================
+# Setiap tahap mendeklarasikan perintah, input, dan output. Sidik (fingerprint)
+# tahap = hash isi input + kode script (beserta modul lokal yang di-import) +
+# perintah/parameter. Tahap dilewati jika sidiknya sama dengan run terakhir dan
+# outputnya masih persis seperti yang dulu ditulis. Tahap yang tidak saling
+# bergantung (EDA & training) dijalankan bersamaan.
+#
+# Semua tahap membaca/menulis data di satu folder (--folder-data, default data/)
+# lewat env KOST_DIR_DATA, jadi tidak ada lagi beda lokasi root vs data/.
+#
+# Modul ini sengaja hanya memakai standard library supaya run yang tidak
+# mengerjakan apa-apa selesai dalam hitungan milidetik.
+
+PATH_STATE = '.pipeline_state.json'
+DIR_LOG = '.pipeline_log'
+
+
+class Tahap:
+    def __init__(self, nama, perintah, input=(), output=(), setelah=(), selalu=False):
+        self.nama = nama
+        self.perintah = perintah
+        self.input = list(input)
+        self.output = list(output)
+        self.setelah = list(setelah)
+        # selalu=True: hasilnya tidak deterministik (mis. scraping), tidak pernah dianggap terkini
+        self.selalu = selalu
+
+
+def daftar_tahap(args):
+    py = sys.executable
+    folder = args.folder_data
+    mentah = os.path.join(folder, 'data_kost_malang.csv')
+    bersih = os.path.join(folder, 'data_kost_malang_clean.csv')
+    bersih_pq = os.path.join(folder, 'data_kost_malang_clean.parquet')
+    data_grafik = os.path.join('hasil_evaluasi', 'data_grafik_evaluasi.pkl')
+
+    tahap = []
+    if args.scrape:
+        tahap.append(Tahap('scrape', [py, 'scrape_malang.py', '-o', mentah],
+                           output=[mentah, os.path.join(folder, 'data_kost_malang.parquet')], selalu=True))
+
+    perintah_clean = [py, 'clean_data.py', '--input', mentah, '--output', bersih]
+    output_clean = [bersih, bersih_pq]
+    if args.dedup:
+        perintah_clean.append('--dedup')
+        output_clean.append(os.path.join(folder, 'data_kost_malang_clean_klaster_duplikat.csv'))
+    tahap.append(Tahap('clean', perintah_clean,
+                       input=[mentah], output=output_clean,
+                       setelah=['scrape'] if args.scrape else []))
+
+    tahap.append(Tahap('eda', [py, 'eda_check.py', '--folder', 'hasil_eda'],
+                       input=[bersih, bersih_pq],
+                       output=[os.path.join('hasil_eda', f) for f in
+                               ['eda_1_distribusi_harga.png', 'eda_2_fasilitas_lengkap.png', 'eda_3_korelasi.png']],
+                       setelah=['clean']))
+
+    # Grafik evaluasi dirender di tahap 'grafik' (paralel dengan sisa pipeline, di-cache per grafik)
+    perintah_train = [py, 'train_model.py', '--n-trials', str(args.n_trials), '--tanpa-grafik']
+    if args.agregasi:
+        perintah_train.append('--agregasi')
+    tahap.append(Tahap('train', perintah_train,
+                       input=[bersih, bersih_pq],
+                       # Output yang bisa tidak ada (model_flat jika juaranya bukan forest) dicatat sebagai None
+                       output=['model_kost_terbaik.pkl', 'tabel_harga.pkl', 'vocab_fasilitas.pkl', 'indeks_serupa.pkl',
+                               'model_flat', os.path.join('registry_model', 'AKTIF.json'),
+                               os.path.join('hasil_evaluasi', 'laporan_komparasi_model.txt'),
+                               data_grafik],
+                       setelah=['clean']))
+
+    tahap.append(Tahap('grafik', [py, 'laporan_grafik.py', '--evaluasi'],
+                       input=[data_grafik],
+                       output=[os.path.join('hasil_evaluasi', f) for f in
+                               ['Grafik_Random_Forest.png', 'Grafik_Linear_Regression.png',
+                                'Grafik_HistGradientBoosting.png', 'Grafik_Random_Forest_Dangkal.png']],
+                       setelah=['train']))
+    return tahap
+
+
+# ==============================================================================
+# SIDIK: HASH ISI FILE (DI-CACHE PER UKURAN + MTIME) & MODUL LOKAL
+# ==============================================================================
+
+class Sidik:
+    def __init__(self, cache):
+        # cache: {path: [ukuran, mtime_ns, sha256]}; hanya file yang berubah yang di-hash ulang
+        self.cache = cache
+
+    def file(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        tersimpan = self.cache.get(path)
+        if tersimpan and tersimpan[0] == st.st_size and tersimpan[1] == st.st_mtime_ns:
+            return tersimpan[2]
+
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for blok in iter(lambda: f.read(1 << 20), b''):
+                h.update(blok)
+        self.cache[path] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def path(self, path):
+        """Hash file, atau gabungan hash semua file di dalam folder; None jika tidak ada"""
+        if not os.path.isdir(path):
+            return self.file(path)
+        h = hashlib.sha256()
+        for akar, _, nama_file in sorted(os.walk(path)):
+            for nama in sorted(nama_file):
+                p = os.path.join(akar, nama)
+                h.update(f"{os.path.relpath(p, path)}:{self.file(p)}".encode())
+        return h.hexdigest()
+
+    def kode(self, script):
+        """Hash script + semua modul lokal (file .py di root) yang di-import, rekursif"""
+        hasil, antre = {}, [script]
+        while antre:
+            path = antre.pop()
+            if path in hasil:
+                continue
+            hasil[path] = self.file(path)
+            with open(path, encoding='utf-8') as f:
+                pohon = ast.parse(f.read())
+            for node in ast.walk(pohon):
+                if isinstance(node, ast.Import):
+                    nama = [a.name for a in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                    nama = [node.module]
+                else:
+                    continue
+                antre.extend(f"{n.split('.')[0]}.py" for n in nama if os.path.exists(f"{n.split('.')[0]}.py"))
+        return hasil
+
+    def tahap(self, t):
+        data = {
+            # Path interpreter tidak ikut: pindah venv tidak perlu memicu run ulang
+            'perintah': t.perintah[1:],
+            'kode': self.kode(t.perintah[1]),
+            'input': {p: self.path(p) for p in t.input},
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def baca_state():
+    if os.path.exists(PATH_STATE):
+        with open(PATH_STATE, encoding='utf-8') as f:
+            return json.load(f)
+    return {'tahap': {}, 'hash': {}}
+
+
+def tulis_state(state):
+    tmp = f"{PATH_STATE}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, PATH_STATE)
+
+
+def terkini(t, sidik_baru, state, sidik):
+    """Sidik sama dengan run terakhir DAN setiap output masih sama dengan yang dulu ditulis"""
+    lama = state['tahap'].get(t.nama)
+    if t.selalu or lama is None or lama['sidik'] != sidik_baru:
+        return False
+    return all(sidik.path(p) == lama['output'].get(p) for p in t.output)
+
+
+def jalankan_perintah(t, env):
+    os.makedirs(DIR_LOG, exist_ok=True)
+    path_log = os.path.join(DIR_LOG, f"{t.nama}.log")
+    mulai = time.perf_counter()
+    with open(path_log, 'w', encoding='utf-8') as log:
+        kode = subprocess.call(t.perintah, stdout=log, stderr=subprocess.STDOUT, env=env)
+    return kode, time.perf_counter() - mulai, path_log
+
+
+def jalankan_pipeline(args):
+    mulai_total = time.perf_counter()
+    tahap = daftar_tahap(args)
+    state = baca_state()
+    sidik = Sidik(state['hash'])
+    env = {**os.environ, 'KOST_DIR_DATA': args.folder_data}
+
+    status = {}       # nama -> 'lewat' | 'ok' | 'perlu' (mode --status) | 'gagal' | 'batal'
+    berjalan = {}     # future -> (tahap, sidik)
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        while len(status) < len(tahap):
+            # Jadwalkan semua tahap yang dependensinya sudah selesai
+            ada_perubahan = True
+            while ada_perubahan:
+                ada_perubahan = False
+                for t in tahap:
+                    if t.nama in status or any(t is x for x, _ in berjalan.values()):
+                        continue
+                    dep = [status.get(d) for d in t.setelah]
+                    if any(s in ('gagal', 'batal') for s in dep):
+                        status[t.nama] = 'batal'
+                        print(f"[{t.nama}] dibatalkan (tahap sebelumnya gagal)")
+                        ada_perubahan = True
+                    elif all(s in ('lewat', 'ok', 'perlu') for s in dep):
+                        sidik_baru = sidik.tahap(t)
+                        if t.nama not in args.paksa and terkini(t, sidik_baru, state, sidik):
+                            status[t.nama] = 'lewat'
+                            print(f"[{t.nama}] terkini, dilewati")
+                            ada_perubahan = True
+                        elif args.status:
+                            status[t.nama] = 'perlu'
+                            print(f"[{t.nama}] PERLU DIJALANKAN")
+                            ada_perubahan = True
+                        else:
+                            print(f"[{t.nama}] jalan: {' '.join(t.perintah[1:])}")
+                            berjalan[pool.submit(jalankan_perintah, t, env)] = (t, sidik_baru)
+
+            if not berjalan:
+                break
+            selesai, _ = wait(berjalan, return_when=FIRST_COMPLETED)
+            for future in selesai:
+                t, sidik_baru = berjalan.pop(future)
+                kode, durasi, path_log = future.result()
+                if kode != 0:
+                    status[t.nama] = 'gagal'
+                    print(f"[{t.nama}] GAGAL (exit {kode}) setelah {durasi:.1f} s, log: {path_log}")
+                    continue
+                status[t.nama] = 'ok'
+                state['tahap'][t.nama] = {
+                    'sidik': sidik_baru,
+                    'output': {p: sidik.path(p) for p in t.output},
+                    'durasi_detik': round(durasi, 2),
+                    'waktu': time.strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                tulis_state(state)
+                print(f"[{t.nama}] selesai dalam {durasi:.1f} s")
+
+    jumlah = {s: sum(v == s for v in status.values()) for s in ['ok', 'lewat', 'perlu', 'gagal', 'batal']}
+    if args.status:
+        print(f"\n{jumlah['perlu']} tahap perlu dijalankan, {jumlah['lewat']} terkini")
+        return 0
+    # Simpan juga cache hash file yang baru dihitung walau tidak ada tahap yang jalan
+    tulis_state(state)
+    print(f"\nPipeline selesai dalam {time.perf_counter() - mulai_total:.2f} s ({jumlah['ok']} dijalankan, "
+          f"{jumlah['lewat']} dilewati, {jumlah['gagal']} gagal, {jumlah['batal']} dibatalkan)")
+    return 0 if jumlah['gagal'] + jumlah['batal'] == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jalankan pipeline scrape -> clean -> EDA/train dengan cache")
+    parser.add_argument('--folder-data', default='data', help="Folder data mentah & bersih untuk semua tahap")
+    parser.add_argument('--scrape', action='store_true', help="Ikut jalankan scraping (selalu dijalankan ulang)")
+    parser.add_argument('--paksa', nargs='*', default=[], metavar='TAHAP', help="Jalankan ulang tahap ini walau terkini")
+    parser.add_argument('--status', action='store_true', help="Hanya tampilkan tahap mana yang perlu dijalankan")
+    parser.add_argument('--jobs', type=int, default=2, help="Jumlah tahap yang boleh jalan bersamaan")
+    parser.add_argument('--n-trials', type=int, default=15, help="Diteruskan ke train_model.py")
+    parser.add_argument('--agregasi', action='store_true', help="Diteruskan ke train_model.py")
+    parser.add_argument('--dedup', action='store_true', help="Diteruskan ke clean_data.py (gabungkan listing duplikat)")
+    args = parser.parse_args()
+
+    sys.exit(jalankan_pipeline(args))
@@ -0,0 +1,104 @@
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from clean_data import bersihkan_data
+from artefak_kost import muat_artefak, nama_kuantil
+from forest_flat import KUANTIL_INTERVAL
+from data_kost import baca_per_chunk
+
+# ==============================================================================
+# PREDIKSI BATCH: STREAMING CSV LISTING BESAR LEWAT MODEL
+# ==============================================================================
+# Input bisa berupa CSV/Parquet bersih (seperti data_kost_malang_clean.csv) atau
+# CSV/Parquet mentah hasil scrape_malang.py. File dibaca per chunk, setiap chunk di-encode
+# dan diprediksi sekaligus, lalu langsung ditulis ke output. Memori hanya
+# sebesar satu chunk, berapa pun ukuran file inputnya.
+
+
+def peak_rss_mb():
+    """Puncak RSS proses ini dalam MB (None jika OS tidak mendukung modul resource)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+
+
+def prediksi_chunk(df, artefak, interval=False):
+    """Bersihkan (jika mentah), encode, dan prediksi satu chunk sekaligus.
+    interval=True menambah kolom Harga_P10/P50/P90 dari traversal per pohon yang sama."""
+    if 'Harga_Angka' not in df.columns and 'Harga Mentah' in df.columns:
+        # Teks fasilitas ikut dibawa supaya fasilitas di luar 6 kolom kunci tetap ter-encode
+        df = bersihkan_data(df, sertakan_teks=True)
+
+    hasil = df.drop(columns=['Fasilitas_Clean'], errors='ignore')
+    if len(df) == 0:
+        hasil['Prediksi_Harga'] = pd.Series(dtype=np.float64)
+        return hasil
+
+    if interval:
+        y, Q, dikenal = artefak.interval_df(df)
+    else:
+        y, dikenal = artefak.prediksi_df(df)
+    hasil['Prediksi_Harga'] = y.round().astype(np.int64)
+    if interval:
+        for i, nama in enumerate(nama_kuantil(KUANTIL_INTERVAL)):
+            hasil[f"Harga_{nama.upper()}"] = Q[:, i].round().astype(np.int64)
+    # Kecamatan yang tidak dikenal model (mis. kena filter saat training) diprediksi tanpa efek lokasi
+    hasil['Kecamatan_Dikenal'] = dikenal
+    if 'Harga_Angka' in df.columns:
+        hasil['Residual'] = hasil['Harga_Angka'] - hasil['Prediksi_Harga']
+    return hasil
+
+
+def jalankan_batch(path_input, path_output, chunksize=50000, interval=False):
+    print("=== MEMULAI PREDIKSI BATCH ===")
+    artefak = muat_artefak()
+    if interval:
+        try:
+            artefak.cek_interval()
+        except ValueError as e:
+            raise SystemExit(f"{e} (--interval)")
+
+    waktu_mulai = time.perf_counter()
+    total_baris, total_tidak_dikenal = 0, 0
+    header = True
+
+    for i, chunk in enumerate(baca_per_chunk(path_input, chunksize)):
+        hasil = prediksi_chunk(chunk, artefak, interval)
+        hasil.to_csv(path_output, mode='w' if header else 'a', header=header, index=False)
+        header = False
+        total_baris += len(hasil)
+        if 'Kecamatan_Dikenal' in hasil.columns:
+            total_tidak_dikenal += int((~hasil['Kecamatan_Dikenal']).sum())
+        print(f"   -> Chunk {i + 1}: {len(hasil)} baris diprediksi")
+
+    durasi = time.perf_counter() - waktu_mulai
+    rss = peak_rss_mb()
+
+    print("\n===============================================")
+    print(f"SUKSES! Prediksi tersimpan di '{path_output}'")
+    print(f"Total Baris   : {total_baris}")
+    if total_tidak_dikenal:
+        print(f"[PERINGATAN] {total_tidak_dikenal} baris dengan kecamatan yang tidak dikenal model "
+              f"(kolom Kecamatan_Dikenal = False)")
+    print(f"Durasi        : {durasi:.2f} detik")
+    print(f"Throughput    : {total_baris / durasi:,.0f} baris/detik" if durasi > 0 else "Throughput    : -")
+    print(f"Peak RSS      : {rss:,.1f} MB" if rss is not None else "Peak RSS      : tidak tersedia di OS ini")
+    return total_baris, durasi, rss
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prediksi harga kost untuk seluruh isi CSV secara batch")
+    parser.add_argument('input', help="CSV/Parquet bersih (data_kost_malang_clean) atau mentah hasil scrape")
+    parser.add_argument('-o', '--output', default='prediksi_batch.csv', help="CSV hasil prediksi")
+    parser.add_argument('--chunksize', type=int, default=50000, help="Jumlah baris per chunk")
+    parser.add_argument('--interval', action='store_true',
+                        help="Tambah kolom rentang harga Harga_P10/P50/P90 (hanya model forest yang dikalibrasi saat training)")
+    args = parser.parse_args()
+
+    jalankan_batch(args.input, args.output, args.chunksize, args.interval)
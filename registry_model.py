@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import argparse
+import threading
+import joblib
+from artefak_kost import PATH_ARTEFAK, ModelKost, muat_artefak, simpan_artefak
+from fitur_kost import PATH_VOCAB
+from forest_flat import DIR_FOREST
+from tabel_harga import PATH_TABEL
+from kost_serupa import PATH_SERUPA, muat_serupa
+
+# ==============================================================================
+# REGISTRY MODEL: VERSI IMMUTABLE + POINTER YANG DIGANTI ATOMIK
+# ==============================================================================
+# Setiap training menerbitkan satu folder versi baru berisi SEMUA file yang
+# dipakai saat serving (artefak, tabel harga, vocabulary, indeks kost serupa, forest flat).
+# Artefak versi 1 (model polos + list_fitur.pkl) diubah dulu menjadi ModelKost,
+# jadi list_fitur.pkl tidak ikut diterbitkan:
+#
+#     registry_model/
+#         v0001/  v0002/  v0003/ ...
+#         AKTIF.json      <- {"versi": 3, "folder": "v0003", ...}
+#
+# Folder versi ditulis di nama sementara lalu di-rename, dan AKTIF.json ditulis
+# ke file sementara lalu os.replace. Pembaca selalu melihat pasangan file yang
+# lengkap & cocok, tidak pernah file setengah jadi atau campuran dua training.
+#
+# PemuatModel (dipakai app.py) hanya os.stat AKTIF.json per request. Jika
+# berubah, versi baru dimuat di thread latar sementara request tetap dilayani
+# versi lama; setelah selesai, referensinya diganti dalam satu assignment.
+
+DIR_REGISTRY = 'registry_model'
+NAMA_MANIFEST = 'AKTIF.json'
+# Versi lama yang disimpan untuk rollback (versi aktif tidak pernah dihapus)
+SIMPAN_VERSI = 5
+FILE_VERSI = [PATH_ARTEFAK, PATH_TABEL, PATH_VOCAB, PATH_SERUPA, DIR_FOREST]
+
+
+def nama_versi(versi):
+    return f"v{versi:04d}"
+
+
+def daftar_versi(folder=DIR_REGISTRY):
+    if not os.path.isdir(folder):
+        return []
+    return sorted(int(nama[1:]) for nama in os.listdir(folder) if nama[:1] == 'v' and nama[1:].isdigit())
+
+
+def baca_manifest(folder=DIR_REGISTRY):
+    """Isi AKTIF.json, atau None jika registry belum pernah diterbitkan"""
+    try:
+        with open(os.path.join(folder, NAMA_MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def aktifkan(versi, folder=DIR_REGISTRY, info=None):
+    """Ganti pointer ke versi tertentu (juga untuk rollback) dengan os.replace"""
+    dasar = os.path.join(folder, nama_versi(versi))
+    if not os.path.exists(os.path.join(dasar, PATH_ARTEFAK)):
+        raise FileNotFoundError(f"Versi {versi} tidak ada di registry '{folder}'")
+    manifest = {
+        'versi': versi,
+        'folder': nama_versi(versi),
+        'diaktifkan': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sha256_artefak': hash_file(os.path.join(dasar, PATH_ARTEFAK)),
+        **(info or {}),
+    }
+    path = os.path.join(folder, NAMA_MANIFEST)
+    sementara = f"{path}.{os.getpid()}.tmp"
+    with open(sementara, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(sementara, path)
+    return manifest
+
+
+def _salin_artefak(asal, tujuan):
+    # Artefak versi 1 dibungkus ModelKost (encoder dari list_fitur.pkl di sampingnya)
+    if isinstance(joblib.load(asal), ModelKost):
+        shutil.copy2(asal, tujuan)
+    else:
+        simpan_artefak(muat_artefak(asal, pakai_flat=False), tujuan)
+
+
+def terbitkan(folder=DIR_REGISTRY, sumber='.', info=None, simpan=SIMPAN_VERSI, file=None):
+    """Salin file serving dari `sumber` ke folder versi baru, lalu jadikan versi aktif.
+    `file`: daftar file yang dihasilkan run ini (train_model.py); hanya itu yang diterbitkan, sisa
+    run lama di `sumber` diabaikan. Tanpa `file` (terbit manual) semua FILE_VERSI yang ada disalin."""
+    os.makedirs(folder, exist_ok=True)
+    sementara = os.path.join(folder, f".baru-{os.getpid()}")
+    shutil.rmtree(sementara, ignore_errors=True)
+    os.makedirs(sementara)
+    for nama in (FILE_VERSI if file is None else file):
+        asal = os.path.join(sumber, nama)
+        if nama == PATH_ARTEFAK:
+            _salin_artefak(asal, os.path.join(sementara, nama))
+        elif os.path.isdir(asal):
+            shutil.copytree(asal, os.path.join(sementara, nama))
+        elif os.path.exists(asal):
+            shutil.copy2(asal, os.path.join(sementara, nama))
+
+    # Nomor versi berikutnya; rename gagal jika sudah dipakai proses lain, coba nomor sesudahnya
+    versi = max(daftar_versi(folder), default=0) + 1
+    while True:
+        try:
+            os.rename(sementara, os.path.join(folder, nama_versi(versi)))
+            break
+        except OSError:
+            if not os.path.exists(os.path.join(folder, nama_versi(versi))):
+                raise
+            versi += 1
+
+    manifest = aktifkan(versi, folder, info)
+    bersihkan_versi_lama(folder, simpan)
+    return manifest
+
+
+def bersihkan_versi_lama(folder=DIR_REGISTRY, simpan=SIMPAN_VERSI):
+    """Hapus versi tertua. Proses yang masih memakai versi lama tidak terganggu: file yang
+    sudah terbuka/di-mmap tetap bisa dibaca sampai ditutup."""
+    aktif = (baca_manifest(folder) or {}).get('versi')
+    for versi in daftar_versi(folder)[:-simpan]:
+        if versi != aktif:
+            shutil.rmtree(os.path.join(folder, nama_versi(versi)), ignore_errors=True)
+
+
+def _muat_opsional(path, muat=joblib.load):
+    try:
+        return muat(path)
+    except Exception as e:
+        return None
+
+
+def muat_aset(folder=DIR_REGISTRY, manifest=None):
+    """Semua yang dibutuhkan app untuk satu versi. Tanpa manifest (registry belum ada),
+    file di root dipakai seperti sebelumnya."""
+    dasar = os.path.join(folder, manifest['folder']) if manifest else '.'
+    artefak = muat_artefak(os.path.join(dasar, PATH_ARTEFAK), os.path.join(dasar, DIR_FOREST))
+    vocab = _muat_opsional(os.path.join(dasar, PATH_VOCAB))
+    return {
+        'versi': manifest['versi'] if manifest else None,
+        'artefak': artefak,
+        # Tabel harga, vocabulary & indeks serupa opsional: tanpa semuanya app tetap jalan lewat model.predict
+        'tabel': _muat_opsional(os.path.join(dasar, PATH_TABEL)),
+        'serupa': _muat_opsional(os.path.join(dasar, PATH_SERUPA), muat_serupa),
+        'label': vocab['label'] if vocab else {},
+    }
+
+
+class PemuatModel:
+    """Pemegang aset model per proses dengan hot-reload di latar belakang.
+    ambil() tidak pernah menunggu load: selama versi baru dimuat, versi lama yang dikembalikan."""
+
+    def __init__(self, folder=DIR_REGISTRY):
+        self.folder = folder
+        self.path_manifest = os.path.join(folder, NAMA_MANIFEST)
+        self.kunci = threading.Lock()
+        self.sedang_memuat = False
+        self.jumlah_swap = 0
+        self.tanda = self._tanda()
+        try:
+            self.aset = muat_aset(folder, baca_manifest(folder))
+        except Exception as e:
+            self.aset = None
+
+    def _tanda(self):
+        # mtime + ukuran + inode: os.replace selalu menghasilkan inode baru, jadi tidak ada
+        # perubahan yang terlewat walau resolusi mtime kasar
+        try:
+            st = os.stat(self.path_manifest)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def ambil(self):
+        tanda = self._tanda()
+        if tanda != self.tanda:
+            with self.kunci:
+                if not self.sedang_memuat:
+                    self.sedang_memuat = True
+                    threading.Thread(target=self._muat_latar, args=(tanda,), daemon=True).start()
+        return self.aset
+
+    def _muat_latar(self, tanda):
+        try:
+            manifest = baca_manifest(self.folder)
+            versi_lama = self.aset['versi'] if self.aset else None
+            # Manifest ditulis ulang tanpa ganti versi (mis. aktifkan versi yang sama): tidak perlu load
+            if manifest is not None and (self.aset is None or manifest['versi'] != versi_lama):
+                baru = muat_aset(self.folder, manifest)
+                # Satu assignment: request yang sedang berjalan tetap memegang aset lama sampai selesai
+                self.aset = baru
+                self.jumlah_swap += 1
+                print(f"[REGISTRY] Model diganti: versi {versi_lama} -> {manifest['versi']}")
+        except Exception as e:
+            # Versi baru rusak/tidak lengkap: tetap layani versi lama, coba lagi saat manifest berubah
+            print(f"[PERINGATAN] Gagal memuat versi baru dari '{self.folder}': {e}. Tetap memakai versi lama.")
+        finally:
+            self.tanda = tanda
+            self.sedang_memuat = False
+
+
+def uji_swap(n_terbit=5, folder=DIR_REGISTRY):
+    """Prediksi terus-menerus di beberapa thread sambil versi baru diterbitkan berulang kali.
+    Semua versi uji diterbitkan ke registry sementara; registry `folder` hanya dibaca sebagai sumber
+    file, jadi versi rollback aslinya tidak ikut terhapus."""
+    aktif = baca_manifest(folder)
+    sumber = os.path.join(folder, aktif['folder']) if aktif else '.'
+    if not os.path.exists(os.path.join(sumber, PATH_ARTEFAK)):
+        print("Registry/model belum ada. Jalankan train_model.py dulu.")
+        return False
+    with tempfile.TemporaryDirectory() as folder_uji:
+        terbitkan(folder_uji, sumber=sumber, info={'sumber': 'uji_swap'})
+        return _uji_swap(n_terbit, folder_uji, sumber)
+
+
+def _uji_swap(n_terbit, folder, sumber):
+    pemuat = PemuatModel(folder)
+    if pemuat.aset is None:
+        print(f"Versi uji dari '{sumber}' tidak bisa dimuat.")
+        return False
+    lokasi = pemuat.aset['artefak'].encoder.lokasi[0]
+    listing = {'kecamatan': lokasi, 'jenis': 'Putri', 'fasilitas': []}
+    hitung = []
+    selesai = threading.Event()
+
+    def pekerja():
+        ok = gagal = 0
+        while not selesai.is_set():
+            try:
+                pemuat.ambil()['artefak'].prediksi(listing)
+                ok += 1
+            except Exception as e:
+                gagal += 1
+        hitung.append((ok, gagal))
+
+    thread = [threading.Thread(target=pekerja) for _ in range(4)]
+    for t in thread:
+        t.start()
+    for _ in range(n_terbit):
+        manifest = terbitkan(folder, sumber=sumber, info={'sumber': 'uji_swap'})
+        # Tunggu sampai pemuat memakai versi baru
+        while (pemuat.ambil() or {}).get('versi') != manifest['versi']:
+            time.sleep(0.01)
+    selesai.set()
+    for t in thread:
+        t.join()
+
+    ok, gagal = sum(h[0] for h in hitung), sum(h[1] for h in hitung)
+    print(f"Swap: {pemuat.jumlah_swap} | Prediksi: {ok:,} berhasil, {gagal} gagal")
+    return gagal == 0 and pemuat.jumlah_swap == n_terbit
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registry model berversi (lihat, terbitkan, rollback)")
+    parser.add_argument('--terbitkan', action='store_true',
+                        help="Terbitkan file model di root sebagai versi baru (mis. setelah forest_flat.py/tabel_harga.py)")
+    parser.add_argument('--aktifkan', type=int, default=None, help="Jadikan versi ini aktif (rollback)")
+    parser.add_argument('--uji-swap', type=int, default=None, metavar='N',
+                        help="Terbitkan N versi ke registry sementara sambil memprediksi terus; gagal jika ada prediksi yang error")
+    parser.add_argument('--folder', default=DIR_REGISTRY)
+    args = parser.parse_args()
+
+    if args.uji_swap is not None:
+        sys.exit(0 if uji_swap(args.uji_swap, args.folder) else 1)
+    if args.terbitkan:
+        manifest = terbitkan(args.folder, info={'sumber': 'manual'})
+        print(f"Versi {manifest['versi']} diterbitkan & aktif.")
+    elif args.aktifkan is not None:
+        aktifkan(args.aktifkan, args.folder, info={'sumber': 'rollback'})
+        print(f"Versi {args.aktifkan} aktif.")
+
+    aktif = (baca_manifest(args.folder) or {}).get('versi')
+    for versi in daftar_versi(args.folder):
+        print(f"{'*' if versi == aktif else ' '} {nama_versi(versi)}")
+    if aktif is None:
+        print(f"Registry '{args.folder}' belum punya versi aktif.")
@@ -0,0 +1,215 @@
+import os
+import time
+import random
+import asyncio
+import argparse
+import aiohttp
+import pandas as pd
+from scrape_malang import KOLOM_DATA, ekstrak_html
+import server_replay
+from data_kost import path_parquet, simpan_parquet
+from instrumen import Instrumen
+
+# ==============================================================================
+# SCRAPER HTTP ASYNC: ALTERNATIF TANPA BROWSER UNTUK scrape_malang.py
+# ==============================================================================
+# Halaman listing diambil langsung lewat HTTP dengan aiohttp:
+# - beberapa pekerja async berbagi satu ClientSession (koneksi keep-alive
+#   dipakai ulang, jumlah koneksi dibatasi TCPConnector(limit=konkurensi))
+# - pembatas laju global (request/detik) supaya tetap sopan ke server
+# - retry dengan backoff eksponensial + jitter untuk 429/5xx/timeout
+# Halaman pertama yang 404 atau tidak berisi kartu dianggap akhir data.
+# Parsing memakai ekstrak_html yang sama dengan scraper Selenium, jadi kolom
+# outputnya persis sama.
+#
+# Catatan: hasil pencarian Mamikos dirender di browser (URL pencariannya
+# + &page=N tidak berisi kartu), jadi --url-template wajib diisi dan harus
+# menunjuk endpoint yang mengembalikan HTML kartu kost per halaman.
+# Untuk benchmark offline, pakai server_replay.py dengan rekaman halaman.
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+STATUS_RETRY = {429, 500, 502, 503, 504}
+
+# Waktu, CPU, memori puncak & jumlah baris per tahap -> hasil_evaluasi/metrik.jsonl
+METRIK = Instrumen('scrape_http')
+
+
+class PembatasLaju:
+    """Membatasi laju request global: paling banyak per_detik request setiap detik"""
+
+    def __init__(self, per_detik=None):
+        self.jarak = 1 / per_detik if per_detik else 0
+        self.berikut = 0.0
+        self.kunci = asyncio.Lock()
+
+    async def tunggu(self):
+        if not self.jarak:
+            return
+        loop = asyncio.get_running_loop()
+        async with self.kunci:
+            sekarang = loop.time()
+            jeda = self.berikut - sekarang
+            self.berikut = max(sekarang, self.berikut) + self.jarak
+        if jeda > 0:
+            await asyncio.sleep(jeda)
+
+
+class ScrapeGagal(RuntimeError):
+    """Halaman gagal diambil setelah semua retry; membawa data halaman yang sudah terkumpul"""
+
+    def __init__(self, pesan, df, statistik):
+        super().__init__(pesan)
+        self.df = df
+        self.statistik = statistik
+
+
+async def ambil_halaman(sesi, url, pembatas, statistik, maks_percobaan=4, backoff=0.5):
+    """Teks halaman, atau None jika 404 (data habis). Error sementara diulang dengan backoff."""
+    for percobaan in range(1, maks_percobaan + 1):
+        await pembatas.tunggu()
+        statistik['request'] += 1
+        try:
+            async with sesi.get(url) as resp:
+                if resp.status == 404:
+                    return None
+                if resp.status not in STATUS_RETRY:
+                    resp.raise_for_status()
+                    return await resp.text()
+                alasan = f"HTTP {resp.status}"
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            alasan = type(e).__name__
+
+        if percobaan == maks_percobaan:
+            raise RuntimeError(f"Gagal mengambil {url} setelah {maks_percobaan} percobaan ({alasan})")
+        statistik['retry'] += 1
+        await asyncio.sleep(backoff * 2 ** (percobaan - 1) * random.uniform(0.5, 1.5))
+
+
+async def scrape_http_async(url_template, konkurensi=8, per_detik=5, halaman_awal=0, halaman_maks=1000,
+                            timeout=30, dir_rekam=None):
+    """Ambil semua halaman secara paralel; kembalikan (DataFrame, statistik)"""
+    pembatas = PembatasLaju(per_detik)
+    statistik = {'request': 0, 'retry': 0, 'halaman': 0}
+    hasil = {}
+    # Nomor halaman berikutnya & batas akhir dibagi antar pekerja (aman: satu event loop)
+    status = {'berikut': halaman_awal, 'batas': halaman_awal + halaman_maks}
+
+    connector = aiohttp.TCPConnector(limit=konkurensi, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT},
+                                     timeout=aiohttp.ClientTimeout(total=timeout)) as sesi:
+
+        async def pekerja():
+            # Setelah satu halaman gagal total, pekerja lain berhenti mengambil halaman baru
+            while status['berikut'] < status['batas'] and 'error' not in status:
+                n = status['berikut']
+                status['berikut'] += 1
+                try:
+                    html = await ambil_halaman(sesi, url_template.format(halaman=n), pembatas, statistik)
+                except RuntimeError as e:
+                    status.setdefault('error', e)
+                    return
+                data = ekstrak_html(html) if html is not None else []
+                if not data:
+                    status['batas'] = min(status['batas'], n)
+                    continue
+                hasil[n] = data
+                if dir_rekam:
+                    with open(os.path.join(dir_rekam, f"halaman_{n - halaman_awal:03d}.html"), 'w', encoding='utf-8') as f:
+                        f.write(html)
+
+        if dir_rekam:
+            os.makedirs(dir_rekam, exist_ok=True)
+        await asyncio.gather(*(pekerja() for _ in range(konkurensi)))
+
+    # Gabungkan sesuai urutan halaman; halaman setelah batas (diambil spekulatif) dibuang.
+    # Kartu identik tetap dipertahankan semua, seperti scrape_malang.py
+    baris = []
+    for n in sorted(hasil):
+        if n >= status['batas']:
+            continue
+        statistik['halaman'] += 1
+        baris.extend(hasil[n])
+    df = pd.DataFrame(baris, columns=KOLOM_DATA)
+    if 'error' in status:
+        raise ScrapeGagal(str(status['error']), df, statistik) from status['error']
+    return df, statistik
+
+
+def simpan_mentah(df, output_csv):
+    with METRIK.tahap('simpan_mentah', baris=len(df)):
+        df.to_csv(output_csv, index=False)
+        simpan_parquet(df, path_parquet(output_csv))
+
+
+def scrape_http(url_template, output_csv='data_kost_malang.csv', **kwargs):
+    print("=== MEMULAI SCRAPING HTTP ===")
+    mulai = time.perf_counter()
+    try:
+        with METRIK.tahap('ambil_halaman', konkurensi=kwargs.get('konkurensi')) as m:
+            df, statistik = asyncio.run(scrape_http_async(url_template, **kwargs))
+            m.update(baris=len(df), **statistik)
+    except ScrapeGagal as e:
+        # Halaman yang sudah terambil tetap disimpan sebelum error diteruskan
+        if len(e.df) > 0:
+            simpan_mentah(e.df, output_csv)
+            print(f"[PERINGATAN] Scraping terhenti: {e}. {len(e.df)} data dari {e.statistik['halaman']} "
+                  f"halaman yang sudah terambil disimpan di: {output_csv}")
+        raise
+    durasi = time.perf_counter() - mulai
+
+    if len(df) > 0:
+        simpan_mentah(df, output_csv)
+        print(f"SUKSES! {len(df)} data dari {statistik['halaman']} halaman disimpan di: {output_csv}")
+    else:
+        print("GAGAL: Tidak ada data yang tertangkap.")
+    print(f"Durasi {durasi:.2f} s | {statistik['request']} request ({statistik['retry']} retry) | "
+          f"{statistik['halaman'] / durasi:.1f} halaman/detik")
+    return df
+
+
+def benchmark(folder, latensi_ms=50.0, daftar_konkurensi=(1, 4, 16), gagal_setiap=None):
+    """Throughput terhadap server_replay lokal untuk beberapa tingkat konkurensi"""
+    print(f"=== BENCHMARK SCRAPER HTTP (replay '{folder}', latensi {latensi_ms:.0f} ms) ===")
+    server = server_replay.buat_server(folder, latensi_ms=latensi_ms, gagal_setiap=gagal_setiap)
+    url_template = server_replay.jalankan_di_thread(server)
+
+    hasil = []
+    try:
+        for konkurensi in daftar_konkurensi:
+            mulai = time.perf_counter()
+            df, statistik = asyncio.run(scrape_http_async(url_template, konkurensi=konkurensi, per_detik=None))
+            durasi = time.perf_counter() - mulai
+            hasil.append((konkurensi, durasi, statistik, len(df)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"\n{'Konkurensi':>10}{'Durasi (s)':>12}{'Halaman/s':>12}{'Baris/s':>10}{'Request':>9}{'Retry':>7}")
+    for konkurensi, durasi, statistik, n_baris in hasil:
+        print(f"{konkurensi:>10}{durasi:>12.2f}{statistik['halaman'] / durasi:>12.1f}"
+              f"{n_baris / durasi:>10,.0f}{statistik['request']:>9}{statistik['retry']:>7}")
+    return hasil
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping listing kost lewat HTTP async (tanpa browser)")
+    parser.add_argument('--url-template', help="URL per halaman yang mengembalikan HTML kartu kost, memakai {halaman} "
+                                               "(wajib kecuali --benchmark; pencarian Mamikos dirender di browser)")
+    parser.add_argument('-o', '--output', default='data_kost_malang.csv')
+    parser.add_argument('--konkurensi', type=int, default=8, help="Jumlah request/koneksi paralel")
+    parser.add_argument('--per-detik', type=float, default=5, help="Batas laju request per detik (0 = tanpa batas)")
+    parser.add_argument('--halaman-awal', type=int, default=0)
+    parser.add_argument('--halaman-maks', type=int, default=1000)
+    parser.add_argument('--rekam', metavar='FOLDER', help="Simpan respons mentah sebagai halaman_NNN.html")
+    parser.add_argument('--benchmark', metavar='FOLDER', help="Benchmark offline terhadap server_replay dari folder rekaman")
+    parser.add_argument('--latensi-ms', type=float, default=50.0, help="Latensi simulasi server replay saat benchmark")
+    parser.add_argument('--gagal-setiap', type=int, default=None, help="Saat benchmark: server menjawab 503 setiap request ke-n")
+    args = parser.parse_args()
+    if not args.benchmark and not args.url_template:
+        parser.error("--url-template wajib diisi (mis. http://127.0.0.1:8080/halaman/{halaman} dari server_replay.py)")
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.latensi_ms, gagal_setiap=args.gagal_setiap)
+    else:
+        scrape_http(args.url_template, args.output, konkurensi=args.konkurensi, per_detik=args.per_detik or None,
+                    halaman_awal=args.halaman_awal, halaman_maks=args.halaman_maks, dir_rekam=args.rekam)
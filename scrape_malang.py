@@ -1,120 +1,454 @@
+import os
+import json
 import time
+import random
+import argparse
+import threading
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from data_kost import path_parquet, simpan_parquet
+from instrumen import Instrumen
 
-def scrape_kost_malang():
+URL_MAMIKOS = "https://mamikos.com/cari/malang-kota-malang-jawa-timur-indonesia/all/bulanan/0-15000000/191?keyword=malang&suggestion_type=search&rent=2&sort=price,-&price=10000-20000000&singgahsini=0"
+
+# Setiap kartu yang baru diekstrak langsung ditambahkan ke file stream ini,
+# jadi data tidak hilang walaupun robot berhenti di tengah jalan.
+PATH_STREAM = 'data_kost_malang.jsonl'
+PATH_CHECKPOINT = 'scrape_checkpoint.json'
+KOLOM_DATA = ['Nama Kost', 'Jenis Kost', 'Harga Mentah', 'Fasilitas', 'Daerah', 'Lokasi']
+
+PATH_LATENSI = 'scrape_latensi.csv'
+
+# Waktu, CPU, memori puncak & jumlah baris per tahap -> hasil_evaluasi/metrik.jsonl
+METRIK = Instrumen('scrape_malang')
+
+JS_JUMLAH_KARTU = "return document.querySelectorAll('div.kost-rc').length;"
+
+# Ambil outerHTML kartu mulai indeks tertentu saja (kartu baru hasil "Lihat lagi")
+JS_KARTU_BARU = """
+return Array.from(document.querySelectorAll('div.kost-rc'))
+    .slice(arguments[0])
+    .map(function (el) { return el.outerHTML; });
+"""
+
+
+def ekstrak_kartu(card):
+    """Ambil data satu kartu kost (elemen BeautifulSoup div.kost-rc)"""
+    # Mengambil Nama
+    nama_elem = card.find('span', class_='rc-info__name bg-c-text bg-c-text--body-4')
+    nama = nama_elem.text.strip() if nama_elem else "Tanpa Nama"
+
+    # Mengambil Harga
+    harga_elem = card.find('span', class_='rc-price__text bg-c-text bg-c-text--body-1')
+    harga = harga_elem.text.strip() if harga_elem else "0"
+
+    # Mengambil Fasilitas
+    fasilitas_elem = card.find('div', class_='kost-rc__facilities')
+    fasilitas = fasilitas_elem.text.strip() if fasilitas_elem else "Tidak info"
+
+    # Mengambil Daerah
+    daerah_elem = card.find('span', class_='rc-info__location bg-c-text bg-c-text--body-3')
+    daerah = daerah_elem.text.strip() if daerah_elem else "Tidak Diketahui"
+
+    # Mengambil Jenis Kost
+    text_kartu = card.text.lower()
+    jenis_kost = "Tidak Diketahui"
+    if "putri" in text_kartu:
+        jenis_kost = "Putri"
+    elif "putra" in text_kartu:
+        jenis_kost = "Putra"
+    elif "campur" in text_kartu:
+        jenis_kost = "Campur"
+
+    return {
+        'Nama Kost': nama,
+        'Jenis Kost': jenis_kost,
+        'Harga Mentah': harga,
+        'Fasilitas': fasilitas,
+        'Daerah': daerah,
+        'Lokasi': 'Malang',
+    }
+
+
+def ekstrak_html(html):
+    """Ekstrak semua kartu dari potongan HTML (satu halaman penuh atau beberapa outerHTML kartu)"""
+    soup = BeautifulSoup(html, "html.parser")
+    data = []
+    for card in soup.find_all('div', class_='kost-rc'):
+        try:
+            data.append(ekstrak_kartu(card))
+        except Exception as e:
+            continue
+    return data
+
+
+class StreamListing:
+    """File JSONL append-only, satu baris per kartu (kartu identik tetap ditulis semua,
+    dedup baru dilakukan di clean_data.py --dedup jika diminta).
+
+    Saat resume, baris yang ditulis sesudah checkpoint terakhir (klik yang belum selesai)
+    dipotong, karena klik itu akan diparse ulang."""
+
+    def __init__(self, path=PATH_STREAM, lanjut=True, n_tersimpan=None):
+        self.path = path
+        self.n = 0
+        if lanjut and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                daftar = [baris for baris in f if baris.strip()]
+            if n_tersimpan is not None and len(daftar) > n_tersimpan:
+                daftar = daftar[:n_tersimpan]
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.writelines(daftar)
+            self.n = len(daftar)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def tambah(self, daftar):
+        """Tulis semua listing; kembalikan jumlah yang ditulis"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for data in daftar:
+                f.write(json.dumps(data, ensure_ascii=False) + '\n')
+        self.n += len(daftar)
+        return len(daftar)
+
+    def ke_dataframe(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=KOLOM_DATA)
+        return pd.read_json(self.path, lines=True, dtype=False)[KOLOM_DATA]
+
+
+def baca_checkpoint(path=PATH_CHECKPOINT):
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {'klik': -1}
+
+
+def tulis_checkpoint(data, path=PATH_CHECKPOINT):
+    # Tulis ke file sementara lalu rename supaya checkpoint tidak pernah setengah jadi
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+# =========================================================================
+# FIXTURE HTML: REKAM KARTU PER KLIK, PUTAR ULANG LEWAT SERVER LOKAL
+# =========================================================================
+# Saat scraping dengan --simpan-fixture, kartu baru setiap klik disimpan ke
+# halaman_000.html, halaman_001.html, dst. index.html meniru tombol
+# "Lihat lagi": setiap klik memuat halaman berikutnya lewat fetch() lalu
+# menambahkannya ke daftar. Folder ini bisa dilayani dengan --fixture
+# sehingga scraper bisa diuji tanpa menyentuh mamikos.com.
+
+INDEX_FIXTURE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Fixture kost</title></head>
+<body>
+<div id="daftar"></div>
+<button id="lihat-lagi" onclick="muat()">Lihat lagi</button>
+<script>
+var halaman = 0;
+function muat() {
+    var nama = 'halaman_' + String(halaman).padStart(3, '0') + '.html';
+    fetch(nama).then(function (r) {
+        if (!r.ok) { document.getElementById('lihat-lagi').remove(); return; }
+        return r.text().then(function (html) {
+            document.getElementById('daftar').insertAdjacentHTML('beforeend', html);
+            halaman += 1;
+        });
+    });
+}
+muat();
+</script>
+</body></html>
+"""
+
+
+def simpan_fixture(folder, klik, html_kartu):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f"halaman_{klik:03d}.html"), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(html_kartu))
+    path_index = os.path.join(folder, 'index.html')
+    if not os.path.exists(path_index):
+        with open(path_index, 'w', encoding='utf-8') as f:
+            f.write(INDEX_FIXTURE)
+
+
+def layani_fixture(folder, port=0):
+    """Jalankan http.server untuk folder fixture di thread terpisah; kembalikan (server, url)"""
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class HandlerSenyap(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(HandlerSenyap, directory=folder))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+
+# =========================================================================
+# LAPISAN DRIVER: CHROME (SELENIUM) ATAU FIXTURE TANPA BROWSER
+# =========================================================================
+# Loop scraping hanya memakai method di bawah ini, jadi driver bisa diganti
+# dengan apa saja yang punya method yang sama (mis. DriverFixture).
+
+class DriverSelenium:
+    def __init__(self, driver=None):
+        if driver is None:
+            options = webdriver.ChromeOptions()
+            options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        self.driver = driver
+
+    def buka(self, url):
+        self.driver.get(url)
+
+    def jumlah_kartu(self):
+        return self.driver.execute_script(JS_JUMLAH_KARTU)
+
+    def kartu_sejak(self, n):
+        return self.driver.execute_script(JS_KARTU_BARU, n)
+
+    def cari_tombol(self):
+        """Scroll ke bawah lalu cari tombol "Lihat lagi"; None jika belum/tidak ada"""
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        tombol = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Lihat')]")
+        return tombol[0] if tombol else None
+
+    def klik(self, tombol):
+        self.driver.execute_script("arguments[0].click();", tombol)
+
+    def tombol_basi(self, tombol):
+        """True jika tombol sudah dilepas dari DOM (halaman me-render ulang daftar)"""
+        try:
+            tombol.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+
+    def tutup(self):
+        self.driver.quit()
+
+
+class DriverFixture:
+    """Driver palsu dari folder fixture (--simpan-fixture) dengan jeda muat acak, tanpa browser"""
+
+    def __init__(self, folder, jeda_min=0.2, jeda_maks=1.0, seed=42):
+        self.halaman = []
+        for nama in sorted(os.listdir(folder)):
+            if nama.startswith('halaman_') and nama.endswith('.html'):
+                with open(os.path.join(folder, nama), encoding='utf-8') as f:
+                    soup = BeautifulSoup(f.read(), "html.parser")
+                self.halaman.append([str(card) for card in soup.find_all('div', class_='kost-rc')])
+        self.jeda_min, self.jeda_maks = jeda_min, jeda_maks
+        self.rng = random.Random(seed)
+        self.kartu = []
+        self.dimuat = 0
+        self.tombol = None
+        self.kunci = threading.Lock()
+
+    def _muat_berikutnya(self):
+        # Seperti halaman asli: kartu baru muncul setelah jeda, tombol lama diganti yang baru
+        def selesai():
+            with self.kunci:
+                self.kartu.extend(self.halaman[self.dimuat])
+                self.dimuat += 1
+                self.tombol = object() if self.dimuat < len(self.halaman) else None
+        threading.Timer(self.rng.uniform(self.jeda_min, self.jeda_maks), selesai).start()
+
+    def buka(self, url):
+        if self.halaman:
+            self._muat_berikutnya()
+
+    def jumlah_kartu(self):
+        with self.kunci:
+            return len(self.kartu)
+
+    def kartu_sejak(self, n):
+        with self.kunci:
+            return self.kartu[n:]
+
+    def cari_tombol(self):
+        with self.kunci:
+            return self.tombol
+
+    def klik(self, tombol):
+        self._muat_berikutnya()
+
+    def tombol_basi(self, tombol):
+        with self.kunci:
+            return tombol is not self.tombol
+
+    def tutup(self):
+        pass
+
+
+# =========================================================================
+# MENUNGGU BERBASIS KONDISI (PENGGANTI time.sleep TETAP)
+# =========================================================================
+
+def tunggu(kondisi, timeout, interval=0.05, interval_maks=1.0, faktor=1.6):
+    """Poll kondisi() dengan interval yang makin panjang sampai bernilai benar atau timeout habis.
+    Mengembalikan hasil kondisi() terakhir."""
+    batas = time.perf_counter() + timeout
+    while True:
+        hasil = kondisi()
+        sisa = batas - time.perf_counter()
+        if hasil or sisa <= 0:
+            return hasil
+        time.sleep(min(interval, sisa))
+        interval = min(interval * faktor, interval_maks)
+
+
+def klik_lihat_lagi(driver, timeout_tombol=10, timeout_muat=15, maks_percobaan=3):
+    """Klik "Lihat lagi" lalu tunggu sampai jumlah kartu bertambah atau tombol lama basi.
+    Jika tidak ada perubahan, klik diulang dengan timeout dua kali lipat.
+    Mengembalikan (latensi_detik, percobaan) atau None jika tombol tidak ada / halaman macet."""
+    tombol = tunggu(driver.cari_tombol, timeout_tombol)
+    if tombol is None:
+        return None
+
+    n_sebelum = driver.jumlah_kartu()
+    for percobaan in range(1, maks_percobaan + 1):
+        mulai = time.perf_counter()
+        driver.klik(tombol)
+        berubah = tunggu(lambda: driver.jumlah_kartu() > n_sebelum or driver.tombol_basi(tombol), timeout_muat)
+        if berubah:
+            return time.perf_counter() - mulai, percobaan
+        timeout_muat *= 2
+    return None
+
+
+def simpan_latensi(latensi, path=PATH_LATENSI):
+    """Tulis latensi per klik ke CSV dan cetak ringkasannya"""
+    if not latensi:
+        return
+    df = pd.DataFrame(latensi)
+    df.to_csv(path, index=False)
+    detik = df['latensi_detik']
+    print(f"\nLatensi muat per klik ({len(df)} klik, tersimpan di {path}):")
+    print(f"   p50 {detik.quantile(0.5):.2f} s | p90 {detik.quantile(0.9):.2f} s | maks {detik.max():.2f} s")
+    print(f"   Total menunggu {detik.sum():.0f} s (sleep tetap lama: {len(df) * 5} s)")
+
+
+@METRIK.bungkus('total')
+def scrape_kost_malang(url=URL_MAMIKOS, driver=None, max_clicks=300, lanjut=True, dir_fixture=None,
+                       timeout_muat=15, path_stream=PATH_STREAM, path_checkpoint=PATH_CHECKPOINT,
+                       output_csv='data_kost_malang.csv'):
     print("=== MEMULAI ROBOT SCRAPING ===")
-    
-    # 1. Setup Chrome Driver
-    options = webdriver.ChromeOptions()
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
+
+    # 1. Setup Driver (default Chrome; bisa diganti DriverFixture atau driver lain)
+    tutup_driver = driver is None
+    if driver is None:
+        driver = DriverSelenium()
+
+    # Resume hanya jika run sebelumnya terputus. Run yang selesai normal menghapus checkpoint-nya,
+    # jadi scrape berikutnya membaca ulang semua kartu (harga terbaru, listing yang hilang ikut hilang)
+    lanjut = lanjut and os.path.exists(path_checkpoint)
+    checkpoint = baca_checkpoint(path_checkpoint) if lanjut else {'klik': -1}
+    stream = StreamListing(path_stream, lanjut=lanjut, n_tersimpan=checkpoint.get('n_listing'))
+    if stream.n:
+        print(f"Melanjutkan: {stream.n} listing sudah tersimpan, checkpoint di klik ke-{checkpoint['klik']}.")
+
     # 2. Target URL
-    url = "https://mamikos.com/cari/malang-kota-malang-jawa-timur-indonesia/all/bulanan/0-15000000/191?keyword=malang&suggestion_type=search&rent=2&sort=price,-&price=10000-20000000&singgahsini=0" 
     print(f"Sedang membuka: {url}...")
-    driver.get(url)
-    
+    driver.buka(url)
+
     # =========================================================================
-    # 3. LOGIKA BARU: KLIK TOMBOL "LIHAT LAGI"
+    # 3. KLIK "LIHAT LAGI" + EKSTRAK KARTU BARU SETIAP KALI
     # =========================================================================
+    # Hanya kartu yang baru muncul setelah klik yang diparse, lalu langsung
+    # ditulis ke stream. Kartu lama tidak perlu diparse ulang dari page_source.
+    # Tidak ada sleep tetap: setiap klik menunggu sampai kartu benar-benar
+    # bertambah (atau tombol lama basi), lalu langsung lanjut.
     print("Sedang memuat data... Robot akan mencoba mengklik tombol 'Lihat lagi' beberapa kali.")
-    
-    # Tentukan mau berapa kali klik tombol "Lihat Lagi"?
-    # Semakin banyak, semakin lama, tapi data semakin banyak.
-    MAX_CLICKS = 300
-    
-    for i in range(MAX_CLICKS):
-        try:
-            # Scroll ke bawah dulu agar tombolnya terlihat
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2) 
-
-            # Cari tombol yang mengandung kata "Lihat" (Lihat lagi / Lihat lebih banyak)
-            tombol_load_more = driver.find_element(By.XPATH, "//*[contains(text(), 'Lihat')]")
-            
-            # KLIK TOMBOLNYA
-            driver.execute_script("arguments[0].click();", tombol_load_more)
-            
-            print(f"Berhasil klik 'Lihat lagi' ke-{i+1}...")
-            time.sleep(3) # Tunggu data baru loading
-            
-        except Exception as e:
-            print("Tombol 'Lihat lagi' tidak ditemukan atau data sudah habis. Berhenti loading.")
-            break
-    
-    # =========================================================================
+    if not tunggu(driver.jumlah_kartu, timeout_muat):
+        print("Peringatan: belum ada kartu kost setelah halaman dibuka.")
 
-    # 4. Ambil Source Code HTML
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    
-    # 5. Ekstrak Data
-    # NOTE: Pastikan class ini masih valid saat Anda jalankan.
-    kost_cards = soup.find_all('div', class_='kost-rc') 
-    
-    data_kost = []
-    print(f"\nSelesai loading! Ditemukan total {len(kost_cards)} slot kartu kost.")
-    print("Sedang mengekstrak data...")
-
-    for card in kost_cards:
+    # Checkpoint menyimpan klik terakhir yang kartunya sudah selesai ditulis.
+    # Saat resume, klik sebelum itu hanya di-replay (kartunya dihitung, tidak diparse).
+    klik_selesai = checkpoint['klik']
+    n_kartu = 0
+    latensi = []
+    with METRIK.tahap('klik_dan_ekstrak', lanjut_dari_klik=klik_selesai) as m:
         try:
-            # Mengambil Nama
-            nama_elem = card.find('span', class_='rc-info__name bg-c-text bg-c-text--body-4')
-            nama = nama_elem.text.strip() if nama_elem else "Tanpa Nama"
-            
-            # Mengambil Harga
-            harga_elem = card.find('span', class_='rc-price__text bg-c-text bg-c-text--body-1')
-            harga = harga_elem.text.strip() if harga_elem else "0"
-            
-            # Mengambil Fasilitas
-            fasilitas_elem = card.find('div', class_='kost-rc__facilities')
-            fasilitas = fasilitas_elem.text.strip() if fasilitas_elem else "Tidak info"
-
-            # Mengambil Daerah
-            daerah_elem = card.find('span', class_='rc-info__location bg-c-text bg-c-text--body-3')
-            daerah = daerah_elem.text.strip() if daerah_elem else "Tidak Diketahui"
-
-            # Mengambil Jenis Kost
-            text_kartu = card.text.lower()
-            jenis_kost = "Tidak Diketahui"
-            if "putri" in text_kartu:
-                jenis_kost = "Putri"
-            elif "putra" in text_kartu:
-                jenis_kost = "Putra"
-            elif "campur" in text_kartu:
-                jenis_kost = "Campur"
-
-            data_kost.append({
-                'Nama Kost': nama,
-                'Jenis Kost': jenis_kost,
-                'Harga Mentah': harga,
-                'Fasilitas': fasilitas,
-                'Daerah': daerah,
-                'Lokasi': 'Malang',
-            })
-            
-        except Exception as e:
-            continue
+            for i in range(max_clicks + 1):
+                if i > klik_selesai:
+                    html_baru = driver.kartu_sejak(n_kartu)
+                    n_kartu += len(html_baru)
+                    baru = stream.tambah(ekstrak_html(''.join(html_baru)))
+                    if dir_fixture:
+                        simpan_fixture(dir_fixture, i, html_baru)
+                    tulis_checkpoint({'klik': i, 'n_kartu': n_kartu, 'n_listing': stream.n}, path_checkpoint)
+                    print(f"Klik ke-{i}: {len(html_baru)} kartu baru, {baru} listing (total {stream.n})")
+                else:
+                    n_kartu = driver.jumlah_kartu()
+
+                if i == max_clicks:
+                    break
+                hasil = klik_lihat_lagi(driver, timeout_muat=timeout_muat)
+                if hasil is None:
+                    print("Tombol 'Lihat lagi' tidak ditemukan atau data sudah habis. Berhenti loading.")
+                    break
+                detik, percobaan = hasil
+                latensi.append({'klik': i + 1, 'latensi_detik': round(detik, 4), 'percobaan': percobaan})
+        finally:
+            # 4. Tutup Browser
+            if tutup_driver:
+                driver.tutup()
+        m.update(klik=len(latensi), kartu=n_kartu, baris=stream.n)
 
-    # 6. Tutup Browser
-    driver.quit()
-    
-    # 7. Simpan ke CSV
-    if len(data_kost) > 0:
-        df = pd.DataFrame(data_kost)
-        df.to_csv('data_kost_malang.csv', index=False)
+    simpan_latensi(latensi)
+
+    # 5. Simpan ke CSV (format lama, dipakai clean_data.py)
+    df = stream.ke_dataframe()
+    if len(df) > 0:
+        with METRIK.tahap('simpan_mentah', baris=len(df)):
+            df.to_csv(output_csv, index=False)
+            simpan_parquet(df, path_parquet(output_csv))
         print("\n==================================================")
-        print(f"SUKSES! {len(data_kost)} data berhasil disimpan.")
-        print("File tersimpan di: data_kost_malang.csv")
+        print(f"SUKSES! {len(df)} data berhasil disimpan.")
+        print(f"File tersimpan di: {output_csv} (stream: {path_stream})")
         print("==================================================")
         print(df.head())
     else:
         print("\nGAGAL: Tidak ada data yang tertangkap.")
 
+    # Selesai normal (tombol habis / max_clicks): run berikutnya mulai dari nol, bukan resume
+    if os.path.exists(path_checkpoint):
+        os.remove(path_checkpoint)
+    return df
+
+
 if __name__ == "__main__":
-    scrape_kost_malang()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scraping listing kost Malang dari Mamikos")
+    parser.add_argument('--url', default=URL_MAMIKOS, help="URL hasil pencarian")
+    parser.add_argument('-o', '--output', default='data_kost_malang.csv', help="CSV hasil (Parquet ditulis di sampingnya)")
+    parser.add_argument('--max-clicks', type=int, default=300, help="Maksimal klik 'Lihat lagi'")
+    parser.add_argument('--ulang', action='store_true', help="Abaikan stream & checkpoint run yang terputus, mulai dari nol")
+    parser.add_argument('--timeout-muat', type=float, default=15, help="Batas tunggu kartu baru per klik (detik)")
+    parser.add_argument('--simpan-fixture', metavar='FOLDER', help="Rekam kartu setiap klik sebagai fixture HTML")
+    parser.add_argument('--fixture', metavar='FOLDER', help="Scrape folder fixture lewat server lokal, bukan mamikos.com")
+    parser.add_argument('--tanpa-browser', action='store_true',
+                        help="Bersama --fixture: pakai DriverFixture (tanpa Chrome) dengan jeda muat simulasi")
+    parser.add_argument('--jeda', type=float, nargs=2, default=[0.2, 1.0], metavar=('MIN', 'MAKS'),
+                        help="Rentang jeda muat simulasi DriverFixture (detik)")
+    args = parser.parse_args()
+
+    url, driver = args.url, None
+    if args.fixture and args.tanpa_browser:
+        driver = DriverFixture(args.fixture, *args.jeda)
+        url = args.fixture
+    elif args.fixture:
+        server, url = layani_fixture(args.fixture)
+        print(f"Melayani fixture '{args.fixture}' di {url}")
+
+    scrape_kost_malang(url=url, driver=driver, max_clicks=args.max_clicks, lanjut=not args.ulang,
+                       dir_fixture=args.simpan_fixture, timeout_muat=args.timeout_muat, output_csv=args.output)
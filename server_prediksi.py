@@ -0,0 +1,168 @@
+import json
+import time
+import queue
+import argparse
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from artefak_kost import muat_artefak, nama_kuantil
+from forest_flat import KUANTIL_INTERVAL
+
+# ==============================================================================
+# SERVER PREDIKSI: HTTP JSON TANPA STREAMLIT, DENGAN MICRO-BATCHING
+# ==============================================================================
+# Request yang datang hampir bersamaan dikumpulkan dalam jendela waktu kecil
+# lalu diprediksi dengan SATU panggilan model.predict. Biaya traversal forest
+# per panggilan jadi dibagi ke banyak request.
+#
+# Endpoint:
+#   GET  /health         -> {"status": "ok"}
+#   POST /predict        -> {"kecamatan": "Lowokwaru", "jenis": "Putri", "fasilitas": ["AC", "WiFi"]}
+#   POST /predict_batch  -> {"listing": [{...}, {...}]}
+# Tambahkan "interval": true di body untuk ikut mendapat rentang p10/p50/p90 (hanya model forest
+# yang dikalibrasi saat training; selain itu 400).
+
+
+class MicroBatcher:
+    """Antrian request -> satu thread pekerja yang memprediksi per kelompok"""
+
+    def __init__(self, model, jendela_ms=2.0, batch_maks=256):
+        self.model = model
+        self.jendela = jendela_ms / 1000
+        self.batch_maks = batch_maks
+        self.antrian = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def prediksi(self, X):
+        hasil = Future()
+        self.antrian.put((X, hasil))
+        return hasil.result()
+
+    def _loop(self):
+        while True:
+            kumpulan = [self.antrian.get()]
+            batas = time.perf_counter() + self.jendela
+
+            # Kumpulkan request lain yang datang selama jendela waktu masih terbuka
+            while len(kumpulan) < self.batch_maks:
+                sisa = batas - time.perf_counter()
+                if sisa <= 0:
+                    break
+                try:
+                    kumpulan.append(self.antrian.get(timeout=sisa))
+                except queue.Empty:
+                    break
+
+            try:
+                y = self.model.predict(np.vstack([X for X, _ in kumpulan]))
+            except Exception as e:
+                for _, hasil in kumpulan:
+                    hasil.set_exception(e)
+                continue
+
+            posisi = 0
+            for X, hasil in kumpulan:
+                hasil.set_result(y[posisi:posisi + len(X)])
+                posisi += len(X)
+
+
+class HandlerPrediksi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Log per request dimatikan supaya tidak membebani uji beban
+        pass
+
+    def kirim_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.kirim_json(200, {'status': 'ok', 'batching': self.server.batcher is not None})
+        else:
+            self.kirim_json(404, {'error': 'Endpoint tidak ditemukan'})
+
+    def do_POST(self):
+        try:
+            panjang = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(panjang) or b'{}')
+            if not isinstance(data, dict):
+                raise ValueError(f"Body JSON harus berupa object, bukan {type(data).__name__}")
+
+            if self.path == '/predict' and data.get('interval'):
+                # Prediksi + kuantil per pohon dari satu traversal; tidak lewat micro-batcher
+                hasil = self.server.artefak.prediksi_interval(data)
+                self.kirim_json(200, {nama: int(round(v)) for nama, v in hasil.items()})
+
+            elif self.path == '/predict':
+                X = self.server.artefak.encoder.encode(data)
+                if self.server.batcher is not None:
+                    y = self.server.batcher.prediksi(X)
+                else:
+                    y = self.server.artefak.predict(X)
+                self.kirim_json(200, {'prediksi': int(round(y[0]))})
+
+            elif self.path == '/predict_batch':
+                listing = data.get('listing', [])
+                if not isinstance(listing, list):
+                    raise ValueError(f"Field 'listing' harus berupa list object, bukan {type(listing).__name__}")
+                if not listing:
+                    raise ValueError("Field 'listing' kosong")
+                if data.get('interval'):
+                    X = np.vstack([self.server.artefak.encoder.encode(l) for l in listing])
+                    y, Q = self.server.artefak.interval(X)
+                    rentang = {nama: [int(round(v)) for v in Q[:, i]]
+                               for i, nama in enumerate(nama_kuantil(KUANTIL_INTERVAL))}
+                    self.kirim_json(200, {'prediksi': [int(round(v)) for v in y], **rentang})
+                else:
+                    y = self.server.artefak.prediksi_banyak(listing)
+                    self.kirim_json(200, {'prediksi': [int(round(v)) for v in y]})
+
+            else:
+                self.kirim_json(404, {'error': 'Endpoint tidak ditemukan'})
+
+        except ValueError as e:
+            # Input tidak valid (termasuk JSON rusak: JSONDecodeError turunan ValueError)
+            self.kirim_json(400, {'error': str(e)})
+        except Exception as e:
+            self.kirim_json(500, {'error': str(e)})
+
+
+class ServerPrediksi(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog default (5) terlalu kecil; koneksi paralel akan di-reset saat beban tinggi
+    request_queue_size = 1024
+
+
+def buat_server(host='127.0.0.1', port=8000, batching=True, jendela_ms=2.0, batch_maks=256):
+    # Encoder + model dari satu artefak: validasi & encode JSON memakai kategori hasil training
+    artefak = muat_artefak()
+
+    server = ServerPrediksi((host, port), HandlerPrediksi)
+    server.artefak = artefak
+    server.batcher = MicroBatcher(artefak, jendela_ms, batch_maks) if batching else None
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server HTTP JSON untuk prediksi harga kost")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--tanpa-batching', action='store_true', help="Prediksi setiap request sendiri-sendiri")
+    parser.add_argument('--jendela-ms', type=float, default=2.0, help="Lama jendela pengumpulan batch (ms)")
+    parser.add_argument('--batch-maks', type=int, default=256, help="Ukuran batch maksimum")
+    args = parser.parse_args()
+
+    server = buat_server(args.host, args.port, not args.tanpa_batching, args.jendela_ms, args.batch_maks)
+    mode = "tanpa batching" if args.tanpa_batching else f"micro-batching {args.jendela_ms} ms"
+    print(f"Server prediksi jalan di http://{args.host}:{args.port} ({mode})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,102 @@
+import os
+import re
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ==============================================================================
+# SERVER REPLAY: PENGGANTI MAMIKOS UNTUK BENCHMARK SCRAPER SECARA OFFLINE
+# ==============================================================================
+# Melayani respons yang sudah direkam (halaman_000.html, halaman_001.html, ...
+# hasil scrape_malang.py --simpan-fixture atau scrape_http.py --rekam) di
+#   GET /halaman/<n>
+# Halaman yang tidak ada dijawab 404 (= data habis). Latensi jaringan dan
+# error sementara bisa disimulasikan supaya retry/backoff ikut teruji.
+
+
+def muat_rekaman(folder):
+    """{nomor_halaman: bytes} dari semua halaman_NNN.html di folder"""
+    rekaman = {}
+    for nama in os.listdir(folder):
+        cocok = re.fullmatch(r'halaman_(\d+)\.html', nama)
+        if cocok:
+            with open(os.path.join(folder, nama), 'rb') as f:
+                rekaman[int(cocok.group(1))] = f.read()
+    return rekaman
+
+
+class HandlerReplay(BaseHTTPRequestHandler):
+    # HTTP/1.1 supaya koneksi keep-alive dari klien bisa dipakai ulang
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def kirim(self, status, body, tipe='text/html; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', tipe)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        cocok = re.fullmatch(r'/halaman/(\d+)', self.path.split('?')[0])
+        if not cocok:
+            self.kirim(404, b'Tidak ditemukan')
+            return
+
+        server = self.server
+        if server.latensi > 0:
+            time.sleep(server.latensi)
+        with server.kunci:
+            server.n_request += 1
+            gagal = server.gagal_setiap and server.n_request % server.gagal_setiap == 0
+        if gagal:
+            self.kirim(503, b'Coba lagi nanti')
+            return
+
+        body = server.rekaman.get(int(cocok.group(1)))
+        if body is None:
+            self.kirim(404, b'Halaman habis')
+        else:
+            self.kirim(200, body)
+
+
+class ServerReplay(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def buat_server(folder, host='127.0.0.1', port=0, latensi_ms=0.0, gagal_setiap=None):
+    """gagal_setiap=n: setiap request ke-n dijawab 503 (menguji retry klien)"""
+    server = ServerReplay((host, port), HandlerReplay)
+    server.rekaman = muat_rekaman(folder)
+    server.latensi = latensi_ms / 1000
+    server.gagal_setiap = gagal_setiap
+    server.n_request = 0
+    server.kunci = threading.Lock()
+    return server
+
+
+def jalankan_di_thread(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/halaman/{{halaman}}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server replay halaman listing yang sudah direkam")
+    parser.add_argument('folder', help="Folder berisi halaman_NNN.html")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latensi-ms', type=float, default=0.0, help="Jeda simulasi per request (ms)")
+    parser.add_argument('--gagal-setiap', type=int, default=None, help="Jawab 503 setiap request ke-n")
+    args = parser.parse_args()
+
+    server = buat_server(args.folder, args.host, args.port, args.latensi_ms, args.gagal_setiap)
+    print(f"Replay {len(server.rekaman)} halaman di http://{args.host}:{args.port}/halaman/<n>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,132 @@
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from clean_data import KOLOM_MENTAH, bersihkan_data, clean_harga
+from data_kost import PenulisParquet, muat_mentah
+
+# ==============================================================================
+# DATA SINTETIS: LISTING MENTAH DENGAN SKEMA & DISTRIBUSI SEPERTI DATA ASLI
+# ==============================================================================
+# Untuk uji skala (100k - 10M baris) tanpa scraping. Setiap baris sintetis:
+# - (Jenis Kost, Daerah, Fasilitas) diambil bersama dari satu baris asli acak,
+#   jadi proporsi jenis/kecamatan dan ko-okurensi fasilitas (termasuk
+#   hubungannya dengan kecamatan & jenis) sama dengan data asli
+# - harga = harga baris asli yang sama x lognormal(0, sigma), dibulatkan ke
+#   Rp5.000; harga < 100.000 (yang dibuang clean_data.py) dibiarkan apa adanya
+#   supaya porsi baris yang dibuang juga sama
+# - Nama Kost dibuat unik ("Kost Sintetis <n>"), format teks persis seperti
+#   hasil scrape sehingga bisa langsung diproses clean_data.py
+# File besar ditulis per chunk (memori konstan).
+
+SIGMA_HARGA = 0.08
+BULAT_HARGA = 5000
+
+
+def profil_data(df_mentah=None):
+    """Array yang dibutuhkan generator, diambil dari data mentah asli"""
+    df = muat_mentah() if df_mentah is None else df_mentah
+    return {
+        'jenis': df['Jenis Kost'].to_numpy(dtype=object),
+        'daerah': df['Daerah'].to_numpy(dtype=object),
+        'fasilitas': df['Fasilitas'].to_numpy(dtype=object),
+        'lokasi': df['Lokasi'].to_numpy(dtype=object),
+        'harga_mentah': df['Harga Mentah'].to_numpy(dtype=object),
+        'harga': df['Harga Mentah'].map(clean_harga).to_numpy(np.int64),
+    }
+
+
+def format_harga(harga):
+    """Rp1.350.000 seperti teks kartu Mamikos; diformat per nilai unik supaya cepat di 10M baris"""
+    unik, balik = np.unique(harga, return_inverse=True)
+    teks = np.array([f"Rp{h:,}".replace(',', '.') for h in unik], dtype=object)
+    return teks[balik]
+
+
+def buat_sintetis(profil, n, rng, mulai=0, sigma=SIGMA_HARGA):
+    """DataFrame n baris mentah sintetis (kolom KOLOM_MENTAH); mulai = nomor nama kost pertama"""
+    i = rng.integers(0, len(profil['harga']), n)
+    harga = profil['harga'][i]
+    valid = harga >= 100000
+
+    jitter = np.exp(rng.normal(0, sigma, n))
+    harga_baru = np.maximum(np.round(harga * jitter / BULAT_HARGA) * BULAT_HARGA, 100000).astype(np.int64)
+    harga_mentah = profil['harga_mentah'][i].copy()
+    harga_mentah[valid] = format_harga(harga_baru[valid])
+
+    nama = 'Kost Sintetis ' + pd.Series(np.arange(mulai, mulai + n)).astype(str)
+    return pd.DataFrame({
+        'Nama Kost': nama.to_numpy(dtype=object),
+        'Jenis Kost': profil['jenis'][i],
+        'Harga Mentah': harga_mentah,
+        'Fasilitas': profil['fasilitas'][i],
+        'Daerah': profil['daerah'][i],
+        'Lokasi': profil['lokasi'][i],
+    }, columns=KOLOM_MENTAH)
+
+
+def tulis_sintetis(path, n, seed=42, chunksize=1_000_000, profil=None, sigma=SIGMA_HARGA):
+    """Tulis n baris sintetis ke .csv atau .parquet per chunk"""
+    profil = profil or profil_data()
+    rng = np.random.default_rng(seed)
+    penulis = PenulisParquet(path) if path.endswith('.parquet') else None
+    for mulai in range(0, n, chunksize):
+        df = buat_sintetis(profil, min(chunksize, n - mulai), rng, mulai, sigma)
+        if penulis:
+            penulis.tulis(df)
+        else:
+            df.to_csv(path, mode='w' if mulai == 0 else 'a', header=(mulai == 0), index=False)
+    if penulis:
+        penulis.tutup()
+    return path
+
+
+def bandingkan_distribusi(df_asli, df_sintetis):
+    """Ringkasan marginal & ko-okurensi data asli vs sintetis (setelah dibersihkan)"""
+    asli, sintetis = bersihkan_data(df_asli), bersihkan_data(df_sintetis)
+    print(f"Baris lolos clean    : asli {len(asli) / len(df_asli):.1%}, sintetis {len(sintetis) / len(df_sintetis):.1%}")
+
+    q = [0.1, 0.25, 0.5, 0.75, 0.9]
+    print(f"\n{'Kuantil harga':<15}{'Asli':>14}{'Sintetis':>14}")
+    for k, a, s in zip(q, asli['Harga_Angka'].quantile(q), sintetis['Harga_Angka'].quantile(q)):
+        print(f"{f'p{int(k * 100)}':<15}{int(a):>14,}{int(s):>14,}")
+
+    for kolom in ['Jenis Kost', 'Daerah_Clean']:
+        pa_ = asli[kolom].value_counts(normalize=True)
+        ps = sintetis[kolom].value_counts(normalize=True).reindex(pa_.index, fill_value=0)
+        print(f"\n{kolom}: selisih proporsi maks {np.abs(pa_ - ps).max():.4f} ({len(pa_)} kategori)")
+
+    fasilitas = [k for k in asli.columns if k.startswith('Fasilitas_')]
+    fa, fs = asli[fasilitas].to_numpy(np.float64), sintetis[fasilitas].to_numpy(np.float64)
+    print(f"\n{'Fasilitas':<28}{'Asli':>8}{'Sintetis':>10}")
+    for j, nama in enumerate(fasilitas):
+        print(f"{nama:<28}{fa[:, j].mean():>8.3f}{fs[:, j].mean():>10.3f}")
+    # Ko-okurensi: P(fasilitas a & b) untuk semua pasangan
+    ko_asli, ko_sintetis = fa.T @ fa / len(fa), fs.T @ fs / len(fs)
+    print(f"Ko-okurensi pasangan fasilitas: selisih maks {np.abs(ko_asli - ko_sintetis).max():.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buat data listing mentah sintetis untuk uji skala")
+    parser.add_argument('-n', '--jumlah', type=int, default=100_000, help="Jumlah baris")
+    parser.add_argument('-o', '--output', default=None, help="File .csv/.parquet (default data_sintetis_<n>.csv)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sigma', type=float, default=SIGMA_HARGA, help="Sebaran jitter harga (lognormal)")
+    parser.add_argument('--chunksize', type=int, default=1_000_000)
+    parser.add_argument('--cek', action='store_true', help="Bandingkan distribusi dengan data asli")
+    args = parser.parse_args()
+
+    output = args.output or f"data_sintetis_{args.jumlah}.csv"
+    df_asli = muat_mentah()
+    profil = profil_data(df_asli)
+
+    mulai = time.perf_counter()
+    tulis_sintetis(output, args.jumlah, args.seed, args.chunksize, profil, args.sigma)
+    durasi = time.perf_counter() - mulai
+    print(f"{args.jumlah:,} baris sintetis -> {output} ({durasi:.2f} s, "
+          f"{os.path.getsize(output) / 1024 / 1024:.1f} MB)")
+
+    if args.cek:
+        n_cek = min(args.jumlah, 1_000_000)
+        bandingkan_distribusi(df_asli, buat_sintetis(profil, n_cek, np.random.default_rng(args.seed), sigma=args.sigma))
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import joblib
+from fitur_kost import JENIS_KOST, kolom_fasilitas, opsi_lokasi
+from forest_flat import KUANTIL_INTERVAL
+from artefak_kost import muat_artefak, nama_kuantil
+
+# ==============================================================================
+# TABEL HARGA: SEMUA KOMBINASI INPUT APP SUDAH DIHITUNG DI AWAL
+# ==============================================================================
+# Input di app.py terbatas: kecamatan x jenis kost x 6 checkbox fasilitas.
+# Daripada menjalankan model untuk setiap klik, kita hitung sekali semua
+# kombinasinya saat training, lalu app tinggal mengambil dari array.
+
+PATH_TABEL = 'tabel_harga.pkl'
+# 2^n kombinasi fasilitas; di atas ini tabel terlalu besar dan app cukup pakai model.predict
+MAKS_FASILITAS_TABEL = 10
+
+
+def buat_tabel_harga(model, fitur, artefak=None):
+    """Skor semua kombinasi (kecamatan, jenis, bitmask fasilitas) dengan satu panggilan predict.
+    Jika artefak (ModelKost) forest dengan rentang terkalibrasi diberikan, P10/P50/P90-nya ikut dihitung.
+    Mengembalikan None jika jumlah fasilitas melebihi MAKS_FASILITAS_TABEL."""
+    fitur = list(fitur)
+    fasilitas = kolom_fasilitas(fitur)
+    if len(fasilitas) > MAKS_FASILITAS_TABEL:
+        return None
+    lokasi = opsi_lokasi(fitur)
+    n_mask = 1 << len(fasilitas)
+    posisi = {nama: i for i, nama in enumerate(fitur)}
+
+    # Urutan baris: lokasi -> jenis -> bitmask (C-order), jadi bisa langsung di-reshape
+    idx_lokasi, idx_jenis, mask = np.meshgrid(
+        np.arange(len(lokasi)), np.arange(len(JENIS_KOST)), np.arange(n_mask), indexing='ij'
+    )
+    idx_lokasi, idx_jenis, mask = idx_lokasi.ravel(), idx_jenis.ravel(), mask.ravel()
+    baris = np.arange(len(mask))
+
+    X = np.zeros((len(mask), len(fitur)), dtype=np.float64)
+    for bit, nama in enumerate(fasilitas):
+        X[:, posisi[nama]] = (mask >> bit) & 1
+
+    kolom_lokasi = np.array([posisi[f"Daerah_Clean_{l}"] for l in lokasi])
+    X[baris, kolom_lokasi[idx_lokasi]] = 1
+
+    # Jenis kost yang kolomnya tidak ada (mis. kena drop) dibiarkan 0, sama seperti app.py
+    kolom_jenis = np.array([posisi.get(f"Jenis Kost_{j}", -1) for j in JENIS_KOST])[idx_jenis]
+    ada = kolom_jenis >= 0
+    X[baris[ada], kolom_jenis[ada]] = 1
+
+    harga = model.predict(pd.DataFrame(X, columns=fitur))
+
+    tabel = {
+        'fitur': fitur,
+        'fasilitas': fasilitas,
+        'lokasi': {nama: i for i, nama in enumerate(lokasi)},
+        'jenis': {nama: i for i, nama in enumerate(JENIS_KOST)},
+        'harga': harga.reshape(len(lokasi), len(JENIS_KOST), n_mask),
+    }
+    if artefak is not None and artefak.interval_terkalibrasi:
+        _, Q = artefak.interval(X)
+        tabel['kuantil'] = nama_kuantil(KUANTIL_INTERVAL)
+        tabel['rentang'] = Q.reshape(len(lokasi), len(JENIS_KOST), n_mask, Q.shape[1])
+    return tabel
+
+
+def _mask(tabel, fasilitas_aktif):
+    mask = 0
+    for bit, nama in enumerate(tabel['fasilitas']):
+        if nama in fasilitas_aktif:
+            mask |= 1 << bit
+    return mask
+
+
+def cari_harga(tabel, lokasi, jenis, fasilitas_aktif):
+    """Ambil harga dari tabel. fasilitas_aktif = kumpulan nama kolom Fasilitas_* yang dicentang"""
+    return tabel['harga'][tabel['lokasi'][lokasi], tabel['jenis'][jenis], _mask(tabel, fasilitas_aktif)]
+
+
+def cari_rentang(tabel, lokasi, jenis, fasilitas_aktif):
+    """{'p10': ..., 'p50': ..., 'p90': ...} dari tabel, atau None jika tabel dibuat tanpa rentang"""
+    if 'rentang' not in tabel:
+        return None
+    Q = tabel['rentang'][tabel['lokasi'][lokasi], tabel['jenis'][jenis], _mask(tabel, fasilitas_aktif)]
+    return dict(zip(tabel['kuantil'], map(float, Q)))
+
+
+if __name__ == "__main__":
+    # Bangun ulang tabel dari model yang sudah ada tanpa training ulang
+    artefak = muat_artefak(pakai_flat=False)
+    tabel = buat_tabel_harga(artefak.model, artefak.fitur, artefak)
+    if tabel is None:
+        print(f"Fasilitas lebih dari {MAKS_FASILITAS_TABEL}, tabel harga tidak dibuat.")
+    else:
+        joblib.dump(tabel, PATH_TABEL)
+        print(f"Tabel harga {tabel['harga'].size} kombinasi disimpan di '{PATH_TABEL}'")
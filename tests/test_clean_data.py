@@ -0,0 +1,58 @@
+import os
+import pandas as pd
+import pytest
+from clean_data import bersihkan_data, bersihkan_data_per_baris, run_cleaning, run_cleaning_inkremental
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH_MENTAH = os.path.join(ROOT, 'data', 'data_kost_malang.csv')
+
+
+@pytest.fixture(scope='module')
+def df_mentah():
+    if not os.path.exists(PATH_MENTAH):
+        pytest.skip(f"{PATH_MENTAH} tidak ada")
+    return pd.read_csv(PATH_MENTAH)
+
+
+def test_vektor_identik_dengan_per_baris(df_mentah):
+    assert bersihkan_data(df_mentah).to_csv(index=False) == bersihkan_data_per_baris(df_mentah).to_csv(index=False)
+
+
+def test_vektor_identik_kasus_tepi():
+    df = pd.DataFrame({
+        'Nama Kost': ['Kost A', 'Kost B', 'Kost C', 'Kost D'],
+        'Jenis Kost': ['Putri', 'Putra', 'Campur', 'Putri'],
+        'Harga Mentah': ['Rp1.250.000', 'Rp 90.000', '', 'Rp700.000 /bulan'],
+        'Fasilitas': ['AC·WiFi·K. Mandi Dalam star-glyph 4.8', 'Kasur', 'WiFi', 'kloset duduk·akses 24 jam'],
+        'Daerah': ['Kecamatan Lowokwaru', 'Klojen', 'Sukun', ' Kecamatan Blimbing '],
+        'Lokasi': ['Malang'] * 4,
+    })
+    assert bersihkan_data(df).to_csv(index=False) == bersihkan_data_per_baris(df).to_csv(index=False)
+
+
+def test_mode_chunk_byte_identik(tmp_path, monkeypatch):
+    if not os.path.exists(PATH_MENTAH):
+        pytest.skip(f"{PATH_MENTAH} tidak ada")
+    # Metrik ditulis relatif ke cwd
+    monkeypatch.chdir(tmp_path)
+    run_cleaning(path_input=PATH_MENTAH, output_file='penuh.csv')
+    run_cleaning(chunksize=1000, path_input=PATH_MENTAH, output_file='chunk.csv')
+    with open('penuh.csv', 'rb') as a, open('chunk.csv', 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_inkremental_byte_identik_dengan_bersih_penuh(df_mentah, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Hari ke-2: sebagian listing hilang, satu harga berubah, dan ada listing baru
+    hari_1 = df_mentah.iloc[:len(df_mentah) - 300]
+    baru = df_mentah.iloc[:50].assign(**{'Nama Kost': lambda d: d['Nama Kost'] + ' (baru)'})
+    hari_2 = pd.concat([df_mentah.iloc[200:], baru], ignore_index=True)
+    hari_2.loc[0, 'Harga Mentah'] = 'Rp1.111.000'
+    hari_1.to_csv('hari_1.csv', index=False)
+    hari_2.to_csv('hari_2.csv', index=False)
+
+    run_cleaning_inkremental(path_input='hari_1.csv', output_file='inkremental.csv', tanggal='2000-01-01')
+    run_cleaning_inkremental(path_input='hari_2.csv', output_file='inkremental.csv', tanggal='2000-01-02')
+    run_cleaning(path_input='hari_2.csv', output_file='penuh.csv')
+    with open('penuh.csv', 'rb') as a, open('inkremental.csv', 'rb') as b:
+        assert a.read() == b.read()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from dedup_kost import buat_data_uji, cari_duplikat, hapus_duplikat, jaccard_semua_pasangan
+
+
+def listing(nama, harga=900_000, daerah='Lowokwaru', jenis='Putri', ac=1):
+    return {'Nama Kost': nama, 'Daerah_Clean': daerah, 'Jenis Kost': jenis, 'Harga_Angka': harga, 'Fasilitas_AC': ac}
+
+
+def test_identik_dan_nama_mirip_digabung():
+    df = pd.DataFrame([
+        listing('Kost Melati Indah Tipe A'),
+        listing('Kost Mawar'),
+        listing('Kost Melati Indah Tipe A'),         # identik dengan baris 0
+        listing('Kost Melati Indah Tipe A.'),        # beda tanda baca saja
+        listing('Kos melati indah tipe A'),          # beda prefix & huruf besar
+        listing('Kost Melati Indah Tipe A', harga=950_000),  # harga lain: kamar lain, bukan duplikat
+        listing('Kost Melati Indah Tipe A', ac=0),   # fasilitas lain
+        listing('Kost Kenanga'),                     # blok sama, nama beda jauh
+    ])
+    hasil, laporan, statistik = hapus_duplikat(df)
+    # Baris pertama tiap klaster dipertahankan, urutan asli tidak berubah
+    assert list(hasil.index) == [0, 1, 5, 6, 7]
+    assert statistik['baris_identik'] == 1 and statistik['baris_mirip'] == 2
+    assert laporan.loc[0, 'jumlah_baris'] == 4 and laporan.loc[0, 'nama_dipertahankan'] == 'Kost Melati Indah Tipe A'
+
+
+def test_lsh_menemukan_pasangan_jaccard_eksak():
+    rng = np.random.default_rng(0)
+    nama = [f"Kost {''.join(rng.choice(list('abcdefghijklmnop'), 12))}" for _ in range(150)]
+    df = pd.DataFrame([listing(n, harga=int(rng.integers(5, 9)) * 100_000) for n in nama])
+    df = buat_data_uji(df, 3)
+    label, _ = cari_duplikat(df)
+    pasangan, _ = jaccard_semua_pasangan(df)
+    assert len(pasangan) > 100
+    recall = np.mean([label[i] == label[j] for i, j in pasangan])
+    assert recall >= 0.95
+    # Klaster hanya dalam satu blok (kecamatan, jenis, harga, fasilitas)
+    assert (df.groupby(label)['Harga_Angka'].nunique() == 1).all()
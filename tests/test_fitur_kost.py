@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_kost import muat_bersih
+from fitur_kost import EncoderKost
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH_BERSIH = os.path.join(ROOT, 'data', 'data_kost_malang_clean.parquet')
+
+
+@pytest.fixture(scope='module')
+def df_bersih():
+    if not os.path.exists(PATH_BERSIH):
+        pytest.skip(f"{PATH_BERSIH} tidak ada")
+    df = muat_bersih(path=PATH_BERSIH).drop(columns='Nama Kost')
+    # Filter kecamatan seperti train_model.siapkan_data
+    counts = df['Daerah_Clean'].value_counts()
+    df = df[df['Daerah_Clean'].isin(counts[counts >= 10].index)].copy()
+    df['Daerah_Clean'] = df['Daerah_Clean'].cat.remove_unused_categories()
+    return df
+
+
+def test_transform_sama_dengan_get_dummies(df_bersih):
+    # Jalur lama train_model.py sebelum EncoderKost
+    lama = pd.get_dummies(df_bersih, columns=['Daerah_Clean', 'Jenis Kost'], drop_first=False)
+    lama = lama.drop(['Harga_Angka'], axis=1)
+
+    encoder = EncoderKost.fit(df_bersih)
+    X, dikenal = encoder.transform(df_bersih, dtype=np.int8)
+    assert encoder.fitur == list(lama.columns)
+    assert np.array_equal(X, lama.to_numpy(dtype=np.int8))
+    assert dikenal.all()
+
+
+def test_encode_satu_listing_sama_dengan_transform(df_bersih):
+    encoder = EncoderKost.fit(df_bersih)
+    X, _ = encoder.transform(df_bersih)
+    for i in range(0, len(df_bersih), max(1, len(df_bersih) // 50)):
+        baris = df_bersih.iloc[i]
+        listing = {
+            'kecamatan': baris['Daerah_Clean'],
+            'jenis': baris['Jenis Kost'],
+            'fasilitas': [k for k in encoder.kolom_fasilitas if baris[k] == 1],
+        }
+        assert np.array_equal(encoder.encode(listing)[0], X[i])
+
+
+def test_kecamatan_tidak_dikenal_error(df_bersih):
+    encoder = EncoderKost.fit(df_bersih)
+    with pytest.raises(ValueError):
+        encoder.encode({'kecamatan': 'Bukan Kecamatan', 'jenis': 'Putri', 'fasilitas': []})
+
+
+def test_decode_kebalikan_encode(df_bersih):
+    encoder = EncoderKost.fit(df_bersih)
+    X, _ = encoder.transform(df_bersih)
+    for x in X[::max(1, len(X) // 50)]:
+        assert np.array_equal(encoder.encode(encoder.decode(x))[0], x)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from forest_flat import ekspor_forest, forest_dari_model, muat_forest
+
+
+@pytest.fixture(scope='module')
+def model_dan_X():
+    rng = np.random.default_rng(42)
+    # Fitur 0/1 seperti hasil one-hot, plus satu kolom kontinu untuk threshold non-0.5
+    X = pd.DataFrame(np.column_stack([rng.integers(0, 2, (2000, 12)), rng.normal(size=2000)]).astype(np.float32),
+                     columns=[f"f{i}" for i in range(13)])
+    y = X.to_numpy() @ rng.uniform(50_000, 300_000, 13) + rng.normal(0, 20_000, 2000)
+    model = RandomForestRegressor(n_estimators=25, max_depth=12, random_state=42).fit(X, y)
+    return model, X
+
+
+def test_forest_flat_mmap_identik_dengan_sklearn(model_dan_X, tmp_path):
+    model, X = model_dan_X
+    ekspor_forest(model, str(tmp_path / 'model_flat'))
+    forest = muat_forest(str(tmp_path / 'model_flat'))
+    assert np.array_equal(forest.predict(X), model.predict(X))
+
+
+def test_interval_memakai_traversal_yang_sama(model_dan_X):
+    model, X = model_dan_X
+    forest = forest_dari_model(model)
+    y, Q = forest.predict_interval(X)
+    assert np.array_equal(y, model.predict(X))
+    assert np.all(Q[:, 0] <= Q[:, 1]) and np.all(Q[:, 1] <= Q[:, 2])
+
+
+def test_muat_artefak_abaikan_ekspor_usang(model_dan_X, tmp_path):
+    from artefak_kost import ModelKost, muat_artefak, simpan_artefak
+    from fitur_kost import EncoderKost
+    from forest_flat import ForestFlat
+    model, X = model_dan_X
+    # Model lain dengan lebar fitur sama: ekspornya tidak boleh dipakai untuk artefak `model`
+    lain = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X['f0'])
+    path = str(tmp_path / 'model.pkl')
+    simpan_artefak(ModelKost(EncoderKost(X.columns), model), path)
+
+    ekspor_forest(lain, str(tmp_path / 'model_flat'))
+    assert not isinstance(muat_artefak(path, str(tmp_path / 'model_flat')).model, ForestFlat)
+
+    ekspor_forest(model, str(tmp_path / 'model_flat'))
+    assert isinstance(muat_artefak(path, str(tmp_path / 'model_flat')).model, ForestFlat)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kost_serupa import IndeksSerupa, cari_brute_force, muat_serupa, simpan_serupa
+
+FASILITAS = ['Fasilitas_AC', 'Fasilitas_WiFi', 'Fasilitas_Kasur', 'Fasilitas_Lemari',
+             'Fasilitas_K_Mandi_Dalam', 'Fasilitas_Akses_24_Jam']
+
+
+@pytest.fixture(scope='module')
+def df():
+    rng = np.random.default_rng(42)
+    n = 3000
+    df = pd.DataFrame({
+        'Nama Kost': [f"Kost {i}" for i in range(n)],
+        'Daerah_Clean': rng.choice(['Klojen', 'Lowokwaru', 'Sukun'], n),
+        'Jenis Kost': rng.choice(['Putra', 'Putri', 'Campur'], n),
+        # Harga dibulatkan ke ribuan: banyak harga kembar seperti data asli
+        'Harga_Angka': (rng.integers(400, 2500, n) * 1000).astype(np.int32),
+    })
+    for nama in FASILITAS:
+        df[nama] = rng.integers(0, 2, n)
+    return df
+
+
+def test_indeks_sama_dengan_scan_penuh(df):
+    indeks = IndeksSerupa.bangun(df)
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        query = (str(rng.choice(['Klojen', 'Lowokwaru', 'Sukun'])), str(rng.choice(['Putra', 'Putri', 'Campur'])),
+                 [f for f in FASILITAS if rng.random() < 0.5], int(rng.integers(300, 2600)) * 1000)
+        for k in (1, 5, 20):
+            hasil = [(beda, selisih) for _, beda, selisih in indeks.cari(*query, k=k)]
+            assert hasil == cari_brute_force(df, *query, k=k)
+
+
+def test_nama_dan_harga_baris_hasil_cocok(df, tmp_path):
+    path = str(tmp_path / 'indeks_serupa.pkl')
+    simpan_serupa(IndeksSerupa.bangun(df), path)
+    indeks = muat_serupa(path)
+    for r in indeks.serupa('Klojen', 'Putri', ['AC', 'WiFi'], 1_000_000):
+        asli = df[df['Nama Kost'] == r['Nama Kost']].iloc[0]
+        assert (asli['Daerah_Clean'], asli['Jenis Kost'], asli['Harga_Angka']) == ('Klojen', 'Putri', r['Harga_Angka'])
+    assert indeks.cari('Bukan Kecamatan', 'Putri', [], 1_000_000) == []
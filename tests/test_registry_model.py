@@ -0,0 +1,88 @@
+import os
+import time
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from artefak_kost import PATH_ARTEFAK, PATH_FITUR_LAMA, ModelKost, simpan_artefak
+from fitur_kost import PATH_VOCAB, EncoderKost
+from registry_model import PemuatModel, _uji_swap, aktifkan, baca_manifest, daftar_versi, nama_versi, terbitkan
+from tabel_harga import PATH_TABEL
+
+FITUR = ['Fasilitas_AC', 'Fasilitas_WiFi', 'Daerah_Clean_Klojen', 'Daerah_Clean_Lowokwaru', 'Jenis Kost_Putri']
+LISTING = {'kecamatan': 'Klojen', 'jenis': 'Putri', 'fasilitas': ['AC']}
+
+
+def latih(seed):
+    rng = np.random.default_rng(seed)
+    # Array polos: artefak memprediksi dari hasil encode (tanpa nama kolom)
+    X = rng.integers(0, 2, (200, len(FITUR))).astype(np.float64)
+    y = X @ rng.uniform(50_000, 300_000, len(FITUR))
+    return RandomForestRegressor(n_estimators=5, random_state=seed).fit(X, y)
+
+
+@pytest.fixture
+def sumber(tmp_path):
+    folder = tmp_path / 'sumber'
+    folder.mkdir()
+    simpan_artefak(ModelKost(EncoderKost(FITUR), latih(0)), str(folder / PATH_ARTEFAK))
+    return folder
+
+
+def test_hanya_file_run_ini_yang_diterbitkan(sumber, tmp_path):
+    # Sisa run lama di root: tidak boleh ikut terbit jika tidak ada di daftar file
+    joblib.dump({'usang': True}, sumber / PATH_TABEL)
+    joblib.dump({'usang': True}, sumber / PATH_VOCAB)
+    registry = str(tmp_path / 'registry')
+    manifest = terbitkan(registry, sumber=str(sumber), file=[PATH_ARTEFAK])
+    assert os.listdir(os.path.join(registry, manifest['folder'])) == [PATH_ARTEFAK]
+
+
+def test_artefak_lama_diterbitkan_sebagai_model_kost(tmp_path):
+    folder = tmp_path / 'lama'
+    folder.mkdir()
+    model = latih(0)
+    joblib.dump(model, folder / PATH_ARTEFAK)
+    joblib.dump(FITUR, folder / PATH_FITUR_LAMA)
+    registry = str(tmp_path / 'registry')
+    manifest = terbitkan(registry, sumber=str(folder))
+    dasar = os.path.join(registry, manifest['folder'])
+    assert not os.path.exists(os.path.join(dasar, PATH_FITUR_LAMA))
+    artefak = joblib.load(os.path.join(dasar, PATH_ARTEFAK))
+    assert isinstance(artefak, ModelKost) and artefak.fitur == FITUR
+
+
+def test_rollback_dan_pembersihan_versi(sumber, tmp_path):
+    registry = str(tmp_path / 'registry')
+    for _ in range(4):
+        terbitkan(registry, sumber=str(sumber), simpan=3)
+    assert daftar_versi(registry) == [2, 3, 4]
+    aktifkan(2, registry)
+    assert baca_manifest(registry)['folder'] == nama_versi(2)
+    # Versi aktif (hasil rollback) tidak ikut dihapus walau paling lama
+    terbitkan(registry, sumber=str(sumber), simpan=1)
+    assert daftar_versi(registry) == [5]
+    with pytest.raises(FileNotFoundError):
+        aktifkan(2, registry)
+
+
+def test_hot_swap_tanpa_menunggu_load(sumber, tmp_path):
+    registry = str(tmp_path / 'registry')
+    terbitkan(registry, sumber=str(sumber))
+    pemuat = PemuatModel(registry)
+    harga_lama = pemuat.ambil()['artefak'].prediksi(LISTING)
+
+    simpan_artefak(ModelKost(EncoderKost(FITUR), latih(1)), str(sumber / PATH_ARTEFAK))
+    terbitkan(registry, sumber=str(sumber))
+    batas = time.monotonic() + 10
+    while pemuat.ambil()['versi'] != 2:
+        assert time.monotonic() < batas
+        time.sleep(0.01)
+    assert pemuat.jumlah_swap == 1
+    assert pemuat.ambil()['artefak'].prediksi(LISTING) != harga_lama
+
+
+def test_uji_swap_tanpa_prediksi_gagal(sumber, tmp_path):
+    registry = str(tmp_path / 'registry')
+    terbitkan(registry, sumber=str(sumber))
+    assert _uji_swap(3, registry, str(sumber))
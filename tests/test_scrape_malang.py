@@ -0,0 +1,97 @@
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip('selenium')
+pytest.importorskip('webdriver_manager')
+from scrape_malang import DriverFixture, scrape_kost_malang
+
+
+def kartu(nama, harga, jenis='Putri', daerah='Lowokwaru'):
+    return (f'<div class="kost-rc">'
+            f'<span class="rc-info__name bg-c-text bg-c-text--body-4">{nama}</span>'
+            f'<span class="rc-price__text bg-c-text bg-c-text--body-1">Rp{harga:,}</span>'
+            f'<div class="kost-rc__facilities">WiFi·Kasur</div>'
+            f'<span class="rc-info__location bg-c-text bg-c-text--body-3">{daerah}</span>'
+            f'<span>Kost {jenis}</span></div>')
+
+
+def tulis_fixture(folder, halaman):
+    os.makedirs(folder, exist_ok=True)
+    for nama in os.listdir(folder):
+        os.remove(os.path.join(folder, nama))
+    for i, daftar in enumerate(halaman):
+        with open(os.path.join(folder, f"halaman_{i:03d}.html"), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(daftar))
+
+
+def scrape(folder, n_halaman):
+    # max_clicks = halaman terakhir: loop berhenti tanpa menunggu timeout tombol
+    return scrape_kost_malang(url=folder, driver=DriverFixture(folder, 0.01, 0.02),
+                              max_clicks=n_halaman - 1, timeout_muat=5)
+
+
+def test_run_kedua_parse_ulang_setelah_run_selesai(tmp_path, monkeypatch):
+    # Checkpoint, stream, CSV, latensi & metrik semuanya relatif ke cwd
+    monkeypatch.chdir(tmp_path)
+    folder = str(tmp_path / 'fixture')
+
+    tulis_fixture(folder, [[kartu('Kost A', 700000), kartu('Kost B', 800000)],
+                           [kartu('Kost C', 900000)]])
+    df = scrape(folder, 2)
+    assert sorted(df['Nama Kost']) == ['Kost A', 'Kost B', 'Kost C']
+    assert not os.path.exists('scrape_checkpoint.json')
+
+    # Scrape berikutnya: harga A naik, B hilang. Semua kartu harus dibaca ulang.
+    tulis_fixture(folder, [[kartu('Kost A', 750000)], [kartu('Kost C', 900000)]])
+    df = scrape(folder, 2)
+    csv = pd.read_csv('data_kost_malang.csv')
+    assert sorted(csv['Nama Kost']) == ['Kost A', 'Kost C']
+    assert csv.loc[csv['Nama Kost'] == 'Kost A', 'Harga Mentah'].item() == 'Rp750,000'
+    assert len(df) == 2
+
+
+def test_resume_jika_run_sebelumnya_terputus(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    folder = str(tmp_path / 'fixture')
+    tulis_fixture(folder, [[kartu('Kost A', 700000)], [kartu('Kost B', 800000)]])
+
+    class DriverPutus(DriverFixture):
+        def klik(self, tombol):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        scrape_kost_malang(url=folder, driver=DriverPutus(folder, 0.01, 0.02), max_clicks=1, timeout_muat=5)
+    assert os.path.exists('scrape_checkpoint.json')
+
+    df = scrape(folder, 2)
+    assert sorted(df['Nama Kost']) == ['Kost A', 'Kost B']
+    assert not os.path.exists('scrape_checkpoint.json')
+
+
+def test_kartu_identik_tetap_ditulis_semua(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    folder = str(tmp_path / 'fixture')
+    tulis_fixture(folder, [[kartu('Kost A', 700000), kartu('Kost A', 700000)], [kartu('Kost A', 700000)]])
+    df = scrape(folder, 2)
+    assert len(df) == 3
+
+
+def test_resume_memotong_baris_sesudah_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    folder = str(tmp_path / 'fixture')
+    tulis_fixture(folder, [[kartu('Kost A', 700000)], [kartu('Kost B', 800000)]])
+
+    # Run terputus setelah klik ke-0 ditulis; lalu satu baris "setengah jadi" dari klik berikutnya
+    class DriverPutus(DriverFixture):
+        def klik(self, tombol):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        scrape_kost_malang(url=folder, driver=DriverPutus(folder, 0.01, 0.02), max_clicks=1, timeout_muat=5)
+    with open('data_kost_malang.jsonl', 'a', encoding='utf-8') as f:
+        f.write('{"Nama Kost": "Kost B", "Jenis Kost": "Putri", "Harga Mentah": "Rp800,000", '
+                '"Fasilitas": "WiFi·Kasur", "Daerah": "Lowokwaru", "Lokasi": "Malang"}\n')
+
+    df = scrape(folder, 2)
+    assert list(df['Nama Kost']) == ['Kost A', 'Kost B']
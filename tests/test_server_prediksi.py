@@ -0,0 +1,56 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from artefak_kost import ModelKost
+from fitur_kost import EncoderKost
+from server_prediksi import HandlerPrediksi, MicroBatcher, ServerPrediksi
+
+FITUR = ['Fasilitas_AC', 'Fasilitas_WiFi', 'Daerah_Clean_Klojen', 'Daerah_Clean_Lowokwaru', 'Jenis Kost_Putri']
+
+
+@pytest.fixture(scope='module')
+def url():
+    rng = np.random.default_rng(42)
+    X = rng.integers(0, 2, (200, len(FITUR))).astype(np.float64)
+    model = RandomForestRegressor(n_estimators=5, random_state=42).fit(X, X @ [1, 2, 3, 4, 5])
+    artefak = ModelKost(EncoderKost(FITUR), model)
+    server = ServerPrediksi(('127.0.0.1', 0), HandlerPrediksi)
+    server.artefak, server.batcher = artefak, MicroBatcher(artefak)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body):
+    data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method='POST')) as r:
+            return r.status, json.load(r)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_listing_valid(url):
+    listing = {'kecamatan': 'Klojen', 'jenis': 'Putri', 'fasilitas': ['AC']}
+    assert post(f"{url}/predict", listing)[0] == 200
+    assert post(f"{url}/predict_batch", {'listing': [listing, listing]})[0] == 200
+
+
+@pytest.mark.parametrize('endpoint, body, pesan', [
+    # String fasilitas tidak boleh diiterasi per huruf ("A", "C")
+    ('/predict', {'kecamatan': 'Klojen', 'jenis': 'Putri', 'fasilitas': 'AC'}, "'fasilitas' harus berupa list"),
+    ('/predict', {'kecamatan': 'Klojen', 'jenis': 'Putri', 'fasilitas': [1]}, "'fasilitas' harus berupa list"),
+    ('/predict', [{'kecamatan': 'Klojen'}], 'Body JSON harus berupa object'),
+    ('/predict_batch', ['bukan', 'object'], 'Body JSON harus berupa object'),
+    ('/predict_batch', {'listing': {'kecamatan': 'Klojen'}}, "Field 'listing' harus berupa list"),
+    ('/predict_batch', {'listing': ['Klojen']}, 'Listing harus berupa object'),
+    ('/predict', b'{rusak', ''),
+])
+def test_input_tidak_valid_400(url, endpoint, body, pesan):
+    status, hasil = post(f"{url}{endpoint}", body)
+    assert status == 400 and pesan in hasil['error']
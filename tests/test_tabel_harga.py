@@ -0,0 +1,48 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from artefak_kost import ModelKost
+from fitur_kost import JENIS_KOST, EncoderKost
+from tabel_harga import buat_tabel_harga, cari_harga, cari_rentang
+
+# 'Jenis Kost_Campur' sengaja tidak ada: jenis tanpa kolom harus tetap 0, sama seperti encoder
+FITUR = ['Fasilitas_AC', 'Fasilitas_WiFi', 'Fasilitas_Kasur',
+         'Daerah_Clean_Klojen', 'Daerah_Clean_Lowokwaru', 'Jenis Kost_Putra', 'Jenis Kost_Putri']
+
+
+@pytest.fixture(scope='module')
+def artefak():
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.integers(0, 2, (500, len(FITUR))).astype(np.float64), columns=FITUR)
+    y = X.to_numpy() @ rng.uniform(50_000, 300_000, len(FITUR)) + rng.normal(0, 20_000, len(X))
+    model = RandomForestRegressor(n_estimators=20, max_depth=8, random_state=42).fit(X, y)
+    artefak = ModelKost(EncoderKost(FITUR), model)
+    artefak.cakupan_interval, artefak.koreksi_interval = 80.0, 10_000.0
+    return artefak
+
+
+def semua_listing(encoder):
+    fasilitas = list(encoder.kolom_fasilitas)
+    for lokasi, jenis in itertools.product(encoder.lokasi, JENIS_KOST):
+        for n in range(len(fasilitas) + 1):
+            for aktif in itertools.combinations(fasilitas, n):
+                yield {'kecamatan': lokasi, 'jenis': jenis, 'fasilitas': list(aktif)}
+
+
+def test_tabel_sama_dengan_model_predict(artefak):
+    tabel = buat_tabel_harga(artefak.model, FITUR, artefak)
+    for listing in semua_listing(artefak.encoder):
+        X = pd.DataFrame(artefak.encoder.encode(listing), columns=FITUR)
+        harga = cari_harga(tabel, listing['kecamatan'], listing['jenis'], set(listing['fasilitas']))
+        assert harga == artefak.model.predict(X)[0]
+
+        _, Q = artefak.interval(X.to_numpy())
+        rentang = cari_rentang(tabel, listing['kecamatan'], listing['jenis'], set(listing['fasilitas']))
+        assert list(rentang.values()) == list(Q[0])
+
+
+def test_tanpa_kalibrasi_tabel_tanpa_rentang(artefak):
+    tabel = buat_tabel_harga(artefak.model, FITUR, ModelKost(artefak.encoder, artefak.model))
+    assert cari_rentang(tabel, 'Klojen', 'Putri', set()) is None
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import cross_val_score
+from train_model import CacheForest, agregasi_fitur, cv_mae_agregasi, iter_mae_fold, params_rf_agregasi
+
+
+@pytest.fixture(scope='module')
+def X_y():
+    rng = np.random.default_rng(42)
+    # 6 kolom 0/1 seperti hasil one-hot: 3000 baris jatuh ke paling banyak 64 baris unik
+    X = pd.DataFrame(rng.integers(0, 2, (3000, 6)).astype(np.float64), columns=[f"f{i}" for i in range(6)])
+    y = X.to_numpy() @ rng.uniform(50_000, 300_000, 6) + rng.normal(0, 50_000, len(X))
+    return X, y
+
+
+def test_agregasi_fitur_bisa_dibalik(X_y):
+    X, y = X_y
+    X_unik, y_mean, bobot, grup = agregasi_fitur(X, y)
+    assert len(X_unik) <= 64 and bobot.sum() == len(X)
+    assert np.array_equal(X_unik.to_numpy()[grup], X.to_numpy())
+    assert np.allclose(y_mean[grup], pd.Series(y).groupby(grup).transform('mean'))
+
+
+def test_agregasi_sparse_sama_dengan_padat(X_y):
+    X, y = X_y
+    X_sparse = X.astype(pd.SparseDtype(np.float64, 0.0))
+    _, y_padat, bobot_padat, grup_padat = agregasi_fitur(X, y)
+    _, y_sparse, bobot_sparse, grup_sparse = agregasi_fitur(X_sparse, y)
+    assert np.array_equal(grup_padat, grup_sparse) and np.array_equal(bobot_padat, bobot_sparse)
+    assert np.array_equal(y_padat, y_sparse)
+
+
+def test_linear_regression_agregasi_setara_data_penuh(X_y):
+    X, y = X_y
+    X_unik, y_mean, bobot, _ = agregasi_fitur(X, y)
+    penuh = LinearRegression().fit(X, y).predict(X)
+    agregasi = LinearRegression().fit(X_unik, y_mean, sample_weight=bobot).predict(X)
+    assert np.allclose(penuh, agregasi, rtol=0, atol=1e-3)
+
+    cv_penuh = -cross_val_score(LinearRegression(), X, y, cv=3, scoring='neg_mean_absolute_error').mean()
+    assert cv_mae_agregasi(LinearRegression(), X, y, cv=3) == pytest.approx(cv_penuh, abs=1e-3)
+
+
+def test_random_forest_agregasi_setara_data_penuh_tanpa_bootstrap(X_y):
+    # params_rf_agregasi mematikan bootstrap; pembandingnya RF biasa tanpa bootstrap
+    X, y = X_y
+    X_unik, y_mean, bobot, _ = agregasi_fitur(X, y)
+    params = {'n_estimators': 20, 'max_depth': 5, 'min_samples_leaf': 1, 'random_state': 42}
+    penuh = RandomForestRegressor(**params, bootstrap=False).fit(X, y).predict(X)
+    agregasi = RandomForestRegressor(**params_rf_agregasi(params, len(X))).fit(
+        X_unik, y_mean, sample_weight=bobot).predict(X)
+    assert np.allclose(penuh, agregasi, rtol=0, atol=1e-3)
+
+
+@pytest.mark.parametrize('agregasi', [False, True])
+def test_cache_forest_skor_cv_identik(X_y, agregasi):
+    X, y = X_y
+    # Kolom kontinu supaya max_depth/min_samples_split benar-benar memotong pohon
+    X = X.assign(f6=np.random.default_rng(0).normal(size=len(X)))
+    urutan = [  # (n_estimators, max_depth, min_samples_split, min_samples_leaf): potong, tumbuhkan, ganti batas
+        (30, 6, 2, 1), (10, 6, 2, 1), (50, 6, 2, 1), (40, 4, 2, 1),
+        (40, 12, 8, 1), (20, 12, 8, 3), (60, None, 2, 3),
+    ]
+    cache = CacheForest()
+    for n, d, s, l in urutan:
+        params = {'n_estimators': n, 'max_depth': d, 'min_samples_leaf': l, 'random_state': 42}
+        if agregasi:
+            params = params_rf_agregasi(params, len(X) * 2 // 3)
+        else:
+            params['min_samples_split'] = s
+        model = RandomForestRegressor(**params)
+        assert (list(iter_mae_fold(model, X, y, agregasi=agregasi, cache=cache))
+                == list(iter_mae_fold(model, X, y, agregasi=agregasi)))
+    assert cache.pohon_dipakai_ulang > 0
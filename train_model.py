@@ -2,32 +2,68 @@ import pandas as pd
 import joblib
 import optuna
 import os
+import shutil
+import copy
+import time
+import argparse
+import tempfile
+import hashlib
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, cross_val_score
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, cross_val_score, KFold
 from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import mean_absolute_error, r2_score, classification_report, confusion_matrix
+from tabel_harga import PATH_TABEL, buat_tabel_harga
+from forest_flat import DIR_FOREST, KUANTIL_INTERVAL, ekspor_forest, forest_dari_model
+from clean_data import path_multihot
+from fitur_kost import PATH_VOCAB, EncoderKost
+from artefak_kost import PATH_ARTEFAK, ModelKost, simpan_artefak
+from registry_model import DIR_REGISTRY, terbitkan
+from kost_serupa import PATH_SERUPA, bangun_serupa, simpan_serupa
+from data_kost import NAMA_BERSIH, cari_file, kolom_file, muat_bersih
+from instrumen import Instrumen, persentil_ms
+from laporan_grafik import PATH_DATA_EVALUASI, Grafik, grafik_evaluasi, path_grafik_evaluasi, render_semua
+from scipy import sparse
 
 LOG_DATA = []
 
+# Waktu, CPU, memori puncak & jumlah baris per tahap/trial -> hasil_evaluasi/metrik.jsonl
+METRIK = Instrumen('train_model')
+
+# Storage Optuna bersama untuk tuning paralel / yang bisa dilanjutkan
+STORAGE_DEFAULT = 'sqlite:///optuna_kost.db'
+
+# Kandidat cepat di turnamen (selain LR & RF hasil tuning)
+PARAMS_HGB = {'max_iter': 300, 'learning_rate': 0.1, 'max_leaf_nodes': 31}
+# RF dangkal: parameter terbaik Optuna, tapi pohon & kedalaman dibatasi
+BATAS_RF_DANGKAL = {'n_estimators': 50, 'max_depth': 8}
+N_ULANG_LATENSI = 100
+
 def log_print(text):
     """Mencetak ke terminal DAN menyimpannya ke memori untuk nanti ditulis ke txt"""
     print(text)
     LOG_DATA.append(text)
 
-def latih_final_battle():
-    log_print("========================================================")
-    log_print("   PERTARUNGAN MODEL: LINEAR REGRESSION VS RANDOM FOREST")
-    log_print("========================================================")
+def siapkan_data(fasilitas_penuh=False):
+    """Load data bersih, buang kecamatan yang datanya sedikit, lalu one-hot encoding lewat EncoderKost.
+    Mengembalikan X, y, vocab fasilitas (None jika tidak dipakai), dan encoder yang disimpan bersama model.
 
-    # 1. Load Data
-    try:
-        df = pd.read_csv('data_kost_malang_clean.csv')
-    except FileNotFoundError:
-        # Fallback jika file ada di dalam folder 'data/'
-        df = pd.read_csv('data/data_kost_malang_clean.csv')
+    fasilitas_penuh=True: kolom fasilitas diganti matriks sparse multi-hot dari semua
+    fasilitas (hasil clean_data.py --vocab-penuh); X berupa DataFrame sparse.
+    """
+    # 1. Load Data (root lalu data/, Parquet jika ada; Nama Kost tidak ikut dibaca)
+    path_data = cari_file(NAMA_BERSIH)
+    if path_data is None:
+        raise FileNotFoundError(f"File '{NAMA_BERSIH}.parquet/.csv' tidak ditemukan")
+    if fasilitas_penuh:
+        kolom = ['Jenis Kost', 'Daerah_Clean', 'Harga_Angka']
+    else:
+        kolom = [k for k in kolom_file(path_data) if k != 'Nama Kost']
+    df = muat_bersih(kolom, path=path_data)
 
     # Kita hitung jumlah data per kecamatan
     counts = df['Daerah_Clean'].value_counts()
@@ -39,7 +75,10 @@ def latih_final_battle():
     jumlah_awal = len(df)
     
     # Lakukan Filter
-    df = df[df['Daerah_Clean'].isin(valid_kecamatan)]
+    mask = df['Daerah_Clean'].isin(valid_kecamatan).to_numpy()
+    df = df[mask].copy()
+    # Kecamatan yang dibuang tidak boleh tersisa sebagai kategori (jadi kolom dummy kosong)
+    df['Daerah_Clean'] = df['Daerah_Clean'].cat.remove_unused_categories()
     jumlah_akhir = len(df)
     
     log_print(f"[INFO] Filter Kecamatan Sedikit:")
@@ -48,14 +87,444 @@ def latih_final_battle():
     log_print(f"   - Kecamatan yang dibuang: {list(counts[counts < 10].index)}")
     # -----------------------------------------------
 
-    # Preprocessing
-    df = pd.get_dummies(df, columns=['Daerah_Clean', 'Jenis Kost'], drop_first=False)
-    X = df.drop(['Harga_Angka', 'Nama Kost'], axis=1)
     y = df['Harga_Angka']
 
+    if fasilitas_penuh:
+        # Baris matriks sejajar dengan baris CSV bersih, jadi cukup pakai mask yang sama
+        path_npz, path_vocab = path_multihot(path_data)
+        matriks = sparse.load_npz(path_npz).tocsr()[mask]
+        vocab = joblib.load(path_vocab)
+        log_print(f"[INFO] Fasilitas Penuh: {len(vocab['kolom'])} kolom sparse (min {vocab['min_frek']}x), "
+                  f"{matriks.nnz} nilai 1")
+
+        X_fasilitas = pd.DataFrame.sparse.from_spmatrix(matriks.astype(np.float32), index=df.index,
+                                                        columns=vocab['kolom'])
+        X_kategori = pd.get_dummies(df[['Daerah_Clean', 'Jenis Kost']], sparse=True, dtype=np.float32)
+        X = pd.concat([X_fasilitas, X_kategori], axis=1)
+        return X, y, vocab, EncoderKost(X.columns)
+
+    # Preprocessing: encoder yang sama dipakai prediksi batch, server, dan app.py
+    encoder = EncoderKost.fit(df)
+    # int8 (1 byte/sel seperti get_dummies): LR tetap dihitung di float64, RF di float32
+    X = pd.DataFrame(encoder.transform(df, dtype=np.int8)[0], columns=encoder.fitur, index=df.index)
+    return X, y, None, encoder
+
+def agregasi_fitur(X, y):
+    """Gabungkan baris X yang identik menjadi satu baris unik.
+
+    Mengembalikan X unik, rata-rata harga per grup, jumlah baris per grup
+    (dipakai sebagai sample_weight), dan nomor grup untuk setiap baris asli.
+    """
+    if hasattr(X, 'sparse'):
+        # DataFrame sparse: kunci grup = posisi kolom bernilai != 0 di setiap baris CSR
+        csr = X.sparse.to_coo().tocsr()
+        csr.sort_indices()
+        kunci = [csr.indices[a:b].tobytes() + csr.data[a:b].tobytes()
+                 for a, b in zip(csr.indptr[:-1], csr.indptr[1:])]
+        grup = pd.factorize(pd.Series(kunci), sort=False)[0]
+    else:
+        grup = X.groupby(list(X.columns), sort=False).ngroup().to_numpy()
+    bobot = np.bincount(grup)
+    y_mean = np.bincount(grup, weights=np.asarray(y, dtype=np.float64)) / bobot
+    _, idx_pertama = np.unique(grup, return_index=True)
+    X_unik = X.iloc[idx_pertama].reset_index(drop=True)
+    return X_unik, y_mean, bobot, grup
+
+def params_rf_agregasi(params, n_baris):
+    """Terjemahkan parameter RF jalur biasa ke padanannya untuk baris unik + sample_weight.
+
+    - bootstrap dimatikan: bootstrap di atas baris unik membuang ~37% kombinasi fitur per
+      pohon, sedangkan di data penuh hampir semua kombinasi tetap terambil.
+    - min_samples_leaf (hitungan baris) -> min_weight_fraction_leaf (hitungan bobot).
+    - min_samples_split tidak punya padanan bobot, jadi dilonggarkan ke 2 (dan tidak ikut
+      ruang pencarian Optuna di mode agregasi).
+    """
+    params = dict(params)
+    params['min_weight_fraction_leaf'] = params.pop('min_samples_leaf', 1) / n_baris
+    params['min_samples_split'] = 2
+    params['bootstrap'] = False
+    return params
+
+class CacheForest:
+    """Cache RF hasil fit per fold yang bisa dipakai ulang antar trial Optuna.
+
+    RandomForest dengan random_state tetap bersifat "prefix": N pohon pertama dari
+    forest 500 pohon sama persis dengan forest N pohon. Jadi trial dengan parameter
+    struktural yang sama cukup memotong forest yang sudah ada, atau menumbuhkan
+    sisa pohonnya saja lewat warm_start.
+
+    max_depth dan min_samples_split tidak masuk kunci. Sebuah pohon yang dibuat
+    dengan (max_depth, min_samples_split) lama identik dengan pohon untuk nilai baru
+    jika setiap node yang tidak murni/terpaksa jadi daun karena min_samples_leaf
+    punya status "dipaksa jadi daun" yang sama di kedua setting. Kondisi ini
+    dicek per pohon dari array tree_ (kedalaman & jumlah sampel setiap node).
+    Cache hanya valid untuk satu set data train (dibuat ulang setiap tuning).
+    """
+
+    # Batas jumlah forest berbeda (mis. max_depth dangkal vs dalam) per kunci
+    MAKS_ENTRI_PER_KUNCI = 4
+
+    def __init__(self):
+        self.entri = {}
+        self.pohon_dipakai_ulang = 0
+        self.pohon_baru = 0
+
+    @staticmethod
+    def kunci(params, fold):
+        split = params['min_samples_split']
+        # min_samples_split pecahan bergantung pada jumlah sampel, jadi tidak dibagi antar nilai
+        split = split if isinstance(split, float) else None
+        return (fold, split, params['min_samples_leaf'], params['min_weight_fraction_leaf'],
+                params['bootstrap'], params['max_features'], params['random_state'])
+
+    @staticmethod
+    def ringkas_pohon(est, params):
+        """Kedalaman & jumlah sampel node yang statusnya hanya ditentukan max_depth/min_samples_split"""
+        tree = est.tree_
+        kedalaman = np.zeros(tree.node_count, dtype=np.int64)
+        for node in range(tree.node_count):
+            # Node anak selalu bernomor lebih besar dari induknya
+            if tree.children_left[node] != -1:
+                kedalaman[tree.children_left[node]] = kedalaman[node] + 1
+                kedalaman[tree.children_right[node]] = kedalaman[node] + 1
+
+        n = tree.n_node_samples
+        berat = tree.weighted_n_node_samples
+        min_berat_daun = params['min_weight_fraction_leaf'] * berat[0]
+        # Node yang selalu jadi daun apa pun max_depth/min_samples_split-nya
+        pasti_daun = ((tree.impurity <= np.finfo(np.float64).eps)
+                      | (n < 2 * params['min_samples_leaf'])
+                      | (berat < 2 * min_berat_daun))
+        return kedalaman[~pasti_daun], n[~pasti_daun]
+
+    def ambil(self, model, fold, X, y, sample_weight=None):
+        params = model.get_params()
+        n = params['n_estimators']
+        d = params['max_depth'] if params['max_depth'] is not None else np.inf
+        s = params['min_samples_split']
+        daftar = self.entri.setdefault(self.kunci(params, fold), [])
+
+        # Pilih entri dengan prefix pohon valid terpanjang untuk (d, s)
+        pilihan, n_valid = None, 0
+        for i, (forest, batas, ringkasan) in enumerate(daftar):
+            valid = 0
+            for (lim_d, lim_s), (kedalaman, n_sampel) in zip(batas, ringkasan):
+                dipaksa_lama = (kedalaman >= lim_d) | (n_sampel < lim_s)
+                dipaksa_baru = (kedalaman >= d) | (n_sampel < s)
+                if not np.array_equal(dipaksa_lama, dipaksa_baru):
+                    break
+                valid += 1
+            if valid > n_valid:
+                pilihan, n_valid = i, valid
+
+        if pilihan is None:
+            forest = clone(model).set_params(warm_start=True)
+            forest.fit(X, y, sample_weight=sample_weight)
+            entri = (forest, [(d, s)] * n, [self.ringkas_pohon(est, params) for est in forest.estimators_])
+            daftar.append(entri)
+            if len(daftar) > self.MAKS_ENTRI_PER_KUNCI:
+                daftar.pop(0)
+            self.pohon_baru += n
+        else:
+            forest, batas, ringkasan = daftar[pilihan]
+            if n_valid < n:
+                if n_valid < len(forest.estimators_):
+                    # Sisa pohon tidak valid untuk (d, s): entri lama disalin supaya tetap utuh
+                    forest = copy.copy(forest)
+                    forest.estimators_ = forest.estimators_[:n_valid]
+                    batas, ringkasan = batas[:n_valid], ringkasan[:n_valid]
+                    daftar.append((forest, batas, ringkasan))
+                    if len(daftar) > self.MAKS_ENTRI_PER_KUNCI:
+                        daftar.pop(0)
+                forest.set_params(**{k: v for k, v in params.items() if k != 'warm_start'})
+                forest.fit(X, y, sample_weight=sample_weight)
+                batas.extend([(d, s)] * (n - n_valid))
+                ringkasan.extend(self.ringkas_pohon(est, params) for est in forest.estimators_[n_valid:])
+                self.pohon_dipakai_ulang += n_valid
+                self.pohon_baru += n - n_valid
+            else:
+                self.pohon_dipakai_ulang += n
+
+        hasil = copy.copy(forest)
+        hasil.estimators_ = forest.estimators_[:n]
+        hasil.n_estimators = n
+        return hasil
+
+def iter_mae_fold(model, X, y, cv=3, agregasi=False, cache=None):
+    """MAE per fold, fold dipotong seperti cross_val_score (KFold tanpa shuffle).
+    Di mode agregasi setiap fold train diagregasi dulu sebelum fit.
+    Jika cache (CacheForest) diberikan, forest per fold diambil/ditumbuhkan dari cache."""
+    y = np.asarray(y, dtype=np.float64)
+    for fold, (idx_train, idx_val) in enumerate(KFold(n_splits=cv).split(X)):
+        if agregasi:
+            X_fit, y_fit, w_fit, _ = agregasi_fitur(X.iloc[idx_train], y[idx_train])
+        else:
+            X_fit, y_fit, w_fit = X.iloc[idx_train], y[idx_train], None
+
+        if cache is not None:
+            m = cache.ambil(model, fold, X_fit, y_fit, sample_weight=w_fit)
+        else:
+            m = clone(model)
+            m.fit(X_fit, y_fit, sample_weight=w_fit)
+
+        if agregasi:
+
+            # Prediksi cukup per kombinasi unik di fold validasi, lalu disebar ke barisnya
+            X_val_unik, _, _, grup_val = agregasi_fitur(X.iloc[idx_val], y[idx_val])
+            pred = m.predict(X_val_unik)[grup_val]
+        else:
+            pred = m.predict(X.iloc[idx_val])
+        yield float(np.mean(np.abs(y[idx_val] - pred)))
+
+def cv_mae_agregasi(model, X, y, cv=3):
+    """Padanan cross_val_score(cv=3, MAE) untuk mode agregasi"""
+    return float(np.mean(list(iter_mae_fold(model, X, y, cv=cv, agregasi=True))))
+
+def objective_rf(trial, X_train, y_train, agregasi=False, n_jobs=-1, pruning=False, cache=None):
+    """Objective Optuna: rata-rata MAE 3-fold untuk satu set parameter RF (dicatat per trial di METRIK)"""
+    with METRIK.tahap('trial_optuna', trial=trial.number, baris=len(X_train)) as m:
+        mae = mae_cv_rf(trial, X_train, y_train, agregasi, n_jobs, pruning, cache)
+        m['mae'] = round(mae, 1)
+        m['params'] = trial.params
+        return mae
+
+def mae_cv_rf(trial, X_train, y_train, agregasi=False, n_jobs=-1, pruning=False, cache=None):
+    params = {
+        'n_estimators': trial.suggest_int('n_estimators', 100, 500),
+        'max_depth': trial.suggest_int('max_depth', 5, 50),
+        'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 10),
+        'random_state': 42,
+        'n_jobs': n_jobs
+    }
+    if not agregasi:
+        # Di mode agregasi min_samples_split selalu 2 (lihat params_rf_agregasi), jadi tidak dituning
+        params['min_samples_split'] = trial.suggest_int('min_samples_split', 2, 15)
+    if agregasi:
+        # Tiap fold punya jumlah baris ~2/3 data train
+        model = RandomForestRegressor(**params_rf_agregasi(params, len(X_train) * 2 // 3))
+    else:
+        model = RandomForestRegressor(**params)
+
+    if not pruning and cache is None:
+        if agregasi:
+            return cv_mae_agregasi(model, X_train, y_train, cv=3)
+        score = cross_val_score(model, X_train, y_train, cv=3, scoring='neg_mean_absolute_error').mean()
+        return -score
+
+    # Lapor MAE setelah tiap fold; parameter yang jelas kalah dihentikan lebih awal
+    skor = []
+    for fold, mae in enumerate(iter_mae_fold(model, X_train, y_train, cv=3, agregasi=agregasi, cache=cache)):
+        skor.append(mae)
+        trial.report(float(np.mean(skor)), fold)
+        if pruning and trial.should_prune():
+            raise optuna.TrialPruned()
+    return float(np.mean(skor))
+
+def buat_pruner(pruning):
+    # n_warmup_steps=0: trial sudah boleh dipangkas setelah fold pertama
+    return optuna.pruners.MedianPruner(n_startup_trials=3, n_warmup_steps=0) if pruning else optuna.pruners.NopPruner()
+
+def worker_tuning(storage, study_name, n_trials, X_train, y_train, agregasi, n_jobs, pruning, warm_start, id_run=None):
+    """Dijalankan di proses terpisah: ikut mengisi study yang sama di storage bersama"""
+    if id_run:
+        # Trial dari worker masuk ke run metrik yang sama dengan proses utama
+        METRIK.id_run = id_run
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    storage = optuna.storages.RDBStorage(storage, engine_kwargs={'connect_args': {'timeout': 60}})
+    study = optuna.load_study(study_name=study_name, storage=storage, pruner=buat_pruner(pruning))
+    cache = CacheForest() if warm_start else None
+    study.optimize(partial(objective_rf, X_train=X_train, y_train=y_train, agregasi=agregasi,
+                           n_jobs=n_jobs, pruning=pruning, cache=cache), n_trials=n_trials)
+
+def log_statistik_cache(cache):
+    if cache is None:
+        return
+    total = cache.pohon_dipakai_ulang + cache.pohon_baru
+    if total:
+        log_print(f"    -> Warm-start: {cache.pohon_dipakai_ulang:,} dari {total:,} pohon CV dipakai ulang "
+                  f"({100 * cache.pohon_dipakai_ulang / total:.0f}%), {cache.pohon_baru:,} pohon baru")
+
+def sidik_study(X, y, agregasi):
+    """Nama study persisten mengikuti mode objective & isi data train (kolom, baris, urutan).
+    Ganti --agregasi / --fasilitas-penuh / dataset -> study baru, trial lama tidak ikut terhitung."""
+    h = hashlib.sha1('\x1f'.join(map(str, X.columns)).encode('utf-8'))
+    if hasattr(X, 'sparse'):
+        coo = X.sparse.to_coo()
+        for bagian in (coo.row, coo.col, coo.data):
+            h.update(np.ascontiguousarray(bagian).tobytes())
+    else:
+        h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    h.update(np.asarray(y, dtype=np.float64).tobytes())
+    return f"{'agregasi' if agregasi else 'baris'}-{h.hexdigest()[:12]}"
+
+def tuning_rf(X_train, y_train, agregasi=False, n_trials=15, storage=None, study_name='rf_kost',
+              n_workers=1, pruning=False, warm_start=False):
+    """Tuning RF dengan Optuna.
+
+    Tanpa storage: study di memori, serial (perilaku lama). Dengan storage (mis.
+    'sqlite:///optuna_kost.db'): study persisten, bisa dilanjutkan, dan diisi oleh
+    beberapa proses sekaligus. n_trials adalah target total trial di study, jadi
+    rerun hanya menjalankan sisa trial yang belum selesai. warm_start=True memakai
+    CacheForest sehingga trial hanya menumbuhkan pohon yang belum pernah dibuat
+    (satu cache per proses worker). Nama study di storage = study_name + sidik_study(),
+    jadi trial dari mode/data lain tidak pernah dipakai ulang.
+    """
+    cache = CacheForest() if warm_start else None
+    if storage is None and n_workers > 1:
+        storage = STORAGE_DEFAULT
+
+    if storage is None:
+        study = optuna.create_study(direction='minimize', pruner=buat_pruner(pruning))
+        study.optimize(partial(objective_rf, X_train=X_train, y_train=y_train, agregasi=agregasi,
+                               pruning=pruning, cache=cache), n_trials=n_trials)
+        log_statistik_cache(cache)
+        return study
+
+    sidik = sidik_study(X_train, y_train, agregasi)
+    study_name = f"{study_name}-{sidik}"
+    rdb = optuna.storages.RDBStorage(storage, engine_kwargs={'connect_args': {'timeout': 60}})
+    study = optuna.create_study(direction='minimize', storage=rdb, study_name=study_name,
+                                load_if_exists=True, pruner=buat_pruner(pruning))
+    study.set_user_attr('agregasi', agregasi)
+    study.set_user_attr('fitur', len(X_train.columns))
+    study.set_user_attr('baris', len(X_train))
+    selesai = [t for t in study.trials if t.state in (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)]
+    sisa = max(0, n_trials - len(selesai))
+    log_print(f"    -> Study '{study_name}' di {storage}: {len(selesai)} trial tersimpan, {sisa} trial baru")
+
+    # Bagi CPU antar worker supaya n_jobs RF di dalam tiap worker tidak saling berebut core
+    n_workers = max(1, min(n_workers, sisa)) if sisa else 1
+    n_jobs = max(1, (os.cpu_count() or 1) // n_workers)
+
+    if sisa and n_workers == 1:
+        study.optimize(partial(objective_rf, X_train=X_train, y_train=y_train, agregasi=agregasi,
+                               n_jobs=n_jobs, pruning=pruning, cache=cache), n_trials=sisa)
+        log_statistik_cache(cache)
+    elif sisa:
+        jatah = [sisa // n_workers + (1 if i < sisa % n_workers else 0) for i in range(n_workers)]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(worker_tuning, storage, study_name, n, X_train, y_train,
+                                   agregasi, n_jobs, pruning, warm_start, METRIK.id_run) for n in jatah]
+            for f in futures:
+                f.result()
+
+    return optuna.load_study(study_name=study_name, storage=rdb)
+
+def padat(X):
+    """HistGradientBoosting tidak menerima input sparse"""
+    return X.sparse.to_dense() if hasattr(X, 'sparse') else X
+
+def ukur_model(model, X_test, encoder, n_ulang=N_ULANG_LATENSI):
+    """Latensi prediksi 1 baris lewat jalur serving (ModelKost.prediksi: encode listing mentah, Random
+    Forest sebagai forest flat seperti dari model_flat/) & batch, ukuran artefak pickle, dan waktu load"""
+    X = np.asarray(padat(X_test), dtype=np.float32)
+    artefak = ModelKost(encoder, forest_dari_model(model) if hasattr(model, 'estimators_') else model)
+    listing = [encoder.decode(x) for x in X[:n_ulang]]
+    waktu = []
+    for l in listing:
+        mulai = time.perf_counter()
+        artefak.prediksi(l)
+        waktu.append(time.perf_counter() - mulai)
+    hasil = persentil_ms(waktu)
+
+    mulai = time.perf_counter()
+    artefak.predict(X)
+    hasil['batch_baris_per_detik'] = round(len(X) / (time.perf_counter() - mulai))
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'model.pkl')
+        joblib.dump(model, path)
+        hasil['ukuran_mb'] = round(os.path.getsize(path) / 1024 / 1024, 3)
+        mulai = time.perf_counter()
+        joblib.load(path)
+        hasil['muat_s'] = round(time.perf_counter() - mulai, 4)
+    return hasil
+
+def ukur_interval(model, X_test, y_test, n_ulang=N_ULANG_LATENSI):
+    """Rentang P10-P90 dari sebaran per pohon: koreksi, cakupan di data test & biaya vs predict biasa.
+
+    Sebaran per pohon hanya mencerminkan ketidakpastian model, bukan variasi harga antar kost,
+    jadi rentang mentahnya terlalu sempit. Koreksi conformal (CQR): P10/P90 dilebarkan sebesar
+    `koreksi` Rupiah, dikalibrasi di separuh data test; cakupan dilaporkan di separuh lainnya."""
+    forest = forest_dari_model(model)
+    X = np.asarray(X_test, dtype=np.float32)
+    y_asli = np.asarray(y_test, dtype=np.float64)
+    _, Q = forest.predict_interval(X)
+    bawah, tengah, atas = Q[:, 0], Q[:, 1], Q[:, 2]
+
+    acak = np.random.default_rng(42).permutation(len(X))
+    kalibrasi, uji = acak[:len(X) // 2], acak[len(X) // 2:]
+    target = KUANTIL_INTERVAL[-1] - KUANTIL_INTERVAL[0]
+    skor = np.maximum(bawah - y_asli, y_asli - atas)[kalibrasi]
+    level = min(1.0, np.ceil((len(skor) + 1) * target) / len(skor))
+    koreksi = max(0.0, float(np.quantile(skor, level)))
+
+    def cakupan(b, a):
+        return round(float(np.mean((y_asli[uji] >= b[uji]) & (y_asli[uji] <= a[uji]))) * 100, 1)
+
+    hasil = {
+        'cakupan_mentah': cakupan(bawah, atas),
+        'lebar_median_mentah': round(float(np.median(atas - bawah))),
+        'koreksi': round(koreksi),
+        'cakupan_p10_p90': cakupan(bawah - koreksi, atas + koreksi),
+        'lebar_median': round(float(np.median(atas - bawah)) + 2 * koreksi),
+        'mae_p50': round(mean_absolute_error(y_asli, tengah)),
+    }
+
+    for label, fungsi in [('predict', forest.predict), ('interval', forest.predict_interval)]:
+        waktu = []
+        for i in range(min(n_ulang, len(X))):
+            mulai = time.perf_counter()
+            fungsi(X[i:i + 1])
+            waktu.append(time.perf_counter() - mulai)
+        for kunci, nilai in persentil_ms(waktu).items():
+            hasil[f"{label}_{kunci}"] = nilai
+        mulai = time.perf_counter()
+        fungsi(X)
+        hasil[f"{label}_batch_baris_per_detik"] = round(len(X) / (time.perf_counter() - mulai))
+    return hasil
+
+def pilih_juara(hasil, budget_latensi_ms=None, budget_ukuran_mb=None):
+    """MAE terendah di antara kandidat yang lolos budget p99 latensi 1 baris & ukuran artefak.
+    Jika tidak ada yang lolos, ambil yang paling sedikit melewati budget (rasio terbesar nilai/budget
+    di kedua kriteria paling kecil, seri -> MAE terendah). Mengembalikan (nama, lolos_budget)."""
+    lolos = [nama for nama, h in hasil.items()
+             if (budget_latensi_ms is None or h['p99_ms'] <= budget_latensi_ms)
+             and (budget_ukuran_mb is None or h['ukuran_mb'] <= budget_ukuran_mb)]
+    if lolos:
+        return min(lolos, key=lambda nama: hasil[nama]['mae']), True
+
+    def lewat(h):
+        rasio = [h['p99_ms'] / budget_latensi_ms if budget_latensi_ms else 0.0,
+                 h['ukuran_mb'] / budget_ukuran_mb if budget_ukuran_mb else 0.0]
+        return max(rasio)
+    return min(hasil, key=lambda nama: (lewat(hasil[nama]), hasil[nama]['mae'])), False
+
+@METRIK.bungkus('total')
+def latih_final_battle(agregasi=False, n_trials=15, storage=None, study_name='rf_kost', n_workers=1, pruning=False,
+                       warm_start=False, fasilitas_penuh=False, tanpa_grafik=False,
+                       budget_latensi_ms=None, budget_ukuran_mb=None):
+    log_print("========================================================")
+    log_print("   TURNAMEN MODEL: LINEAR REGRESSION, RANDOM FOREST,")
+    log_print("   HISTGRADIENTBOOSTING & RANDOM FOREST DANGKAL")
+    log_print("========================================================")
+
+    with METRIK.tahap('siapkan_data') as m:
+        X, y, vocab, encoder = siapkan_data(fasilitas_penuh)
+        m['baris'], m['fitur'] = X.shape
+
     # 2. Split Data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
+    # Mode agregasi: baris train yang fiturnya identik digabung, jumlahnya jadi sample_weight
+    if agregasi:
+        with METRIK.tahap('agregasi_fitur', baris_awal=len(X_train)) as m:
+            X_fit, y_fit, w_fit, _ = agregasi_fitur(X_train, y_train)
+            m['baris'] = len(X_fit)
+        log_print(f"[INFO] Mode Agregasi: {len(X_train)} baris train -> {len(X_fit)} baris unik")
+    else:
+        X_fit, y_fit, w_fit = X_train, y_train, None
+
     # Helper untuk kategori harga
     batas_bawah, batas_atas = 850000, 1500000
     labels = ["Ekonomis", "Standar", "Eksklusif"]
@@ -67,27 +536,29 @@ def latih_final_battle():
 
     y_test_kat = [kategorikan(h) for h in y_test]
 
+    # Semua kandidat: nama -> (model, X_test yang diterima model, prediksi test)
+    kandidat = {}
+    def evaluasi(nama, model, X_uji, y_pred):
+        mae = mean_absolute_error(y_test, y_pred)
+        mape = np.mean(np.abs((y_test - y_pred) / y_test)) * 100
+        log_print(f"    -> MAE (Error Rupiah): Rp {int(mae):,}")
+        log_print(f"    -> R2 Score (Akurasi): {r2_score(y_test, y_pred):.2f}")
+        log_print(f"    -> MAPE (Error %): {mape:.2f}%")
+
+        log_print(f"\n    --- Classification Report ({nama}) ---")
+        log_print(classification_report(y_test_kat, [kategorikan(h) for h in y_pred], target_names=labels))
+        kandidat[nama] = {'model': model, 'X_test': X_uji, 'y_pred': y_pred, 'mae': mae, 'mape': mape}
+
     # ====================================================================
     # RONDE 1: LINEAR REGRESSION
     # ====================================================================
     log_print("\n[1] Melatih Linear Regression...")
     model_lr = LinearRegression()
-    model_lr.fit(X_train, y_train)
+    with METRIK.tahap('fit_linear_regression', baris=len(X_fit)):
+        model_lr.fit(X_fit, y_fit, sample_weight=w_fit)
     
     # Evaluasi LR di Data Test
-    y_pred_lr = model_lr.predict(X_test)
-    mae_lr = mean_absolute_error(y_test, y_pred_lr)
-    r2_lr = r2_score(y_test, y_pred_lr)
-    mape_lr = np.mean(np.abs((y_test - y_pred_lr) / y_test)) * 100
-    
-    log_print(f"    -> MAE (Error Rupiah): Rp {int(mae_lr):,}")
-    log_print(f"    -> R2 Score (Akurasi): {r2_lr:.2f}")
-    log_print(f"    -> MAPE (Error %): {mape_lr:.2f}%")
-    
-    # Classification Report LR
-    y_pred_lr_kat = [kategorikan(h) for h in y_pred_lr]
-    log_print("\n    --- Classification Report (Linear Regression) ---")
-    log_print(classification_report(y_test_kat, y_pred_lr_kat, target_names=labels))
+    evaluasi("Linear Regression", model_lr, X_test, model_lr.predict(X_test))
 
     # ====================================================================
     # RONDE 2: RANDOM FOREST (BAYESIAN TUNING)
@@ -96,73 +567,160 @@ def latih_final_battle():
 
     optuna.logging.set_verbosity(optuna.logging.WARNING)
 
-    def objective(trial):
-        params = {
-            'n_estimators': trial.suggest_int('n_estimators', 100, 500),
-            'max_depth': trial.suggest_int('max_depth', 5, 50),
-            'min_samples_split': trial.suggest_int('min_samples_split', 2, 15),
-            'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 10),
-            'random_state': 42,
-            'n_jobs': -1
-        }
-        model = RandomForestRegressor(**params)
-        score = cross_val_score(model, X_train, y_train, cv=3, scoring='neg_mean_absolute_error').mean()
-        return -score
-
-    study = optuna.create_study(direction='minimize')
-    study.optimize(objective, n_trials=15)
+    mulai = time.perf_counter()
+    with METRIK.tahap('tuning_optuna', baris=len(X_train), n_trials=n_trials, n_workers=n_workers) as m:
+        study = tuning_rf(X_train, y_train, agregasi=agregasi, n_trials=n_trials, storage=storage,
+                          study_name=study_name, n_workers=n_workers, pruning=pruning, warm_start=warm_start)
+        m['trial_di_study'] = len(study.trials)
+    status = pd.Series([t.state.name for t in study.trials]).value_counts().to_dict()
+    log_print(f"    -> Trial: {status} ({time.perf_counter() - mulai:.1f} detik)")
 
     log_print(f"    -> Parameter Terbaik RF: {study.best_params}")
 
     # Latih Final RF
     best_params = study.best_params
-    model_rf = RandomForestRegressor(**best_params, random_state=42, n_jobs=-1)
-    model_rf.fit(X_train, y_train)
+    def buat_rf(params):
+        if agregasi:
+            return RandomForestRegressor(**params_rf_agregasi(params, len(X_train)), random_state=42, n_jobs=-1)
+        return RandomForestRegressor(**params, random_state=42, n_jobs=-1)
+    model_rf = buat_rf(best_params)
+    with METRIK.tahap('fit_random_forest', baris=len(X_fit)):
+        model_rf.fit(X_fit, y_fit, sample_weight=w_fit)
     
     # Evaluasi RF di Data Test
-    y_pred_rf = model_rf.predict(X_test)
-    mae_rf = mean_absolute_error(y_test, y_pred_rf)
-    r2_rf = r2_score(y_test, y_pred_rf)
-    mape_rf = np.mean(np.abs((y_test - y_pred_rf) / y_test)) * 100
-    
-    log_print(f"    -> MAE (Error Rupiah): Rp {int(mae_rf):,}")
-    log_print(f"    -> R2 Score (Akurasi): {r2_rf:.2f}")
-    log_print(f"    -> MAPE (Error %): {mape_rf:.2f}%")
+    with METRIK.tahap('prediksi_random_forest', baris=len(X_test)):
+        y_pred_rf = model_rf.predict(X_test)
+    evaluasi("Random Forest", model_rf, X_test, y_pred_rf)
 
-    # Classification Report RF
-    y_pred_rf_kat = [kategorikan(h) for h in y_pred_rf]
-    log_print("\n    --- Classification Report (Random Forest) ---")
-    log_print(classification_report(y_test_kat, y_pred_rf_kat, target_names=labels))
+    # ====================================================================
+    # RONDE 3: KANDIDAT CEPAT (HISTGRADIENTBOOSTING & RF DANGKAL)
+    # ====================================================================
+    log_print("\n[3] Melatih HistGradientBoosting...")
+    model_hgb = HistGradientBoostingRegressor(**PARAMS_HGB, random_state=42)
+    with METRIK.tahap('fit_hist_gradient_boosting', baris=len(X_fit)):
+        model_hgb.fit(padat(X_fit), y_fit, sample_weight=w_fit)
+    evaluasi("HistGradientBoosting", model_hgb, padat(X_test), model_hgb.predict(padat(X_test)))
+
+    params_dangkal = {**best_params, **{k: min(best_params[k], v) for k, v in BATAS_RF_DANGKAL.items()}}
+    log_print(f"\n[4] Melatih Random Forest Dangkal {params_dangkal}...")
+    model_rf_dangkal = buat_rf(params_dangkal)
+    with METRIK.tahap('fit_random_forest_dangkal', baris=len(X_fit)):
+        model_rf_dangkal.fit(X_fit, y_fit, sample_weight=w_fit)
+    evaluasi("Random Forest Dangkal", model_rf_dangkal, X_test, model_rf_dangkal.predict(X_test))
 
     # ====================================================================
-    # KEPUTUSAN JUARA
+    # KEPUTUSAN JUARA: AKURASI VS LATENSI & UKURAN
     # ====================================================================
     log_print("\n========================================================")
     log_print("   HASIL AKHIR (FINAL VERDICT)")
     log_print("========================================================")
-    
-    juara_model = None
-    nama_juara = ""
-    y_pred_final = []
-    
-    if mae_rf < mae_lr:
-        log_print("🏆 PEMENANG: RANDOM FOREST")
-        log_print(f"   (Lebih akurat Rp {int(mae_lr - mae_rf):,} dibanding Linear Regression)")
-        juara_model = model_rf
-        nama_juara = "Random Forest"
-        y_pred_final = y_pred_rf
+
+    hasil = {}
+    for nama, k in kandidat.items():
+        with METRIK.tahap(f"ukur_{nama.lower().replace(' ', '_')}", baris=len(k['X_test'])) as m:
+            m.update(ukur_model(k['model'], k['X_test'], encoder))
+            m.update(mae=round(k['mae']), mape=round(k['mape'], 2))
+        hasil[nama] = m
+
+    log_print("Tradeoff kandidat (latensi 1 listing lewat ModelKost.prediksi seperti app.py/server, batch = seluruh data test):")
+    log_print(f"{'Model':<24}{'MAE (Rp)':>11}{'MAPE':>8}{'p50 ms':>9}{'p99 ms':>9}{'Batch/s':>11}{'MB':>9}{'Load s':>8}")
+    for nama, h in hasil.items():
+        log_print(f"{nama:<24}{h['mae']:>11,}{h['mape']:>7.2f}%{h['p50_ms']:>9.2f}{h['p99_ms']:>9.2f}"
+                  f"{h['batch_baris_per_detik']:>11,}{h['ukuran_mb']:>9.3f}{h['muat_s']:>8.3f}")
+    budget = [f"p99 <= {budget_latensi_ms} ms" if budget_latensi_ms is not None else None,
+              f"artefak <= {budget_ukuran_mb} MB" if budget_ukuran_mb is not None else None]
+    log_print(f"Budget: {', '.join(b for b in budget if b) or 'tidak ada (murni MAE)'}")
+
+    nama_juara, lolos = pilih_juara(hasil, budget_latensi_ms, budget_ukuran_mb)
+    juara_model = kandidat[nama_juara]['model']
+    y_pred_final = kandidat[nama_juara]['y_pred']
+    log_print(f"\n🏆 PEMENANG: {nama_juara.upper()}")
+    if not lolos:
+        h = hasil[nama_juara]
+        dilanggar = [f"p99 {h['p99_ms']} ms > {budget_latensi_ms} ms"
+                     if budget_latensi_ms is not None and h['p99_ms'] > budget_latensi_ms else None,
+                     f"artefak {h['ukuran_mb']} MB > {budget_ukuran_mb} MB"
+                     if budget_ukuran_mb is not None and h['ukuran_mb'] > budget_ukuran_mb else None]
+        log_print("   [PERINGATAN] Tidak ada kandidat yang masuk budget; dipilih yang paling sedikit melewatinya. "
+                  f"Juara ini tetap melanggar: {', '.join(b for b in dilanggar if b)}.")
     else:
-        log_print("🏆 PEMENANG: LINEAR REGRESSION")
-        juara_model = model_lr
-        nama_juara = "Linear Regression"
-        y_pred_final = y_pred_lr
-        
-    # --- SIMPAN MODEL & LIST FITUR ---
-    joblib.dump(juara_model, 'model_kost_terbaik.pkl')
-    
-    joblib.dump(X.columns.tolist(), 'list_fitur.pkl') 
-    
-    log_print(f"Model {nama_juara} dan list fitur telah disimpan (FIXED FORMAT).")
+        terakurat = min(hasil, key=lambda nama: hasil[nama]['mae'])
+        if terakurat != nama_juara:
+            log_print(f"   ({terakurat} lebih akurat Rp {hasil[nama_juara]['mae'] - hasil[terakurat]['mae']:,}, "
+                      f"tapi di luar budget)")
+        else:
+            kedua = sorted(hasil, key=lambda nama: hasil[nama]['mae'])[1]
+            log_print(f"   (Lebih akurat Rp {hasil[kedua]['mae'] - hasil[nama_juara]['mae']:,} dibanding {kedua})")
+
+    # --- RENTANG HARGA P10/P50/P90 DARI PREDIKSI PER POHON (hanya forest) ---
+    artefak = ModelKost(encoder, juara_model, nama_juara)
+    if hasattr(juara_model, 'estimators_'):
+        with METRIK.tahap('ukur_interval', baris=len(y_test)) as m:
+            m.update(ukur_interval(juara_model, kandidat[nama_juara]['X_test'], y_test))
+        artefak.koreksi_interval = float(m['koreksi'])
+        artefak.cakupan_interval = m['cakupan_p10_p90']
+        log_print(f"\nRentang harga P10-P90 (sebaran {len(juara_model.estimators_)} pohon), separuh data test:")
+        log_print(f"   Mentah  : cakupan {m['cakupan_mentah']}%, lebar median Rp {m['lebar_median_mentah']:,}")
+        log_print(f"   Koreksi : +/- Rp {m['koreksi']:,} -> cakupan {m['cakupan_p10_p90']}% "
+                  f"(target {round((KUANTIL_INTERVAL[-1] - KUANTIL_INTERVAL[0]) * 100)}%), "
+                  f"lebar median Rp {m['lebar_median']:,}")
+        log_print(f"   MAE P50 : Rp {m['mae_p50']:,}")
+        log_print(f"   Latensi 1 baris p50/p99: predict {m['predict_p50_ms']:.3f}/{m['predict_p99_ms']:.3f} ms, "
+                  f"interval {m['interval_p50_ms']:.3f}/{m['interval_p99_ms']:.3f} ms")
+        log_print(f"   Batch: predict {m['predict_batch_baris_per_detik']:,} baris/s, "
+                  f"interval {m['interval_batch_baris_per_detik']:,} baris/s")
+    else:
+        log_print(f"\nRentang harga per pohon tidak tersedia ({nama_juara} bukan forest).")
+
+    # --- SIMPAN ARTEFAK: ENCODER + MODEL DALAM SATU FILE ---
+    simpan_artefak(artefak, PATH_ARTEFAK)
+    log_print(f"Model {nama_juara} beserta encoder ({len(encoder.fitur)} fitur) disimpan di '{PATH_ARTEFAK}'.")
+    # Hanya file yang ditulis run ini yang diterbitkan ke registry (bukan sisa run sebelumnya)
+    file_terbit = [PATH_ARTEFAK]
+
+    # Vocabulary fasilitas (label untuk checkbox app.py) ikut disimpan di samping list fitur
+    if vocab is not None:
+        joblib.dump(vocab, PATH_VOCAB)
+        file_terbit.append(PATH_VOCAB)
+        log_print(f"Vocabulary {len(vocab['kolom'])} fasilitas disimpan di '{PATH_VOCAB}'.")
+    elif os.path.exists(PATH_VOCAB):
+        # Vocabulary dari run --fasilitas-penuh sebelumnya tidak cocok dengan model ini
+        os.remove(PATH_VOCAB)
+
+    # --- SIMPAN TABEL HARGA (semua kombinasi input app.py) ---
+    with METRIK.tahap('buat_tabel_harga') as m:
+        tabel = buat_tabel_harga(juara_model, X.columns.tolist(), artefak)
+        m['baris'] = int(tabel['harga'].size) if tabel is not None else 0
+    if tabel is not None:
+        joblib.dump(tabel, PATH_TABEL)
+        file_terbit.append(PATH_TABEL)
+        log_print(f"Tabel harga ({tabel['harga'].size} kombinasi) disimpan di '{PATH_TABEL}'.")
+    else:
+        log_print("Tabel harga dilewati (fasilitas terlalu banyak); app memakai model.predict.")
+        if os.path.exists(PATH_TABEL):
+            os.remove(PATH_TABEL)
+
+    # --- INDEKS KOST SERUPA (listing pembanding di app.py), dari seluruh data bersih ---
+    with METRIK.tahap('bangun_indeks_serupa') as m:
+        indeks_serupa = bangun_serupa()
+        m['baris'] = len(indeks_serupa)
+    simpan_serupa(indeks_serupa)
+    file_terbit.append(PATH_SERUPA)
+    log_print(f"Indeks kost serupa ({len(indeks_serupa):,} listing) disimpan di '{PATH_SERUPA}'.")
+
+    # --- EKSPOR FOREST FLAT (untuk load mmap di app.py) ---
+    if hasattr(juara_model, 'estimators_'):
+        with METRIK.tahap('ekspor_forest'):
+            meta = ekspor_forest(juara_model, DIR_FOREST)
+        file_terbit.append(DIR_FOREST)
+        log_print(f"Forest flat ({meta['n_pohon']} pohon, {meta['n_node']} node) disimpan di '{DIR_FOREST}/'.")
+    elif os.path.exists(DIR_FOREST):
+        # Juara bukan forest: hapus ekspor lama supaya app tidak memakai model usang
+        shutil.rmtree(DIR_FOREST)
+
+    # --- TERBITKAN KE REGISTRY: VERSI BARU + POINTER DIGANTI ATOMIK (app hot-reload) ---
+    manifest = terbitkan(info={'model': nama_juara, 'sumber': 'train_model'}, file=file_terbit)
+    log_print(f"Registry: versi {manifest['versi']} diterbitkan & aktif di '{DIR_REGISTRY}/'.")
 
     # ====================================================================
     # SIMPAN OUTPUT KE TXT & GRAFIK
@@ -177,49 +735,140 @@ def latih_final_battle():
         f.write('\n'.join(LOG_DATA))
     print(f"\n[SUKSES] Laporan teks lengkap disimpan di:\n   -> {path_txt}")
 
-    # 2. Simpan Grafik Juara
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    
-    # Grafik A: Actual vs Predicted
-    sns.scatterplot(x=y_test, y=y_pred_final, ax=axes[0, 0], color='blue', alpha=0.6)
-    min_val = min(y_test.min(), y_pred_final.min())
-    max_val = max(y_test.max(), y_pred_final.max())
-    axes[0, 0].plot([min_val, max_val], [min_val, max_val], 'r--')
-    axes[0, 0].set_title(f'Akurasi {nama_juara}')
-    axes[0, 0].set_xlabel('Harga Asli')
-    axes[0, 0].set_ylabel('Prediksi AI')
-
-    # Grafik B: Residual Plot
-    residuals = y_test - y_pred_final
-    sns.scatterplot(x=y_test, y=residuals, ax=axes[0, 1], color='orange', alpha=0.6)
-    axes[0, 1].axhline(0, color='red', linestyle='--')
-    axes[0, 1].set_title('Residuals: Distribusi Error')
-
-    # Grafik C: Feature Importance / Koefisien
+    # 2. Data Grafik Juara: disimpan dulu, digambar di laporan_grafik.py (bisa ditunda)
     if hasattr(juara_model, 'feature_importances_'):
-        importances = juara_model.feature_importances_
-        fi_df = pd.DataFrame({'Fitur': X.columns, 'Pentingnya': importances})
-        fi_df = fi_df.sort_values(by='Pentingnya', ascending=False).head(10)
-        sns.barplot(x='Pentingnya', y='Fitur', data=fi_df, ax=axes[1, 0], palette='viridis')
-        axes[1, 0].set_title('Top 10 Faktor Penentu Harga')
+        faktor = pd.DataFrame({'Fitur': X.columns, 'Pentingnya': juara_model.feature_importances_})
+        jenis_faktor = 'Pentingnya'
+        faktor = faktor.sort_values(by='Pentingnya', ascending=False).head(10)
+    elif not hasattr(juara_model, 'coef_'):
+        # HistGradientBoosting tidak punya feature_importances_: pakai permutation importance di data test
+        penting = permutation_importance(juara_model, kandidat[nama_juara]['X_test'], y_test, n_repeats=5,
+                                         random_state=42, scoring='neg_mean_absolute_error')
+        faktor = pd.DataFrame({'Fitur': X.columns, 'Pentingnya': penting.importances_mean})
+        jenis_faktor = 'Pentingnya'
+        faktor = faktor.sort_values(by='Pentingnya', ascending=False).head(10)
     else:
-        coefs = pd.DataFrame({'Fitur': X.columns, 'Koefisien': juara_model.coef_})
-        coefs['Abs_Koefisien'] = coefs['Koefisien'].abs()
-        coefs = coefs.sort_values(by='Abs_Koefisien', ascending=False).head(10)
-        sns.barplot(x='Koefisien', y='Fitur', data=coefs, ax=axes[1, 0], palette='coolwarm')
-        axes[1, 0].set_title('Top 10 Koefisien')
+        faktor = pd.DataFrame({'Fitur': X.columns, 'Koefisien': juara_model.coef_})
+        jenis_faktor = 'Koefisien'
+        faktor['Abs_Koefisien'] = faktor['Koefisien'].abs()
+        faktor = faktor.sort_values(by='Abs_Koefisien', ascending=False).head(10)
 
-    # Grafik D: Confusion Matrix
     y_pred_kat = [kategorikan(h) for h in y_pred_final]
-    cm = confusion_matrix(y_test_kat, y_pred_kat, labels=labels)
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=labels, yticklabels=labels, ax=axes[1, 1])
-    axes[1, 1].set_title('Confusion Matrix Juara')
+    data_grafik = {
+        'nama_juara': nama_juara,
+        'y_test': y_test.reset_index(drop=True),
+        'y_pred': np.asarray(y_pred_final),
+        'faktor': faktor.reset_index(drop=True),
+        'jenis_faktor': jenis_faktor,
+        'labels': labels,
+        'confusion_matrix': confusion_matrix(y_test_kat, y_pred_kat, labels=labels),
+    }
+    joblib.dump(data_grafik, PATH_DATA_EVALUASI)
 
-    plt.tight_layout()
-    path_img = os.path.join(nama_folder, f"Grafik_{nama_juara.replace(' ', '_')}.png")
-    plt.savefig(path_img, dpi=300)
-    plt.close()
-    print(f"[SUKSES] Grafik evaluasi utama disimpan di:\n   -> {path_img}")
+    if tanpa_grafik:
+        print("[INFO] Grafik evaluasi ditunda. Render nanti dengan:\n   -> python laporan_grafik.py --evaluasi")
+    else:
+        path_img = path_grafik_evaluasi(nama_juara, nama_folder)
+        with METRIK.tahap('render_grafik_evaluasi') as m:
+            m.update(render_semua([Grafik(path_img, grafik_evaluasi, data_grafik)]))
+        print(f"[SUKSES] Grafik evaluasi utama di:\n   -> {path_img}")
+    if METRIK.path:
+        print(f"[SUKSES] Metrik waktu & memori per tahap (run {METRIK.id_run}) di:\n   -> {METRIK.path}")
+
+def bandingkan_agregasi(rf_params=None):
+    """Bandingkan MAE & waktu fit/CV antara jalur biasa dan mode agregasi, tulis ke laporan"""
+    log_print("========================================================")
+    log_print("   KOMPARASI: TRAINING BIASA VS MODE AGREGASI")
+    log_print("========================================================")
+
+    if rf_params is None:
+        # Parameter terbaik RF dari laporan komparasi terakhir
+        rf_params = {'n_estimators': 373, 'max_depth': 8, 'min_samples_split': 7, 'min_samples_leaf': 1}
+
+    X, y, _, _ = siapkan_data()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    mulai = time.perf_counter()
+    X_unik, y_mean, bobot, _ = agregasi_fitur(X_train, y_train)
+    waktu_agregasi = time.perf_counter() - mulai
+    log_print(f"[INFO] {len(X_train)} baris train -> {len(X_unik)} baris unik "
+              f"(agregasi {waktu_agregasi * 1000:.1f} ms)")
+
+    # (nama, model jalur biasa, model mode agregasi, model untuk CV mode agregasi)
+    kandidat = [
+        ("Linear Regression", LinearRegression(), LinearRegression(), LinearRegression()),
+        ("Random Forest",
+         RandomForestRegressor(**rf_params, random_state=42, n_jobs=-1),
+         RandomForestRegressor(**params_rf_agregasi(rf_params, len(X_train)), random_state=42, n_jobs=-1),
+         RandomForestRegressor(**params_rf_agregasi(rf_params, len(X_train) * 2 // 3), random_state=42, n_jobs=-1)),
+    ]
+
+    log_print(f"\n{'Model':<20}{'Mode':<10}{'MAE Test':>12}{'Fit (s)':>10}{'CV MAE':>12}{'CV (s)':>10}")
+    for nama, model_biasa, model_agregasi, model_cv_agregasi in kandidat:
+        # --- Jalur biasa ---
+        mulai = time.perf_counter()
+        model_biasa.fit(X_train, y_train)
+        waktu_fit = time.perf_counter() - mulai
+        mae_test = mean_absolute_error(y_test, model_biasa.predict(X_test))
+
+        mulai = time.perf_counter()
+        cv_mae = -cross_val_score(clone(model_biasa), X_train, y_train, cv=3,
+                                  scoring='neg_mean_absolute_error').mean()
+        waktu_cv = time.perf_counter() - mulai
+        log_print(f"{nama:<20}{'Biasa':<10}{int(mae_test):>12,}{waktu_fit:>10.2f}{int(cv_mae):>12,}{waktu_cv:>10.2f}")
+
+        # --- Mode agregasi ---
+        mulai = time.perf_counter()
+        model_agregasi.fit(X_unik, y_mean, sample_weight=bobot)
+        waktu_fit = time.perf_counter() - mulai
+        mae_test = mean_absolute_error(y_test, model_agregasi.predict(X_test))
+
+        mulai = time.perf_counter()
+        cv_mae = cv_mae_agregasi(model_cv_agregasi, X_train, y_train, cv=3)
+        waktu_cv = time.perf_counter() - mulai
+        log_print(f"{nama:<20}{'Agregasi':<10}{int(mae_test):>12,}{waktu_fit:>10.2f}{int(cv_mae):>12,}{waktu_cv:>10.2f}")
+
+    log_print("\nCatatan: RF mode agregasi memakai bootstrap=False dan min_weight_fraction_leaf")
+    log_print("(lihat params_rf_agregasi), sehingga hasilnya mendekati, bukan identik, dengan jalur biasa.")
+
+    nama_folder = "hasil_evaluasi"
+    os.makedirs(nama_folder, exist_ok=True)
+    path_txt = os.path.join(nama_folder, 'laporan_agregasi.txt')
+    with open(path_txt, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(LOG_DATA))
+    print(f"\n[SUKSES] Laporan komparasi agregasi disimpan di:\n   -> {path_txt}")
 
 if __name__ == "__main__":
-    latih_final_battle()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Training & komparasi model harga kost")
+    parser.add_argument('--agregasi', action='store_true',
+                        help="Latih di baris fitur unik dengan sample_weight (lebih cepat)")
+    parser.add_argument('--banding-agregasi', action='store_true',
+                        help="Hanya bandingkan MAE & waktu jalur biasa vs mode agregasi")
+    parser.add_argument('--n-trials', type=int, default=15, help="Target total trial Optuna")
+    parser.add_argument('--storage', default=None,
+                        help=f"Storage Optuna persisten, mis. {STORAGE_DEFAULT} (bisa dilanjutkan)")
+    parser.add_argument('--study-name', default='rf_kost', help="Nama study di storage")
+    parser.add_argument('--n-workers', type=int, default=1,
+                        help="Jumlah proses tuning paralel (otomatis pakai storage SQLite)")
+    parser.add_argument('--pruning', action='store_true',
+                        help="Lapor MAE per fold & hentikan trial yang kalah (MedianPruner)")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="Pakai ulang pohon RF antar trial (cache warm_start per parameter struktural)")
+    parser.add_argument('--fasilitas-penuh', action='store_true',
+                        help="Latih dengan matriks sparse semua fasilitas (hasil clean_data.py --vocab-penuh)")
+    parser.add_argument('--budget-latensi-ms', type=float, default=None,
+                        help="Juara hanya dari model dengan p99 prediksi 1 baris <= budget ini (ms)")
+    parser.add_argument('--budget-ukuran-mb', type=float, default=None,
+                        help="Juara hanya dari model dengan artefak pickle <= budget ini (MB)")
+    parser.add_argument('--tanpa-grafik', action='store_true',
+                        help="Retrain cepat: simpan data grafik saja, render nanti dengan laporan_grafik.py --evaluasi")
+    args = parser.parse_args()
+
+    if args.banding_agregasi:
+        bandingkan_agregasi()
+    else:
+        latih_final_battle(agregasi=args.agregasi, n_trials=args.n_trials, storage=args.storage,
+                           study_name=args.study_name, n_workers=args.n_workers, pruning=args.pruning,
+                           warm_start=args.warm_start, fasilitas_penuh=args.fasilitas_penuh,
+                           tanpa_grafik=args.tanpa_grafik, budget_latensi_ms=args.budget_latensi_ms,
+                           budget_ukuran_mb=args.budget_ukuran_mb)
\ No newline at end of file
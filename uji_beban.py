@@ -0,0 +1,99 @@
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from artefak_kost import muat_artefak
+from fitur_kost import JENIS_KOST, kolom_fasilitas, opsi_lokasi
+
+# ==============================================================================
+# UJI BEBAN: LATENSI p50/p99 & THROUGHPUT SERVER PREDIKSI DI LOCALHOST
+# ==============================================================================
+# Menjalankan server_prediksi.py sebagai proses terpisah (dengan dan tanpa
+# micro-batching), lalu menembakkan request /predict secara paralel.
+
+
+def listing_acak(fitur, rng):
+    return {
+        'kecamatan': rng.choice(opsi_lokasi(fitur)),
+        'jenis': rng.choice(JENIS_KOST),
+        'fasilitas': [f for f in kolom_fasilitas(fitur) if rng.random() < 0.5],
+    }
+
+
+def kirim(url, payload):
+    body = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    mulai = time.perf_counter()
+    with urllib.request.urlopen(req) as resp:
+        resp.read()
+    return time.perf_counter() - mulai
+
+
+def tunggu_siap(url_health, batas_detik=60):
+    batas = time.time() + batas_detik
+    while time.time() < batas:
+        try:
+            with urllib.request.urlopen(url_health) as resp:
+                return resp.status == 200
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def uji(port, batching, n_request, konkurensi, payloads):
+    perintah = [sys.executable, 'server_prediksi.py', '--port', str(port)]
+    if not batching:
+        perintah.append('--tanpa-batching')
+    proses = subprocess.Popen(perintah, stdout=subprocess.DEVNULL)
+
+    try:
+        if not tunggu_siap(f"http://127.0.0.1:{port}/health"):
+            raise RuntimeError("Server tidak merespons /health")
+
+        url = f"http://127.0.0.1:{port}/predict"
+        # Pemanasan supaya koneksi & cache sudah siap
+        for p in payloads[:20]:
+            kirim(url, p)
+
+        mulai = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=konkurensi) as pool:
+            latensi = list(pool.map(lambda p: kirim(url, p), payloads[:n_request]))
+        durasi = time.perf_counter() - mulai
+    finally:
+        proses.terminate()
+        proses.wait()
+
+    latensi_ms = np.array(latensi) * 1000
+    return {
+        'mode': 'micro-batching' if batching else 'tanpa batching',
+        'p50_ms': float(np.percentile(latensi_ms, 50)),
+        'p99_ms': float(np.percentile(latensi_ms, 99)),
+        'throughput_rps': n_request / durasi,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Uji beban server_prediksi.py di localhost")
+    parser.add_argument('--request', type=int, default=2000, help="Jumlah request /predict per mode")
+    parser.add_argument('--konkurensi', type=int, default=32, help="Jumlah klien paralel")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    print("=== UJI BEBAN SERVER PREDIKSI ===")
+    fitur = muat_artefak().fitur
+    rng = random.Random(42)
+    payloads = [listing_acak(fitur, rng) for _ in range(args.request)]
+
+    hasil = []
+    for batching in [False, True]:
+        print(f"Menguji mode {'micro-batching' if batching else 'tanpa batching'}...")
+        hasil.append(uji(args.port, batching, args.request, args.konkurensi, payloads))
+
+    print(f"\n{'Mode':<16}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/detik':>12}")
+    for h in hasil:
+        print(f"{h['mode']:<16}{h['p50_ms']:>10.2f}{h['p99_ms']:>10.2f}{h['throughput_rps']:>12,.0f}")